@@ -0,0 +1,219 @@
+"""
+ASGI 异步服务入口
+只读目录路由（首页、详情页）与静态文件由 Quart + aiomysql 异步处理：同一视图中互不依赖的
+查询并发执行，单个 worker 可以同时挂起大量慢速连接而不占用线程；其余路由原样交给
+app.py 中的 Flask 应用（经 asgiref 转为 ASGI，在线程池中运行）。模板与 URL 保持不变。
+
+运行（依赖见 requirements-async.txt）：
+    hypercorn asgi:application --bind 0.0.0.0:5000
+
+- 异步连接池参数沿用 DB_POOL_* / DB_CONNECT_TIMEOUT / DB_READ_TIMEOUT 环境变量
+- 异步查询同样经过熔断器；熔断或查询失败时返回兜底页面缓存（与同步模式共用 page_cache）
+- 异步路由只读、使用自动提交连接，始终读取主库（读写分离只作用于同步路由）
+- 首页背景图取自与同步模式相同的内存候选池（homepage_images.py），不访问数据库
+"""
+
+import asyncio
+from functools import wraps
+
+import aiomysql
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, Response, abort, render_template, request, session
+from werkzeug.exceptions import HTTPException
+
+import page_cache
+from app import app as flask_app, db_config, pool_config
+from blueprints.common import build_artifact_detail
+from db_pool import CircuitBreaker, CircuitOpenError
+from query_builder import PREPARED_STATEMENTS
+
+# 异步查询可能抛出的数据库错误（熔断错误来自 db_pool）
+DB_ERRORS = (aiomysql.Error, asyncio.TimeoutError, CircuitOpenError)
+
+
+class AsyncDatabase:
+    """
+    aiomysql 连接池包装
+    每次 fetchall() 从池中取一个连接，因此 asyncio.gather() 中的多条查询会在不同连接上并发执行
+    """
+
+    def __init__(self, db_config, pool_size=5, max_overflow=10, recycle=3600,
+                 connect_timeout=5, read_timeout=10, breaker_threshold=5, breaker_reset=30):
+        self._db_config = db_config
+        self.maxsize = pool_size + max_overflow
+        self.recycle = recycle
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self._pool = None
+
+    async def start(self):
+        init_command = None
+        if self.read_timeout and self.read_timeout > 0:
+            init_command = f"SET SESSION MAX_EXECUTION_TIME = {int(self.read_timeout * 1000)}"
+        # minsize=0：启动时不要求数据库可用，连接按需建立
+        self._pool = await aiomysql.create_pool(
+            host=self._db_config['host'],
+            port=int(self._db_config.get('port', 3306)),
+            user=self._db_config['user'],
+            password=self._db_config['password'],
+            db=self._db_config['database'],
+            charset='utf8mb4',
+            autocommit=True,
+            minsize=0,
+            maxsize=self.maxsize,
+            pool_recycle=self.recycle if self.recycle > 0 else -1,
+            connect_timeout=self.connect_timeout,
+            init_command=init_command,
+        )
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def fetchall(self, query, params=()):
+        """执行查询并返回全部结果行（dict）；超时或连接失败计入熔断"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(msg=f"数据库 {self._db_config.get('host')} 熔断中，暂停访问")
+        try:
+            async with self._pool.acquire() as conn:
+                try:
+                    async with conn.cursor(aiomysql.DictCursor) as cursor:
+                        await asyncio.wait_for(cursor.execute(query, params), self.read_timeout or None)
+                        rows = await cursor.fetchall()
+                except asyncio.TimeoutError:
+                    # 读超时后连接状态不确定，关闭后由连接池丢弃
+                    conn.close()
+                    raise
+        except (aiomysql.Error, asyncio.TimeoutError, OSError):
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return rows
+
+    def stats(self):
+        pool = self._pool
+        return {
+            'maxsize': self.maxsize,
+            'size': pool.size if pool else 0,
+            'idle': pool.freesize if pool else 0,
+            'breaker': self.breaker.stats(),
+        }
+
+
+db = AsyncDatabase(db_config, **{
+    key: pool_config[key]
+    for key in ('pool_size', 'max_overflow', 'recycle', 'connect_timeout',
+                'read_timeout', 'breaker_threshold', 'breaker_reset')
+})
+
+async_app = Quart(__name__)
+# 与 Flask 应用共用会话 Cookie（相同的密钥与签名方式），模板中的 session 保持一致
+async_app.secret_key = flask_app.secret_key
+
+
+@async_app.before_serving
+async def open_pool():
+    await db.start()
+
+
+@async_app.after_serving
+async def close_pool():
+    await db.close()
+
+
+def stale_fallback(on_error=None):
+    """
+    异步路由的兜底装饰器（对应 page_cache.stale_fallback）
+    查询失败时返回最近一次成功渲染的页面；没有缓存时调用 on_error，默认返回错误页
+    """
+    def decorator(f):
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            key = request.full_path
+            try:
+                rv = await f(*args, **kwargs)
+            except DB_ERRORS as e:
+                page = page_cache.lookup(key)
+                if page is not None:
+                    body, mimetype, _ = page
+                    return Response(body, mimetype=mimetype, headers=page_cache.stale_headers(page))
+                if not isinstance(e, CircuitOpenError):
+                    print(f"Error querying MySQL: {e}")
+                if on_error is not None:
+                    return await on_error()
+                return await render_template('error.html',
+                                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+            response = await async_app.make_response(rv)
+            if response.status_code == 200 and request.method == 'GET' and not session.get('user_id'):
+                page_cache.store(key, await response.get_data(), response.mimetype)
+            return response
+        return decorated_function
+    return decorator
+
+
+async def homepage():
+    """
+    动态主页：三组背景图从内存候选池中抽取，不访问数据库（候选池由后台线程刷新，见 homepage_images.py）
+    """
+    return await render_template('homepage.html', **flask_app.extensions['homepage_images'].draw())
+
+
+@stale_fallback()
+async def detail(artifact_id):
+    """
+    详情页面：基本信息、图片与尺寸三条查询并发执行
+    """
+    params = (artifact_id,)
+    rows, images, dimensions = await asyncio.gather(
+        db.fetchall(PREPARED_STATEMENTS['artifact_detail'], params),
+        db.fetchall(PREPARED_STATEMENTS['artifact_images'], params),
+        db.fetchall(PREPARED_STATEMENTS['artifact_dimensions'], params),
+    )
+    if not rows:
+        abort(404)
+    return await render_template('detail.html', artifact=build_artifact_detail(rows[0], images, dimensions))
+
+
+# 由异步应用处理的端点；其余端点只注册 URL 规则（供模板中的 url_for 使用），请求转交 Flask
+ASYNC_VIEWS = {
+    'public.homepage': homepage,
+    'public.detail': detail,
+}
+
+for rule in flask_app.url_map.iter_rules():
+    if rule.endpoint == 'static':
+        continue
+    async_app.add_url_rule(
+        rule.rule,
+        endpoint=rule.endpoint,
+        view_func=ASYNC_VIEWS.get(rule.endpoint),
+        methods=rule.methods - {'HEAD', 'OPTIONS'},
+        defaults=rule.defaults,
+    )
+
+ASYNC_ENDPOINTS = set(ASYNC_VIEWS) | {'static'}
+
+wsgi_application = WsgiToAsgi(flask_app)
+_url_adapter = async_app.url_map.bind('')
+
+
+def _is_async_route(scope):
+    try:
+        endpoint, _ = _url_adapter.match(scope['path'], method=scope['method'])
+    except HTTPException:
+        # 404 / 405 / 重定向等交给 Flask 处理，保持原有的响应
+        return False
+    return endpoint in ASYNC_ENDPOINTS
+
+
+async def application(scope, receive, send):
+    """ASGI 入口：异步端点与 lifespan 事件交给 Quart，其余 HTTP 请求交给 Flask"""
+    if scope['type'] == 'http' and not _is_async_route(scope):
+        await wsgi_application(scope, receive, send)
+    else:
+        await async_app(scope, receive, send)
+
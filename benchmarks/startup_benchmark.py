@@ -0,0 +1,103 @@
+"""
+Worker 冷启动基准
+在全新的子进程中导入 WSGI 应用（模拟一个 gunicorn worker 加载 app:app），记录导入耗时、
+常驻内存（RSS）峰值以及 pandas 是否被加载。导入应用不会连接数据库，无需 MySQL 即可运行。
+
+用法（在项目根目录执行）：
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --compare HEAD~1
+
+--runs     每个版本启动的子进程数，取中位数，默认 5
+--module   导入的模块，默认 app（异步模式可用 asgi）
+--compare  同时测量指定 git 版本（git archive 导出到临时目录），输出前后对比
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程中执行：导入应用并报告耗时、内存与已加载模块
+PROBE = r"""
+import json, resource, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+    'pandas': 'pandas' in sys.modules,
+}))
+"""
+
+
+def measure(root, module, runs):
+    """在 root 目录下启动 runs 个子进程，返回各项指标的中位数"""
+    samples = []
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, module],
+            cwd=root, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"导入 {module} 失败（{root}）:\n{result.stderr}")
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    return {
+        'seconds': statistics.median(s['seconds'] for s in samples),
+        'rss_mb': statistics.median(s['rss_mb'] for s in samples),
+        'modules': samples[-1]['modules'],
+        'pandas': samples[-1]['pandas'],
+    }
+
+
+def export_revision(ref, target):
+    """把指定 git 版本导出到 target 目录"""
+    archive = subprocess.run(['git', 'archive', ref], cwd=PROJECT_ROOT, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', target], input=archive.stdout, check=True)
+
+
+def print_row(label, stats):
+    print(f"{label:<14} {stats['seconds'] * 1000:>10.0f} {stats['rss_mb']:>10.1f} "
+          f"{stats['modules']:>8} {'是' if stats['pandas'] else '否':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='测量 worker 导入应用的冷启动耗时与内存')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--compare', metavar='REF')
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.compare:
+        tmpdir = tempfile.mkdtemp(prefix='startup-bench-')
+        try:
+            export_revision(args.compare, tmpdir)
+            results.append((args.compare, measure(tmpdir, args.module, args.runs)))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    results.append(('工作目录', measure(PROJECT_ROOT, args.module, args.runs)))
+
+    print(f"导入 {args.module}，每个版本 {args.runs} 次取中位数\n")
+    print(f"{'版本':<14} {'耗时(ms)':>10} {'RSS(MB)':>10} {'模块数':>8} {'pandas':>8}")
+    for label, stats in results:
+        print_row(label, stats)
+
+    if len(results) == 2:
+        (_, before), (_, after) = results
+        print(f"\n冷启动 {(after['seconds'] - before['seconds']) * 1000:+.0f} ms，"
+              f"RSS {after['rss_mb'] - before['rss_mb']:+.1f} MB（每个 worker）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
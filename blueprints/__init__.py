@@ -0,0 +1,16 @@
+"""
+路由蓝图
+- public：首页、搜索、浏览、详情与平台支持等公开页面
+- user：注册登录、用户中心与图集
+- admin：后台管理与元数据导入（pandas 等重依赖在首次使用时才导入）
+"""
+
+from blueprints.public import bp as public_bp
+from blueprints.user import bp as user_bp
+from blueprints.admin import bp as admin_bp
+
+
+def register_blueprints(app):
+    app.register_blueprint(public_bp)
+    app.register_blueprint(user_bp)
+    app.register_blueprint(admin_bp)
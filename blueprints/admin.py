@@ -0,0 +1,759 @@
+"""
+后台管理蓝图：管理员登录、仪表板、元数据导入、图像与日志管理
+pandas 只在导入与下载模板时才导入，公开页面的 worker 不会加载它
+"""
+
+from flask import Blueprint, current_app, render_template, request, session, redirect, url_for, flash, jsonify
+from mysql.connector import Error
+import os
+import math
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from functools import wraps
+
+import db_pool
+import page_cache
+import search_index
+import search_cache
+import catalog_version
+import category_stats
+import era_buckets
+from db_pool import get_db_connection
+from query_builder import SHUFFLE_KEY_RANGE
+
+bp = Blueprint('admin', __name__, cli_group=None)
+
+
+# ========== 管理员认证装饰器 ==========
+
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')  # 建议使用环境变量
+
+def admin_required(f):
+    """管理员权限验证装饰器"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('is_admin'):
+            flash('请先进行管理员登录', 'error')
+            return redirect(url_for('admin.admin_login'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# ========== 管理员认证路由 ==========
+
+@bp.route('/admin/login', methods=['GET', 'POST'])
+def admin_login():
+    """管理员登录页面"""
+    if request.method == 'POST':
+        password = request.form.get('password', '')
+        
+        if password == ADMIN_PASSWORD:
+            session['is_admin'] = True
+            session['admin_login_time'] = datetime.now().isoformat()
+            flash('管理员登录成功', 'success')
+            return redirect(url_for('admin.admin_dashboard'))
+        else:
+            flash('管理员密码错误', 'error')
+            return redirect(url_for('admin.admin_login'))
+    
+    return render_template('admin_login.html')
+
+@bp.route('/admin/logout')
+def admin_logout():
+    """管理员登出"""
+    session.pop('is_admin', None)
+    session.pop('admin_login_time', None)
+    flash('已退出管理员模式', 'info')
+    return redirect(url_for('public.homepage'))
+
+# ========== 管理员仪表板 ==========
+
+@bp.route('/admin/dashboard')
+@admin_required
+def admin_dashboard():
+    """管理员仪表板 - 主页"""
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库"), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 获取统计信息
+        stats = {}
+        
+        # 文物总数
+        cursor.execute("SELECT COUNT(*) as count FROM ARTIFACTS")
+        stats['total_artifacts'] = cursor.fetchone()['count']
+        
+        # 图片总数
+        cursor.execute("SELECT COUNT(*) as count FROM IMAGE_VERSIONS")
+        stats['total_images'] = cursor.fetchone()['count']
+        
+        # 来源机构数
+        cursor.execute("SELECT COUNT(*) as count FROM SOURCES")
+        stats['total_sources'] = cursor.fetchone()['count']
+        
+        # 最近7天新增文物
+        cursor.execute("""
+            SELECT COUNT(*) as count FROM LOGS 
+            WHERE Table_Name = 'ARTIFACTS' 
+            AND Operation_Type = 'INSERT' 
+            AND Log_Time >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+        """)
+        result = cursor.fetchone()
+        stats['recent_artifacts'] = result['count'] if result else 0
+        
+        # 最近操作日志（前10条）
+        cursor.execute("""
+            SELECT Log_PK, Log_Time, Table_Name, Operation_Type, 
+                   User_ID, Status, Description
+            FROM LOGS
+            ORDER BY Log_Time DESC
+            LIMIT 10
+        """)
+        recent_logs = cursor.fetchall()
+        
+        # 按来源机构统计文物数量
+        cursor.execute("""
+            SELECT s.Museum_Name_CN, COUNT(a.Artifact_PK) as count
+            FROM SOURCES s
+            LEFT JOIN ARTIFACTS a ON s.Source_ID = a.Source_ID
+            GROUP BY s.Source_ID
+            ORDER BY count DESC
+        """)
+        source_stats = cursor.fetchall()
+        
+        # 年份解析情况：年份区间筛选（from_year / to_year）只能匹配已写入 Start_Year 的文物
+        cursor.execute("""
+            SELECT
+                COUNT(Start_Year) AS parsed,
+                COALESCE(SUM(Start_Year IS NULL AND Date_CN IS NOT NULL AND Date_CN != ''), 0) AS unparsed,
+                COALESCE(SUM(Start_Year IS NULL AND (Date_CN IS NULL OR Date_CN = '')), 0) AS undated
+            FROM ARTIFACTS
+        """)
+        year_stats = cursor.fetchone()
+        
+        # 未能解析的年代文本（按文物数量排列，供完善 database/date_process.py 的解析规则）
+        cursor.execute("""
+            SELECT Date_CN, COUNT(*) AS count
+            FROM ARTIFACTS
+            WHERE Start_Year IS NULL AND Date_CN IS NOT NULL AND Date_CN != ''
+            GROUP BY Date_CN
+            ORDER BY count DESC
+            LIMIT 10
+        """)
+        unparsed_dates = cursor.fetchall()
+        
+        cursor.close()
+        conn.close()
+        
+        return render_template('admin_dashboard.html', 
+                             stats=stats,
+                             recent_logs=recent_logs,
+                             source_stats=source_stats,
+                             year_stats=year_stats,
+                             unparsed_dates=unparsed_dates)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/admin/api/pool_stats')
+@admin_required
+def admin_pool_stats():
+    """连接池、熔断器、副本延迟、目录快照、搜索索引、搜索缓存、输入提示与首页候选池统计（用于按 worker 数调整连接池大小）"""
+    return jsonify(dict(db_pool.get_router().stats(),
+                        page_cache=page_cache.stats(),
+                        search_cache=search_cache.stats(),
+                        snapshot=dict(current_app.extensions['catalog_snapshot'].stats(),
+                                      enabled=db_pool.get_snapshot() is not None),
+                        search_index=dict(current_app.extensions['search_index'].stats(),
+                                          enabled=search_index.get_index() is not None),
+                        suggest_index=current_app.extensions['suggest_index'].stats(),
+                        homepage_images=current_app.extensions['homepage_images'].stats()))
+
+# ========== 元数据导入功能 ==========
+
+ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+@bp.route('/admin/import', methods=['GET', 'POST'])
+@admin_required
+def admin_import():
+    """元数据导入页面"""
+    if request.method == 'POST':
+        if 'file' not in request.files:
+            flash('没有上传文件', 'error')
+            return redirect(request.url)
+        
+        file = request.files['file']
+        if file.filename == '':
+            flash('未选择文件', 'error')
+            return redirect(request.url)
+        
+        if file and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            
+            # 读取文件（pandas 体积较大，只在导入时才加载）
+            try:
+                import pandas as pd
+                
+                if filename.endswith('.csv'):
+                    df = pd.read_csv(file, encoding='utf-8')
+                else:
+                    df = pd.read_excel(file)
+                
+                # 验证必需列
+                required_columns = ['Title_CN', 'Source_ID', 'Original_ID']
+                missing_columns = [col for col in required_columns if col not in df.columns]
+                if missing_columns:
+                    flash(f'缺少必需列: {", ".join(missing_columns)}', 'error')
+                    return redirect(request.url)
+                
+                # 导入数据
+                import_mode = request.form.get('import_mode', 'skip')  # skip/update
+                result = import_artifacts_from_dataframe(df, import_mode)
+                if result['inserted'] or result['updated']:
+                    refresh_catalog_snapshot()
+                    current_app.extensions['suggest_index'].refresh_async()
+                    current_app.extensions['homepage_images'].refresh_async()
+                
+                flash(f'导入成功：新增 {result["inserted"]} 条，更新 {result["updated"]} 条，跳过 {result["skipped"]} 条', 'success')
+                return redirect(url_for('admin.admin_dashboard'))
+                
+            except Exception as e:
+                flash(f'导入失败: {str(e)}', 'error')
+                return redirect(request.url)
+        else:
+            flash('不支持的文件格式，请上传 CSV 或 Excel 文件', 'error')
+            return redirect(request.url)
+    
+    return render_template('admin_import.html')
+
+def refresh_catalog_snapshot():
+    """目录数据变更后在后台重新导出快照，完成后原子替换（仅在启用快照后端时）"""
+    snapshot = db_pool.get_snapshot()
+    if snapshot is not None:
+        snapshot.refresh_async()
+
+@bp.cli.command('export-snapshot')
+def export_snapshot_command():
+    """从 MySQL 导出目录快照：flask --app app export-snapshot"""
+    catalog_snapshot = current_app.extensions['catalog_snapshot']
+    result = catalog_snapshot.refresh()
+    for table, count in result['rows'].items():
+        print(f"{table}: {count} 行")
+    print(f"快照已写入 {catalog_snapshot.path}（{result['seconds']} 秒）")
+
+@bp.cli.command('build-search-index')
+def build_search_index_command():
+    """从 MySQL 全量构建进程内搜索索引：flask --app app build-search-index"""
+    index = current_app.extensions['search_index']
+    conn = db_pool.get_router().connect_primary()
+    try:
+        result = index.rebuild(conn)
+    finally:
+        conn.close()
+    print(f"索引 {result['documents']} 件文物、{result['terms']} 个词元，已写入 {index.path}（{result['seconds']} 秒）")
+
+@bp.cli.command('build-suggest-index')
+def build_suggest_index_command():
+    """从 MySQL 重建搜索框输入提示词表：flask --app app build-suggest-index"""
+    index = current_app.extensions['suggest_index']
+    result = index.rebuild_from_primary()
+    print(f"输入提示词表 {result['terms']} 条、预排序前缀 {result['hot_prefixes']} 个，已写入 {index.path}（{result['seconds']} 秒）")
+
+@bp.cli.command('reshuffle-explore')
+def reshuffle_explore_command():
+    """重新生成随机浏览的排列顺序：flask --app app reshuffle-explore"""
+    conn = db_pool.get_router().connect_primary()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE ARTIFACTS SET Shuffle_Key = FLOOR(RAND() * {SHUFFLE_KEY_RANGE})")
+        count = cursor.rowcount
+        cursor.close()
+        catalog_version.bump(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    # 快照中的排序键同步更新
+    snapshot = db_pool.get_snapshot()
+    if snapshot is not None:
+        snapshot.refresh()
+    print(f"已重新打乱 {count} 件文物的随机浏览顺序")
+
+@bp.cli.command('rebuild-category-stats')
+def rebuild_category_stats_command():
+    """从 PROPERTIES 全量重建文化 / 地理统计表：flask --app app rebuild-category-stats"""
+    conn = db_pool.get_router().connect_primary()
+    try:
+        result = category_stats.rebuild(conn)
+        catalog_version.bump(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    snapshot = db_pool.get_snapshot()
+    if snapshot is not None:
+        snapshot.refresh()
+    for table, (count, assigned) in result.items():
+        print(f"{table}: {count} 个分类，新分配 Slug {assigned} 个")
+
+@bp.cli.command('rebuild-era-buckets')
+def rebuild_era_buckets_command():
+    """按 Date_CN 重新判定全部文物的年代分段（era_buckets.py 的规则修改后执行）：flask --app app rebuild-era-buckets"""
+    conn = db_pool.get_router().connect_primary()
+    try:
+        count = era_buckets.rebuild(conn)
+        catalog_version.bump(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    snapshot = db_pool.get_snapshot()
+    if snapshot is not None:
+        snapshot.refresh()
+    print(f"已重新判定 {count} 件文物的年代分段")
+
+def import_artifacts_from_dataframe(df, import_mode='skip'):
+    """从DataFrame导入文物数据"""
+    conn = get_db_connection()
+    if conn is None:
+        raise Exception("无法连接到数据库")
+    
+    result = {'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+    # 已提交的新增 / 更新文物，导入结束后增量更新搜索索引
+    changed_ids = []
+    
+    try:
+        for index, row in df.iterrows():
+            try:
+                artifact_id = None
+                # 检查是否已存在（根据 Source_ID + Original_ID）
+                existing = conn.query_prepared('artifact_by_source', (
+                    to_db_value(row.get('Source_ID')),
+                    to_db_value(row.get('Original_ID'))
+                ))
+                
+                if existing:
+                    if import_mode == 'update':
+                        # 更新模式
+                        artifact_id = existing[0]['Artifact_PK']
+                        update_artifact(conn, artifact_id, row)
+                        result['updated'] += 1
+                    else:
+                        # 跳过模式
+                        result['skipped'] += 1
+                else:
+                    # 插入新记录
+                    artifact_id = insert_artifact(conn, row)
+                    result['inserted'] += 1
+                
+                # 数据版本与本行的变更一起提交，搜索结果缓存随之失效
+                if artifact_id is not None:
+                    catalog_version.bump(conn)
+                conn.commit()
+                if artifact_id is not None:
+                    changed_ids.append(artifact_id)
+                
+            except Exception as e:
+                result['errors'].append(f"行 {index + 2}: {str(e)}")
+                conn.rollback()
+        
+        update_search_index(conn, changed_ids)
+        conn.close()
+        
+    except Exception as e:
+        if conn:
+            conn.close()
+        raise e
+    
+    return result
+
+def update_search_index(conn, artifact_ids):
+    """导入后增量更新进程内搜索索引并保存（仅在启用内存索引搜索时）"""
+    index = search_index.get_index()
+    if index is None or not artifact_ids:
+        return
+    try:
+        index.index_artifacts(conn, artifact_ids)
+        index.save()
+    except (Error, OSError) as e:
+        print(f"Error updating search index: {e}")
+
+def to_db_value(value):
+    """把 DataFrame 单元格的值转换为预处理语句可以发送的 Python 原生类型"""
+    if value is None:
+        return None
+    # numpy 标量（int64、float64 等）
+    if hasattr(value, 'item'):
+        value = value.item()
+    # 空单元格（NaN）
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def insert_artifact(conn, row):
+    """插入新文物记录（语句均为连接上已预处理的语句）"""
+    values = {col: to_db_value(row.get(col)) for col in row.index}
+    
+    # 插入主表
+    cursor = conn.execute_prepared('artifact_insert', (
+        values.get('Source_ID'),
+        values.get('Original_ID'),
+        values.get('Title_CN'),
+        values.get('Title_EN'),
+        values.get('Description_CN'),
+        values.get('Classification'),
+        values.get('Material'),
+        values.get('Date_CN'),
+        values.get('Date_EN'),
+        values.get('Start_Year'),
+        values.get('End_Year'),
+        *era_buckets.normalize_era_from_date_cn(values.get('Date_CN'))
+    ))
+    
+    artifact_id = cursor.lastrowid
+    
+    # 插入原图（如果有）：需在更新统计表之前，新文物的图片可作为分类的代表性图片
+    if values.get('Image_Link') or values.get('Local_Path'):
+        conn.execute_prepared('image_insert', (
+            artifact_id,
+            values.get('Image_Link'),
+            values.get('Local_Path')
+        ))
+    
+    # 插入属性表
+    if any(values.get(col) for col in ['Geography', 'Culture', 'Artist', 'Credit_Line', 'Page_Link']):
+        conn.execute_prepared('property_insert', (
+            artifact_id,
+            values.get('Geography'),
+            values.get('Culture'),
+            values.get('Artist'),
+            values.get('Credit_Line'),
+            values.get('Page_Link')
+        ))
+        category_stats.record_artifact(conn, values, values.get('Local_Path'))
+    
+    # 插入尺寸表（如果有）
+    if values.get('Size_Type') and values.get('Size_Value'):
+        conn.execute_prepared('dimension_insert', (
+            artifact_id,
+            values.get('Size_Type'),
+            values.get('Size_Value'),
+            values.get('Size_Unit')
+        ))
+    
+    # 记录日志
+    conn.execute_prepared('log_insert', (
+        artifact_id,
+        'ARTIFACTS',
+        'INSERT',
+        'admin_import',
+        'Success',
+        f'通过批量导入创建文物: {values.get("Title_CN")}'
+    ))
+    
+    return artifact_id
+
+def update_artifact(conn, artifact_id, row):
+    """更新文物记录"""
+    values = {col: to_db_value(row.get(col)) for col in row.index}
+    
+    conn.execute_prepared('artifact_update', (
+        values.get('Title_CN'),
+        values.get('Title_EN'),
+        values.get('Description_CN'),
+        values.get('Classification'),
+        values.get('Material'),
+        values.get('Date_CN'),
+        values.get('Date_EN'),
+        values.get('Start_Year'),
+        values.get('End_Year'),
+        *era_buckets.normalize_era_from_date_cn(values.get('Date_CN')),
+        artifact_id
+    ))
+    
+    # 记录日志
+    conn.execute_prepared('log_insert', (
+        artifact_id,
+        'ARTIFACTS',
+        'UPDATE',
+        'admin_import',
+        'Success',
+        f'通过批量导入更新文物: {values.get("Title_CN")}'
+    ))
+
+# ========== 图像管理功能 ==========
+
+@bp.route('/admin/images')
+@admin_required
+def admin_images():
+    """图像管理页面"""
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库"), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 获取所有图像记录
+        page = request.args.get('page', 1, type=int)
+        per_page = 50
+        offset = (page - 1) * per_page
+        
+        cursor.execute("""
+            SELECT 
+                iv.Version_PK,
+                iv.Artifact_PK,
+                a.Title_CN,
+                iv.Version_Type,
+                iv.Local_Path,
+                iv.File_Size_KB,
+                iv.Last_Processed_Time
+            FROM IMAGE_VERSIONS iv
+            INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
+            ORDER BY iv.Last_Processed_Time DESC
+            LIMIT %s OFFSET %s
+        """, (per_page, offset))
+        
+        images = cursor.fetchall()
+        
+        # 获取总数
+        cursor.execute("SELECT COUNT(*) as count FROM IMAGE_VERSIONS")
+        total = cursor.fetchone()['count']
+        
+        cursor.close()
+        conn.close()
+        
+        return render_template('admin_images.html', 
+                             images=images,
+                             page=page,
+                             per_page=per_page,
+                             total=total)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/admin/image/replace/<int:version_id>', methods=['POST'])
+@admin_required
+def admin_replace_image(version_id):
+    """替换图像文件"""
+    if 'file' not in request.files:
+        return jsonify({'success': False, 'message': '没有上传文件'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'success': False, 'message': '未选择文件'}), 400
+    
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '数据库连接失败'}), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 获取原图像信息
+        cursor.execute("""
+            SELECT Local_Path, Artifact_PK 
+            FROM IMAGE_VERSIONS 
+            WHERE Version_PK = %s
+        """, (version_id,))
+        
+        old_image = cursor.fetchone()
+        if not old_image:
+            return jsonify({'success': False, 'message': '图像记录不存在'}), 404
+        
+        old_path = old_image['Local_Path']
+        artifact_id = old_image['Artifact_PK']
+        
+        # 保存新文件（使用原文件名）
+        new_filename = secure_filename(file.filename)
+        new_path = old_path  # 保持路径不变，只替换文件
+        
+        # 确保目录存在
+        file_dir = os.path.join('static', os.path.dirname(new_path))
+        os.makedirs(file_dir, exist_ok=True)
+        
+        # 保存文件
+        file.save(os.path.join('static', new_path))
+        
+        # 获取文件大小
+        file_size_kb = os.path.getsize(os.path.join('static', new_path)) / 1024
+        
+        # 更新数据库记录
+        cursor.execute("""
+            UPDATE IMAGE_VERSIONS SET
+                File_Size_KB = %s,
+                Last_Processed_Time = NOW()
+            WHERE Version_PK = %s
+        """, (file_size_kb, version_id))
+        
+        # 记录替换日志
+        cursor.execute("""
+            INSERT INTO LOGS (
+                Artifact_PK, Table_Name, Operation_Type, 
+                User_ID, Status, Description
+            ) VALUES (%s, %s, %s, %s, %s, %s)
+        """, (
+            artifact_id,
+            'IMAGE_VERSIONS',
+            'IMAGE_REPLACE',
+            session.get('username', 'admin'),
+            'Success',
+            f'图像文件替换: {old_path} -> {new_path} (版本ID: {version_id})'
+        ))
+        
+        # 搜索结果中包含图片路径，替换图像同样更新数据版本
+        catalog_version.bump(conn)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        refresh_catalog_snapshot()
+        
+        return jsonify({'success': True, 'message': '图像替换成功'})
+        
+    except Exception as e:
+        if conn:
+            conn.rollback()
+            conn.close()
+        return jsonify({'success': False, 'message': f'替换失败: {str(e)}'}), 500
+
+# ========== 日志查看功能 ==========
+
+@bp.route('/admin/logs')
+@admin_required
+def admin_logs():
+    """日志查看页面"""
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库"), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 获取筛选参数
+        operation_type = request.args.get('operation_type', '')
+        table_name = request.args.get('table_name', '')
+        date_from = request.args.get('date_from', '')
+        date_to = request.args.get('date_to', '')
+        
+        # 构建查询
+        query = """
+            SELECT 
+                l.Log_PK,
+                l.Log_Time,
+                l.Artifact_PK,
+                a.Title_CN as artifact_title,
+                l.Table_Name,
+                l.Operation_Type,
+                l.User_ID,
+                l.Status,
+                l.Description
+            FROM LOGS l
+            LEFT JOIN ARTIFACTS a ON l.Artifact_PK = a.Artifact_PK
+            WHERE 1=1
+        """
+        params = []
+        
+        if operation_type:
+            query += " AND l.Operation_Type = %s"
+            params.append(operation_type)
+        
+        if table_name:
+            query += " AND l.Table_Name = %s"
+            params.append(table_name)
+        
+        if date_from:
+            query += " AND DATE(l.Log_Time) >= %s"
+            params.append(date_from)
+        
+        if date_to:
+            query += " AND DATE(l.Log_Time) <= %s"
+            params.append(date_to)
+        
+        query += " ORDER BY l.Log_Time DESC LIMIT 1000"
+        
+        cursor.execute(query, params)
+        logs = cursor.fetchall()
+        
+        # 获取筛选选项
+        cursor.execute("SELECT DISTINCT Operation_Type FROM LOGS ORDER BY Operation_Type")
+        operation_types = [row['Operation_Type'] for row in cursor.fetchall()]
+        
+        cursor.execute("SELECT DISTINCT Table_Name FROM LOGS ORDER BY Table_Name")
+        table_names = [row['Table_Name'] for row in cursor.fetchall()]
+        
+        cursor.close()
+        conn.close()
+        
+        return render_template('admin_logs.html', 
+                             logs=logs,
+                             operation_types=operation_types,
+                             table_names=table_names,
+                             filters={
+                                 'operation_type': operation_type,
+                                 'table_name': table_name,
+                                 'date_from': date_from,
+                                 'date_to': date_to
+                             })
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+# ========== API: 获取导入模板 ==========
+
+@bp.route('/admin/api/download_template')
+@admin_required
+def download_import_template():
+    """下载导入模板CSV"""
+    import io
+    import pandas as pd
+    from flask import send_file
+    
+    # 创建模板数据
+    template_data = {
+        'Source_ID': [1],
+        'Original_ID': ['EXAMPLE-001'],
+        'Title_CN': ['示例文物'],
+        'Title_EN': ['Example Artifact'],
+        'Description_CN': ['这是一个示例描述'],
+        'Classification': ['青铜器'],
+        'Material': ['青铜'],
+        'Date_CN': ['商代晚期'],
+        'Date_EN': ['Late Shang Dynasty'],
+        'Start_Year': [-1300],
+        'End_Year': [-1046],
+        'Geography': ['河南安阳'],
+        'Culture': ['商文化'],
+        'Artist': ['佚名'],
+        'Credit_Line': ['某博物馆藏'],
+        'Page_Link': ['https://example.com'],
+        'Image_Link': ['https://example.com/images/example-001.jpg'],
+        'Local_Path': ['images/example-001.jpg'],
+        'Size_Type': ['高'],
+        'Size_Value': [25.5],
+        'Size_Unit': ['cm']
+    }
+    
+    df = pd.DataFrame(template_data)
+    
+    # 创建内存中的CSV文件
+    output = io.BytesIO()
+    df.to_csv(output, index=False, encoding='utf-8-sig')
+    output.seek(0)
+    
+    return send_file(
+        output,
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name='artifact_import_template.csv'
+    )
@@ -0,0 +1,95 @@
+"""
+蓝图共用的辅助函数：图片路径规范化、详情页数据组装、列表页流式渲染
+"""
+
+import os
+import types
+
+from flask import Response, render_template, stream_template
+
+
+def normalize_image_path(path):
+    if not path:
+        return None
+
+    path = str(path).strip()
+
+    # 步驟 1: 修正反斜線
+    path = path.replace('\\', '/')
+
+    # 步驟 2: 去掉 static/ 以前的前綴
+    path_lower = path.lower()
+    static_keyword = 'static/'
+    static_index = path_lower.rfind(static_keyword)
+    if static_index != -1:
+        path = path[static_index + len(static_keyword):]
+
+    # 步驟 3: 確保前面有 images/ （解決 404 核心問題）
+    path = path.lstrip('/')
+
+    # 你的 Local_Path 儲存的是 met_images/xxx.jpg
+    # 如果路徑是 met_images/xxx.jpg，我們需要加上 images/
+    if path.startswith('met_images/'):
+        path = 'images/' + path
+
+    return path
+
+def image_paths(rows):
+    """把查询到的图片行转换为规范化后的图片路径列表（忽略空路径）"""
+    paths = []
+    for row in rows:
+        if row.get('local_path'):
+            path = normalize_image_path(row['local_path'])
+            if path:
+                paths.append(path)
+    return paths
+
+def build_artifact_detail(artifact, images, dimensions):
+    """
+    组装详情页数据：主图与缩略图列表、格式化后的尺寸字符串
+    同步路由与异步路由（asgi.py）共用
+    """
+    # 设置主图和缩略图列表（第一张作为主图，所有图片作为缩略图列表）
+    paths = image_paths(images)
+    artifact['local_path'] = paths[0] if paths else None
+    artifact['image_paths'] = paths
+    
+    # 格式化尺寸信息为字符串
+    dim_parts = []
+    for dim in dimensions:
+        if dim.get('size_value') and dim.get('size_unit'):
+            dim_parts.append(f"{dim['size_type']}: {dim['size_value']} {dim['size_unit']}")
+        elif dim.get('size_value'):
+            dim_parts.append(f"{dim['size_type']}: {dim['size_value']}")
+    artifact['dimensions'] = '; '.join(dim_parts) if dim_parts else None
+    return artifact
+
+# 列表页流式渲染（STREAM_LISTINGS=0 时退回一次性渲染）
+STREAM_LISTINGS = os.getenv('STREAM_LISTINGS', '1') not in ('0', 'false', 'False')
+
+def iter_artifact_rows(cursor):
+    """
+    逐行读取未缓冲游标的结果集，规范化图片路径后产出
+    结果行从服务端按需读取，读完或渲染中断时关闭游标
+    """
+    try:
+        for row in cursor:
+            if row.get('local_path'):
+                row['local_path'] = normalize_image_path(row['local_path'])
+            yield row
+    finally:
+        cursor.close()
+
+def render_listing(template_name, **context):
+    """
+    渲染文物列表页面
+    流式模式下模板边渲染边输出，每次只有一行结果驻留内存；
+    否则把生成器展开后一次性渲染
+    """
+    if STREAM_LISTINGS:
+        return Response(stream_template(template_name, **context), mimetype='text/html')
+    context = {
+        key: list(value) if isinstance(value, types.GeneratorType) else value
+        for key, value in context.items()
+    }
+    return render_template(template_name, **context)
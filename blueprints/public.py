@@ -0,0 +1,1119 @@
+"""
+公开页面蓝图：首页、随机浏览、搜索、文化 / 地理 / 年代浏览、文物详情与平台支持
+"""
+
+from flask import Blueprint, current_app, render_template, request, abort, session, redirect, url_for, flash, jsonify
+from mysql.connector import Error
+import base64
+import hashlib
+import json
+import secrets
+from urllib.parse import quote
+
+from query_builder import build_search_query, build_search_facets_query, build_search_count_query, build_search_params, boolean_mode_term, build_explore_query, build_category_stats_query, build_category_artifacts_query, build_era_artifacts_query, year_overlap, SHUFFLE_KEY_RANGE, SEARCH_INDEX_SQL_HITS
+from db_pool import get_db_connection, read_replica
+from page_cache import stale_fallback
+import search_index
+import search_cache
+from suggest_index import MAX_SUGGESTIONS
+import catalog_version
+from blueprints.common import normalize_image_path, build_artifact_detail, iter_artifact_rows, render_listing
+from era_buckets import normalize_era_from_date_cn
+
+bp = Blueprint('public', __name__)
+
+# 搜索结果分页：默认每页条数与 page_size 参数上限
+SEARCH_PAGE_SIZE = 40
+SEARCH_MAX_PAGE_SIZE = 100
+
+# 输入提示默认条数（上限见 suggest_index.MAX_SUGGESTIONS）
+SUGGEST_LIMIT = 8
+
+# 随机浏览每页条数
+EXPLORE_PAGE_SIZE = 60
+
+# 文化 / 地理 / 年代目录每页条数（limit 参数可调整，上限 LISTING_MAX_PAGE_SIZE）
+LISTING_PAGE_SIZE = 60
+LISTING_MAX_PAGE_SIZE = 200
+LISTING_API_FIELDS = ('id', 'title', 'date', 'thumbnail')
+
+# /api/search 的卡片字段（fields= 可选其中一部分）；响应可被缓存，但每次使用前须用 ETag 向服务器确认
+SEARCH_API_FIELDS = ('id', 'title', 'date', 'thumbnail', 'culture', 'material')
+SEARCH_API_CACHE_CONTROL = 'public, no-cache'
+
+
+def era_key(system: str, bucket: str) -> str:
+    """
+    生成 URL key：east__ming / west__modern 这种
+    """
+    sys_map = {"东方纪年": "east", "西方纪年": "west"}
+    bucket_map = {
+        # east
+        "宋": "song", "明": "ming", "清": "qing", "明清": "ming-qing", "其他东": "other-east",
+        # west
+        "古代": "ancient", "中世纪": "medieval", "近世": "early-modern", "近代": "modern", "现代": "contemporary", "其他西": "other-west"
+    }
+    return f"{sys_map.get(system, 'west')}__{bucket_map.get(bucket, 'other-west')}"
+
+
+def era_from_key(key: str):
+    """
+    反解 era_key → (system, bucket)
+    """
+    sys_rev = {"east": "东方纪年", "west": "西方纪年"}
+    bucket_rev = {
+        "song": "宋", "ming": "明", "qing": "清", "ming-qing": "明清", "other-east": "其他东",
+        "ancient": "古代", "medieval": "中世纪", "early-modern": "近世", "modern": "近代", "contemporary": "现代", "other-west": "其他西"
+    }
+    if "__" not in key:
+        return (None, None)
+    a, b = key.split("__", 1)
+    return (sys_rev.get(a), bucket_rev.get(b))
+
+# 文化描述映射（用于文化浏览页面）
+CULTURE_DESCRIPTIONS = {
+    '中华文化': '包含中原、楚、巴蜀、吴越等地域文化遗产。',
+    '日本文化': '绳文陶器、浮世绘、刀剑与漆器艺术。',
+    '西亚文化': '美索不达米亚、波斯与伊斯兰文明的瑰宝。',
+    '埃及文化': '尼罗河流域的法老文明、神庙与墓葬艺术。',
+    '希腊罗马文化': '古典雕塑、建筑构件与地中海文明遗存。',
+    '印度文化': '佛教造像、印度教神像与南亚次大陆艺术。',
+}
+
+@bp.route('/')
+def homepage():
+    """
+    动态主页：沉浸式首屏和自由浏览入口
+    随机、文化、地理三组背景图从内存候选池中抽取，不访问数据库（见 homepage_images.py）
+    """
+    return render_template('homepage.html', **current_app.extensions['homepage_images'].draw())
+
+def explore_start(seed):
+    """种子 -> 该种子在随机排列中的起点（Shuffle_Key 取值范围内的一个位置）"""
+    digest = hashlib.sha1(seed.encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % SHUFFLE_KEY_RANGE
+
+def explore_position():
+    """
+    -> (种子, 是否已绕回开头, 上一页末尾的 Shuffle_Key, 上一页末尾的 Artifact_PK)
+    有效的 cursor 优先；否则 ?seed= 指定种子、?shuffle=1 换新种子，都没有时沿用 session 中该访客的种子
+    """
+    payload = decode_cursor(request.args.get('cursor', ''))
+    if payload is not None:
+        try:
+            return str(payload['seed']), bool(payload['w']), int(payload['k']), int(payload['i'])
+        except (ValueError, KeyError, TypeError):
+            pass
+    
+    seed = request.args.get('seed', '').strip()[:32]
+    if not seed and not request.args.get('shuffle'):
+        seed = session.get('explore_seed')
+    if not seed:
+        seed = secrets.token_hex(4)
+    session['explore_seed'] = seed
+    # 第一页从起点开始（含起点）
+    return seed, False, explore_start(seed), 0
+
+@bp.route('/explore')
+@bp.route('/random')
+@read_replica
+def random_browse():
+    """
+    随机浏览页面：按访客种子确定的随机顺序分页浏览全部文物
+    所有文物按预先生成的 (Shuffle_Key, Artifact_PK) 排成一个随机排列，种子决定从排列中的哪个位置开始，
+    读到末尾后绕回开头、到起点为止。每页沿索引只读取一页的行；同一种子、同一游标总是得到同一页
+    """
+    seed, wrapped, last_key, last_id = explore_position()
+    start = explore_start(seed)
+    
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        # 多取一行判断是否还有下一页
+        artifacts = []
+        if not wrapped:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(build_explore_query(), (last_key, last_key, last_id, EXPLORE_PAGE_SIZE + 1))
+            artifacts = list(iter_artifact_rows(cursor))
+            if len(artifacts) <= EXPLORE_PAGE_SIZE:
+                # 起点之后的部分已读完，从排列开头继续
+                wrapped, last_key, last_id = True, -1, 0
+        if wrapped and len(artifacts) <= EXPLORE_PAGE_SIZE:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(build_explore_query(wrapped=True),
+                           (last_key, last_key, last_id, start, EXPLORE_PAGE_SIZE + 1 - len(artifacts)))
+            artifacts.extend(iter_artifact_rows(cursor))
+        
+        next_url = None
+        if len(artifacts) > EXPLORE_PAGE_SIZE:
+            artifacts = artifacts[:EXPLORE_PAGE_SIZE]
+            last = artifacts[-1]
+            next_url = url_for('public.random_browse', cursor=encode_cursor({
+                'seed': seed,
+                'w': int(last['shuffle_key'] < start),
+                'k': last['shuffle_key'],
+                'i': last['artifact_id'],
+            }))
+        
+        return render_listing('index.html', artifacts=artifacts, page_title='随机浏览',
+                              next_url=next_url,
+                              reshuffle_url=url_for('public.random_browse', shuffle=1))
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/artifact/<int:artifact_id>')
+@read_replica
+@stale_fallback
+def detail(artifact_id):
+    """
+    详情页面：读取特定文物的详细信息
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        # 查询文物的基本信息（不包含图片），三条语句均使用连接上已预处理的语句
+        rows = conn.query_prepared('artifact_detail', (artifact_id,))
+        artifact = rows[0] if rows else None
+        
+        if artifact is None:
+            conn.close()
+            abort(404)
+        
+        # 查询该文物的所有图片与尺寸信息
+        images = conn.query_prepared('artifact_images', (artifact_id,))
+        dimensions = conn.query_prepared('artifact_dimensions', (artifact_id,))
+        artifact = build_artifact_detail(artifact, images, dimensions)
+        
+        conn.close()
+            
+        return render_template('detail.html', artifact=artifact)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/api/suggest')
+def suggest():
+    """
+    搜索框输入提示：返回以 q 开头的标题、文化、艺术家与材质，按文物数量降序
+    只查询内存中的前缀词表，不访问数据库
+    """
+    q = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', SUGGEST_LIMIT, type=int), 1), MAX_SUGGESTIONS)
+    index = current_app.extensions['suggest_index']
+    index.reload_if_changed()
+    response = jsonify({
+        'q': q,
+        'suggestions': [
+            {'text': text, 'field': field, 'count': count}
+            for text, field, count in index.suggest(q, limit)
+        ]
+    })
+    # 每次按键都会请求，允许浏览器短时间复用
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+def year_range_args():
+    """from_year / to_year 参数 -> (起始年, 结束年)，负数表示公元前；缺少或无法识别的一端为 None，起止颠倒时交换"""
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None and to_year is not None and from_year > to_year:
+        from_year, to_year = to_year, from_year
+    return from_year, to_year
+
+def year_range_condition():
+    """请求中的年份区间 -> (年份区间, 追加在 WHERE 之后的 " AND ..." 条件, 参数)；未指定时条件为空"""
+    year_range = year_range_args()
+    if year_range == (None, None):
+        return year_range, '', ()
+    condition, params = year_overlap(*year_range)
+    return year_range, f" AND {condition}", tuple(params)
+
+def search_args():
+    """搜索关键词、筛选与排序参数（页面与 /api/search 共用）-> (关键词, 筛选字典, 排序方式)
+    筛选字典只包含有值的筛选（同时用于显示筛选标签与缓存键）
+    """
+    search_term = request.args.get('q', '').strip()
+    from_year, to_year = year_range_args()
+    
+    active_filters = {}
+    for name in ('era', 'culture', 'material', 'region'):
+        values = request.args.getlist(name)
+        if values:
+            active_filters[name] = values
+    if from_year is not None:
+        active_filters['from_year'] = [from_year]
+    if to_year is not None:
+        active_filters['to_year'] = [to_year]
+    
+    return search_term, active_filters, request.args.get('sort', 'relevance')
+
+def search_cache_key(search_term, active_filters, sort_by, page, page_size):
+    index = search_index.get_index()
+    return search_cache.make_key(search_term, active_filters, sort_by, page, page_size,
+                                 index.generation if index is not None else None)
+
+def run_search(conn, search_term, active_filters, sort_by, page, page_size, version, cache_key):
+    """
+    执行一页搜索，返回 artifacts / artifact_count / count_estimated / has_next / filter_options
+    同一页搜索结果按数据版本缓存，命中时不再执行任何搜索查询
+    """
+    cached = search_cache.lookup(version, cache_key)
+    if cached is not None:
+        return cached
+    
+    cursor = conn.cursor(dictionary=True)
+    
+    # 构建搜索查询（排序在 SQL 中完成；目录快照连接使用 SQLite 全文索引）
+    # 启用进程内倒排索引时，命中文物与相关度由内存索引给出，数据库只补全结果
+    dialect = getattr(conn, 'dialect', 'mysql')
+    index = search_index.get_index()
+    index_hits = index.search(search_term) if index is not None else None
+    from_index = index_hits is not None
+    
+    if dialect == 'mysql' and not from_index and not boolean_mode_term(search_term):
+        # 关键词只有引号或布尔运算符时全文查询没有可匹配的内容（直接执行会导致语法错误）
+        cursor.close()
+        return {
+            'artifacts': [],
+            'artifact_count': 0,
+            'count_estimated': False,
+            'has_next': False,
+            'filter_options': {'eras': [], 'cultures': [], 'materials': [], 'regions': []},
+        }
+    
+    # 进程内索引的命中已按得分排好序，总数即命中数；交给数据库的只有得分最高的 SEARCH_INDEX_SQL_HITS 条
+    # （侧栏计数、筛选与按年代排序），不随命中数增长
+    sql_hits = index_hits[:SEARCH_INDEX_SQL_HITS] if from_index else None
+    
+    # 先聚合计数，得到命中总数与四组筛选选项，不必读取全部结果行（筛选选项基于未筛选的搜索结果）
+    cursor.execute(build_search_facets_query(search_term, dialect, from_index),
+                   build_search_params(search_term, dialect, sql_hits))
+    facet_rows = cursor.fetchall()
+    if from_index:
+        artifact_count = len(index_hits)
+    else:
+        artifact_count = sum(row['artifact_count'] for row in facet_rows if row['facet'] == 'total')
+    
+    # 获取筛选选项数据（基于原始搜索结果，在筛选前计算）
+    try:
+        filter_options = get_filter_options_from_facets(facet_rows)
+    except Exception as e:
+        print(f"Error getting filter options: {e}")
+        # 如果获取失败，使用空数据
+        filter_options = {
+            'eras': [],
+            'cultures': [],
+            'materials': [],
+            'regions': []
+        }
+    
+    # 文化 / 材质 / 地区 / 年代 / 年份区间筛选与排序在 SQL 中完成，只读取当前页的结果行
+    search_filters = dict(active_filters)
+    search_params = build_search_params(search_term, dialect, sql_hits, search_filters)
+    
+    # 结果总数：未筛选时即命中总数（精确）；有筛选时只在前 SEARCH_COUNT_SAMPLE 条命中中计数，
+    # 命中更多时按样本中符合筛选的比例估算
+    count_estimated = False
+    if active_filters:
+        cursor.execute(build_search_count_query(search_term, dialect, from_index, search_filters), search_params)
+        counts = cursor.fetchone()
+        if counts['sampled'] >= artifact_count:
+            # 样本覆盖了全部命中
+            artifact_count = counts['artifact_count']
+        else:
+            artifact_count = round(artifact_count * counts['artifact_count'] / counts['sampled'])
+            count_estimated = True
+    
+    offset = (page - 1) * page_size
+    if from_index and not active_filters and sort_by not in ('era_asc', 'era_desc'):
+        # 无筛选、按相关度或编号排序：排序与分页在内存中完成，数据库只按顺序补全这一页
+        ordered = sorted(index_hits, key=lambda hit: -hit[0]) if sort_by == 'newest' else index_hits
+        page_hits = ordered[offset:offset + page_size]
+        has_next = len(ordered) > offset + page_size
+        if page_hits:
+            cursor.execute(build_search_query(search_term, sort_by, dialect, from_index),
+                           build_search_params(search_term, dialect, page_hits))
+            artifacts = list(iter_artifact_rows(cursor))
+        else:
+            cursor.close()
+            artifacts = []
+    else:
+        # 多取一行判断是否还有下一页
+        query = build_search_query(search_term, sort_by, dialect, from_index, search_filters, paginate=True)
+        cursor.execute(query, search_params + (page_size + 1, offset))
+        artifacts = list(iter_artifact_rows(cursor))
+        has_next = len(artifacts) > page_size
+        artifacts = artifacts[:page_size]
+    if count_estimated:
+        # 估算值不小于已经翻到的结果数
+        artifact_count = max(artifact_count, offset + len(artifacts) + (1 if has_next else 0))
+    
+    results = {
+        'artifacts': artifacts,
+        'artifact_count': artifact_count,
+        'count_estimated': count_estimated,
+        'has_next': has_next,
+        'filter_options': filter_options,
+    }
+    search_cache.store(version, cache_key, results)
+    return results
+
+@bp.route('/search')
+@read_replica
+def search():
+    """
+    搜索页面：根据关键词搜索文物
+    支持在标题、艺术家、文化、部门、年代、描述、材质中搜索
+    支持高级筛选（年代、文化、材质、地区、from_year / to_year 年份区间）和排序功能
+    """
+    search_term, active_filters, sort_by = search_args()
+    
+    # 分页参数
+    page = max(request.args.get('page', 1, type=int), 1)
+    page_size = min(max(request.args.get('page_size', SEARCH_PAGE_SIZE, type=int), 1), SEARCH_MAX_PAGE_SIZE)
+    
+    if not search_term:
+        # 如果没有搜索关键词，重定向到首页
+        return redirect(url_for('public.homepage'))
+    
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        version = catalog_version.current(conn)
+        cache_key = search_cache_key(search_term, active_filters, sort_by, page, page_size)
+        results = run_search(conn, search_term, active_filters, sort_by, page, page_size, version, cache_key)
+        
+        # 渲染搜索结果页面
+        return render_listing('search.html', 
+                              search_term=search_term,
+                              active_filters=active_filters,
+                              sort_by=sort_by,
+                              page=page,
+                              page_size=page_size,
+                              **results)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+def encode_cursor(payload):
+    """游标：JSON 的 base64url 编码（不含填充），调用方不需要解析"""
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).rstrip(b'=').decode()
+
+def decode_cursor(token):
+    """-> dict；无法解码时返回 None"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+def _search_fingerprint(search_term, active_filters, sort_by):
+    # 与页码无关的查询指纹：游标只能用于生成它的关键词、筛选与排序
+    key = search_cache.make_key(search_term, active_filters, sort_by, None, None)
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+
+def encode_search_cursor(search_term, active_filters, sort_by, page, page_size):
+    """下一页游标：页码、每页条数与查询指纹"""
+    return encode_cursor({'p': page, 's': page_size, 'f': _search_fingerprint(search_term, active_filters, sort_by)})
+
+def decode_search_cursor(token, search_term, active_filters, sort_by):
+    """-> (页码, 每页条数)；游标无效或属于其他查询（关键词、筛选、排序不同）时返回 None"""
+    payload = decode_cursor(token)
+    try:
+        page, page_size = int(payload['p']), int(payload['s'])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if payload.get('f') != _search_fingerprint(search_term, active_filters, sort_by):
+        return None
+    if page < 1 or not 1 <= page_size <= SEARCH_MAX_PAGE_SIZE:
+        return None
+    return page, page_size
+
+def search_card(row, fields):
+    """结果行 -> 只含 fields 中字段的 JSON 卡片"""
+    card = {
+        'id': row['artifact_id'],
+        'title': row.get('title'),
+        'date': row.get('date_text'),
+        'thumbnail': url_for('static', filename=row['local_path']) if row.get('local_path') else None,
+        'culture': row.get('culture_name'),
+        'material': row.get('medium'),
+    }
+    return {field: card[field] for field in fields}
+
+@bp.route('/api/search')
+@read_replica
+def api_search():
+    """
+    搜索 JSON 接口：参数与 /search 相同（q、era、culture、material、region、from_year、to_year、sort），另有
+    - limit：每页条数（默认 SEARCH_PAGE_SIZE，最大 SEARCH_MAX_PAGE_SIZE）
+    - cursor：上一次响应的 next_cursor，取下一页（每页条数沿用游标中的值）
+    - fields：逗号分隔的卡片字段（默认全部 SEARCH_API_FIELDS）
+    - facets=0：不返回筛选选项计数
+    结果与页面共用搜索结果缓存；ETag 由数据版本与请求参数得出，数据未更新时条件请求返回 304 且不执行搜索
+    """
+    search_term, active_filters, sort_by = search_args()
+    if not search_term:
+        return jsonify({'success': False, 'message': '缺少搜索关键词 q'}), 400
+    
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or list(SEARCH_API_FIELDS)
+    unknown = [f for f in fields if f not in SEARCH_API_FIELDS]
+    if unknown:
+        return jsonify({'success': False, 'message': f"未知字段: {', '.join(unknown)}"}), 400
+    include_facets = request.args.get('facets', '1') not in ('0', 'false')
+    
+    token = request.args.get('cursor')
+    if token:
+        position = decode_search_cursor(token, search_term, active_filters, sort_by)
+        if position is None:
+            return jsonify({'success': False, 'message': '游标无效或与查询条件不符'}), 400
+        page, page_size = position
+    else:
+        page = 1
+        page_size = min(max(request.args.get('limit', SEARCH_PAGE_SIZE, type=int), 1), SEARCH_MAX_PAGE_SIZE)
+    
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '无法连接到数据库'}), 503
+    
+    try:
+        version = catalog_version.current(conn)
+        cache_key = search_cache_key(search_term, active_filters, sort_by, page, page_size)
+        # 版本表不存在时无法判断数据是否更新，不生成 ETag
+        etag = None
+        if version is not None:
+            etag = hashlib.sha1(repr((version, cache_key, fields, include_facets)).encode()).hexdigest()
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = SEARCH_API_CACHE_CONTROL
+                return response
+        
+        results = run_search(conn, search_term, active_filters, sort_by, page, page_size, version, cache_key)
+    except Error as e:
+        print(f"Error in api_search: {e}")
+        return jsonify({'success': False, 'message': '搜索失败'}), 500
+    
+    body = {
+        'q': search_term,
+        'count': results['artifact_count'],
+        'count_estimated': results['count_estimated'],
+        'results': [search_card(row, fields) for row in results['artifacts']],
+        'next_cursor': (encode_search_cursor(search_term, active_filters, sort_by, page + 1, page_size)
+                        if results['has_next'] else None),
+    }
+    if include_facets:
+        options = results['filter_options']
+        body['facets'] = {name: options.get(key, []) for name, key in
+                          (('era', 'eras'), ('culture', 'cultures'), ('material', 'materials'), ('region', 'regions'))}
+    response = jsonify(body)
+    if etag is not None:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = SEARCH_API_CACHE_CONTROL
+    return response
+
+def _facet_options(counts, total):
+    """[(取值, 数量)] -> 筛选选项列表；total 大于所列数量之和时追加"其他"（不可筛选）"""
+    options = [{'value': value, 'label': label, 'count': count} for value, label, count in counts]
+    others = total - sum(count for _, _, count in counts)
+    if others > 0:
+        options.append({'value': None, 'label': '其他', 'count': others})
+    return options
+
+def get_filter_options_from_facets(facet_rows):
+    """
+    由 build_search_facets_query 的聚合行生成四组筛选选项（仅包含搜索结果中出现的），按数量降序，
+    每组最多 SEARCH_FACET_LIMIT 项，其余合并为"其他"
+    年代的值为 "体系_分段"（即 /era/<key> 解码后的 key）
+    """
+    groups = {'era': [], 'culture': [], 'material': [], 'region': []}
+    totals = {}
+    
+    for row in facet_rows:
+        facet = row['facet']
+        if facet in groups:
+            value = row['value']
+            label = value
+            if facet == 'era':
+                system, bucket = value.split('_', 1)
+                label = f"{bucket}（{system}）"
+            groups[facet].append((value, label, row['artifact_count']))
+            totals[facet] = row['total']
+    
+    for facet in groups:
+        groups[facet].sort(key=lambda x: (-x[2], x[0]))
+    
+    return {
+        'eras': _facet_options(groups['era'], totals.get('era', 0)),
+        'cultures': _facet_options(groups['culture'], totals.get('culture', 0)),
+        'materials': _facet_options(groups['material'], totals.get('material', 0)),
+        'regions': _facet_options(groups['region'], totals.get('region', 0))
+    }
+
+@bp.route('/browse')
+@read_replica
+@stale_fallback
+def browse_cultures():
+    """
+    文化浏览页面：显示所有文化分类
+    每个文化显示名称、文物数量、代表性图片和描述
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 从文化统计表按索引顺序读取（统计表在导入时增量更新，见 migrations/007_create_category_stats.sql）
+        cursor.execute(build_category_stats_query('culture'))
+        cultures_raw = cursor.fetchall()
+        
+        # 转换数据格式：culture_id 为统计表中的固定编号，详情页地址使用 slug
+        cultures = []
+        for culture in cultures_raw:
+            culture_dict = {
+                'culture_id': culture['stats_id'],
+                'slug': culture['slug'],
+                'culture_name': culture['name'],
+                'artifact_count': culture['artifact_count'],
+                'representative_image': culture['representative_image']
+            }
+            cultures.append(culture_dict)
+        
+        # 为每个文化添加描述和规范化图片路径
+        for culture in cultures:
+            culture_name = culture.get('culture_name', '')
+            # 添加描述（如果映射中存在）
+            culture['description'] = CULTURE_DESCRIPTIONS.get(culture_name, 
+                f'探索{culture_name}的丰富文化遗产和艺术珍品。')
+            # 规范化图片路径
+            if culture.get('representative_image'):
+                culture['representative_image'] = normalize_image_path(culture['representative_image'])
+        
+        cursor.close()
+        conn.close()
+        
+        return render_template('browse.html', cultures=cultures)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+def listing_page_args():
+    """-> (before, 每页条数)；before 为上一页最后一件文物的编号（keyset 游标），第一页为 None"""
+    before = request.args.get('before', type=int)
+    page_size = min(max(request.args.get('limit', LISTING_PAGE_SIZE, type=int), 1), LISTING_MAX_PAGE_SIZE)
+    return before, page_size
+
+def split_page(rows, page_size):
+    """多取的一行用于判断是否还有下一页 -> (本页文物行, 下一页的 before 或 None)"""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, rows[-1]['artifact_id']
+    return rows, None
+
+def fetch_category_page(conn, category, name, before, page_size, year_condition, year_params):
+    """文化 / 地理目录的一页文物 -> (文物行, 下一页的 before)"""
+    keyset = (before,) if before is not None else ()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(build_category_artifacts_query(category, keyset=before is not None, year_condition=year_condition),
+                   (name,) + keyset + year_params + (page_size + 1,))
+    return split_page(list(iter_artifact_rows(cursor)), page_size)
+
+def fetch_era_page(conn, system, bucket, before, page_size, year_condition, year_params):
+    """年代目录的一页文物 -> (文物行, 下一页的 before)"""
+    keyset = (before,) if before is not None else ()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(build_era_artifacts_query(keyset=before is not None, year_condition=year_condition),
+                   (system, bucket) + keyset + year_params + (page_size + 1,))
+    return split_page(list(iter_artifact_rows(cursor)), page_size)
+
+def listing_links(next_before, endpoint, api_endpoint, **view_args):
+    """下一页的页面地址与无限滚动 JSON 地址（保留年份等查询参数）；没有下一页时为 None"""
+    if next_before is None:
+        return {'next_url': None, 'next_api_url': None}
+    args = dict(request.args.to_dict(flat=False), before=next_before)
+    return {'next_url': url_for(endpoint, **view_args, **args),
+            'next_api_url': url_for(api_endpoint, **view_args, **args)}
+
+def listing_json(artifacts, next_before, api_endpoint, **view_args):
+    """无限滚动接口的响应：一页文物卡片与下一页的接口地址"""
+    return jsonify({
+        'results': [search_card(row, LISTING_API_FIELDS) for row in artifacts],
+        'next_before': next_before,
+        'next_url': listing_links(next_before, api_endpoint, api_endpoint, **view_args)['next_api_url'],
+    })
+
+def category_artifacts_json(category, slug, api_endpoint):
+    """文化 / 地理目录的无限滚动接口：参数 before、limit、from_year、to_year 与页面相同"""
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '无法连接到数据库'}), 503
+    
+    try:
+        rows = conn.query_prepared(f'{category}_stats_by_slug', (slug,))
+        if not rows:
+            return jsonify({'success': False, 'message': '分类不存在'}), 404
+        _, year_condition, year_params = year_range_condition()
+        before, page_size = listing_page_args()
+        artifacts, next_before = fetch_category_page(conn, category, rows[0]['name'], before, page_size,
+                                                     year_condition, year_params)
+    except Error as e:
+        print(f"Error in category_artifacts_json: {e}")
+        return jsonify({'success': False, 'message': '查询失败'}), 500
+    return listing_json(artifacts, next_before, api_endpoint, slug=slug)
+
+@bp.route('/api/culture/<slug>/artifacts')
+@read_replica
+def api_culture_artifacts(slug):
+    """文化目录的下一页文物（JSON，供无限滚动）"""
+    return category_artifacts_json('culture', slug, 'public.api_culture_artifacts')
+
+@bp.route('/api/geography/<slug>/artifacts')
+@read_replica
+def api_geography_artifacts(slug):
+    """地理目录的下一页文物（JSON，供无限滚动）"""
+    return category_artifacts_json('geography', slug, 'public.api_geography_artifacts')
+
+def redirect_category_position(category, position, endpoint):
+    """
+    旧的数字地址（浏览页上的序号）302 重定向到 Slug 地址，保留查询参数
+    序号按当前的排序解析，与统计表中的固定编号无关：数量变化后同一序号会指向另一个分类，因此不能用永久重定向
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        row = None
+        if position >= 1:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(build_category_stats_query(category, position=True), (position - 1,))
+            row = cursor.fetchone()
+            cursor.close()
+        conn.close()
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+    
+    if not row or not row['slug']:
+        abort(404)
+    return redirect(url_for(endpoint, slug=row['slug'], **request.args.to_dict(flat=False)), 302)
+
+@bp.route('/culture/<int:culture_id>')
+@read_replica
+def culture_by_position(culture_id):
+    """旧的文化目录地址 /culture/<序号>"""
+    return redirect_category_position('culture', culture_id, 'public.culture_detail')
+
+@bp.route('/culture/<slug>')
+@read_replica
+def culture_detail(slug):
+    """
+    某个文化的文物目录页面：按编号降序分页显示该文化下的文物（?before= 翻页）
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        # 按 slug 经唯一索引找到对应的文化
+        rows = conn.query_prepared('culture_stats_by_slug', (slug,))
+        if not rows:
+            conn.close()
+            abort(404)
+        culture_name = rows[0]['name']
+        artifact_count = rows[0]['artifact_count']
+        culture = {'culture_id': rows[0]['stats_id'], 'slug': slug, 'culture_name': culture_name}
+        
+        # 该文化下的一页文物（按编号降序的 keyset 分页，可按 from_year / to_year 筛选年份区间）
+        year_range, year_condition, year_params = year_range_condition()
+        before, page_size = listing_page_args()
+        artifacts, next_before = fetch_category_page(conn, 'culture', culture_name, before, page_size,
+                                                     year_condition, year_params)
+        conn.close()
+        
+        # 文物数量取自文化统计表（按年份区间筛选时数量事先未知）
+        return render_listing('culture_detail.html',
+                              culture=culture,
+                              artifacts=artifacts,
+                              artifact_count=None if year_params else artifact_count,
+                              year_range=year_range,
+                              **listing_links(next_before, 'public.culture_detail', 'public.api_culture_artifacts', slug=slug))
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/geographies')
+@bp.route('/browse_geographies')
+@read_replica
+@stale_fallback
+def browse_geographies():
+    """
+    空间浏览页面：显示所有地理分类
+    每个地理区域显示名称、文物数量、代表性图片和描述
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # 从地理统计表按索引顺序读取
+        cursor.execute(build_category_stats_query('geography'))
+        geographies_raw = cursor.fetchall()
+        
+        # 转换数据格式：geography_id 为统计表中的固定编号，详情页地址使用 slug
+        geographies = []
+        for geography in geographies_raw:
+            geography_dict = {
+                'geography_id': geography['stats_id'],
+                'slug': geography['slug'],
+                'geography_name': geography['name'],
+                'artifact_count': geography['artifact_count'],
+                'representative_image': geography['representative_image']
+            }
+            geographies.append(geography_dict)
+        
+        # 为每个地理区域添加描述和规范化图片路径
+        for geography in geographies:
+            geography_name = geography.get('geography_name', '')
+            # 添加描述
+            geography['description'] = f'探索{geography_name}地区的丰富文化遗产和艺术珍品。'
+            # 规范化图片路径
+            if geography.get('representative_image'):
+                geography['representative_image'] = normalize_image_path(geography['representative_image'])
+        
+        cursor.close()
+        conn.close()
+        
+        return render_template('browse_geographies.html', geographies=geographies)
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/geography/<int:geography_id>')
+@read_replica
+def geography_by_position(geography_id):
+    """旧的地理目录地址 /geography/<序号>"""
+    return redirect_category_position('geography', geography_id, 'public.geography_detail')
+
+@bp.route('/geography/<slug>')
+@read_replica
+def geography_detail(slug):
+    """
+    某个地理区域的文物目录页面：按编号降序分页显示该地理区域下的文物（?before= 翻页）
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html', 
+                             error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+    
+    try:
+        # 按 slug 经唯一索引找到对应的地理区域
+        rows = conn.query_prepared('geography_stats_by_slug', (slug,))
+        if not rows:
+            conn.close()
+            abort(404)
+        geography_name = rows[0]['name']
+        artifact_count = rows[0]['artifact_count']
+        geography = {'geography_id': rows[0]['stats_id'], 'slug': slug, 'geography_name': geography_name}
+        
+        # 该地理区域下的一页文物（按编号降序的 keyset 分页，可按 from_year / to_year 筛选年份区间）
+        year_range, year_condition, year_params = year_range_condition()
+        before, page_size = listing_page_args()
+        artifacts, next_before = fetch_category_page(conn, 'geography', geography_name, before, page_size,
+                                                     year_condition, year_params)
+        conn.close()
+        
+        # 文物数量取自地理统计表（按年份区间筛选时数量事先未知）
+        return render_listing('geography_detail.html',
+                              geography=geography,
+                              artifacts=artifacts,
+                              artifact_count=None if year_params else artifact_count,
+                              year_range=year_range,
+                              **listing_links(next_before, 'public.geography_detail', 'public.api_geography_artifacts', slug=slug))
+    except Error as e:
+        if conn:
+            conn.close()
+        return render_template('error.html', 
+                             error_message=f"数据库查询错误: {str(e)}"), 500
+
+
+
+def era_key(system, bucket):
+    """將年代體系和名稱組合成 URL 友好的 key"""
+    # 使用 quote 確保中文能夠在 URL 中正確傳輸
+    return quote(f"{system}_{bucket}")
+
+def era_from_key(era_key_str):
+    """從 URL 友好的 key 中解析出年代體系和名稱"""
+    try:
+        from urllib.parse import unquote # 確保 unquote 在這裡可用
+        decoded_str = unquote(era_key_str)
+        parts = decoded_str.split('_', 1)
+        if len(parts) == 2:
+            return parts[0], parts[1]
+        return None, None
+    except Exception:
+        return None, None
+
+
+@bp.route('/eras')
+@bp.route('/browse_eras')
+def browse_eras():
+    """
+    年代浏览入口页：只显示“东方纪年 / 西方纪年”
+    """
+    return render_template('browse_eras_entry.html')
+
+
+def _build_era_buckets():
+    """
+    从数据库抓 Date_CN + 代表图，然后按 (system, bucket) 统计数量与代表图。
+    """
+    conn = get_db_connection()
+    if conn is None:
+        return None, (render_template('error.html',
+                                      error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500)
+    try:
+        cursor = conn.cursor(dictionary=True)
+        query = """
+            SELECT
+                a.Artifact_PK,
+                a.Date_CN AS date_text,
+                ANY_VALUE(iv.Local_Path) AS representative_image
+            FROM ARTIFACTS a
+            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
+            WHERE a.Date_CN IS NOT NULL AND a.Date_CN != ''
+            GROUP BY a.Artifact_PK
+        """
+        cursor.execute(query)
+        rows = cursor.fetchall()
+
+        buckets = {}
+        for r in rows:
+            system, bucket = normalize_era_from_date_cn(r.get('date_text', ''))
+            k = (system, bucket)
+            if k not in buckets:
+                buckets[k] = {"count": 0, "rep_img": None}
+            buckets[k]["count"] += 1
+            if buckets[k]["rep_img"] is None and r.get("representative_image"):
+                buckets[k]["rep_img"] = normalize_image_path(r["representative_image"])
+
+        cursor.close()
+        conn.close()
+        return buckets, None
+
+    except Error as e:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        return None, (render_template('error.html', error_message=f"数据库查询错误: {str(e)}"), 500)
+
+
+@bp.route('/browse_eras/east')
+@read_replica
+@stale_fallback
+def browse_eras_east():
+    buckets, err = _build_era_buckets()
+    if err:
+        return err
+
+    east_order = ["宋", "明", "清", "明清", "其他东"]
+    eras = []
+    for b in east_order:
+        k = ("东方纪年", b)
+        if k in buckets and buckets[k]["count"] > 0:
+            eras.append({
+                "era_key": era_key("东方纪年", b),
+                "title": b,
+                "artifact_count": buckets[k]["count"],
+                "representative_image": buckets[k]["rep_img"],
+                "description": f"东方纪年 · {b}"
+            })
+
+    return render_template(
+        'browse_eras.html',
+        page_title="东方纪年",
+        back_url=url_for('public.browse_eras'),
+        eras=eras
+    )
+
+
+@bp.route('/browse_eras/west')
+@read_replica
+@stale_fallback
+def browse_eras_west():
+    buckets, err = _build_era_buckets()
+    if err:
+        return err
+
+    # 1. 先定义每个年代桶对应的年份区间（你可以按需要调整）
+    west_order = ["古代", "中世纪", "近世", "近代", "现代", "其他西"]
+    west_ranges = {
+        "古代":  "（公元前 - 500）",
+        "中世纪": "（501 - 1500）",
+        "近世":  "（1501 - 1800）",
+        "近代":  "（1801 - 1900）",
+        "现代":  "（1901 - 今）",
+        "其他西": ""   # 可以留空或写“（待定）”
+    }
+
+    eras = []
+    for b in west_order:
+        k = ("西方纪年", b)
+        if k in buckets and buckets[k]["count"] > 0:
+            eras.append({
+                "era_key": era_key("西方纪年", b),
+                # 2. 标题里同时放“桶名 + 年份区间”
+                "title": f"{b}{west_ranges.get(b, '')}",
+                "artifact_count": buckets[k]["count"],
+                "representative_image": buckets[k]["rep_img"],
+                "description": f"西方纪年 · {b}{west_ranges.get(b, '')}"
+            })
+
+    return render_template(
+        'browse_eras.html',
+        page_title="西方纪年",
+        back_url=url_for('public.browse_eras'),
+        eras=eras
+    )
+
+@bp.route('/era/<era_key_str>')
+@read_replica
+def era_detail(era_key_str):
+    """
+    年代桶详情：按编号降序分页显示该(东方/西方 + bucket)下的文物卡片（?before= 翻页）
+    """
+    system, bucket = era_from_key(era_key_str)
+    if not system or not bucket:
+        abort(404)
+
+    conn = get_db_connection()
+    if conn is None:
+        return render_template('error.html',
+                               error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500
+
+    try:
+        # 沿年代分段索引分页，可按 from_year / to_year 筛选年份区间
+        year_range, year_condition, year_params = year_range_condition()
+        before, page_size = listing_page_args()
+        artifacts, next_before = fetch_era_page(conn, system, bucket, before, page_size, year_condition, year_params)
+        conn.close()
+
+        # 年代分段没有预先统计的数量
+        return render_listing(
+            'era_detail.html',
+            era={"system": system, "bucket": bucket, "era_key": era_key_str},
+            artifacts=artifacts,
+            artifact_count=None,
+            year_range=year_range,
+            **listing_links(next_before, 'public.era_detail', 'public.api_era_artifacts', era_key_str=era_key_str)
+        )
+
+    except Error as e:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        return render_template('error.html', error_message=f"数据库查询错误: {str(e)}"), 500
+
+@bp.route('/api/era/<era_key_str>/artifacts')
+@read_replica
+def api_era_artifacts(era_key_str):
+    """年代目录的下一页文物（JSON，供无限滚动）"""
+    system, bucket = era_from_key(era_key_str)
+    if not system or not bucket:
+        return jsonify({'success': False, 'message': '年代不存在'}), 404
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '无法连接到数据库'}), 503
+
+    try:
+        _, year_condition, year_params = year_range_condition()
+        before, page_size = listing_page_args()
+        artifacts, next_before = fetch_era_page(conn, system, bucket, before, page_size, year_condition, year_params)
+    except Error as e:
+        print(f"Error in api_era_artifacts: {e}")
+        return jsonify({'success': False, 'message': '查询失败'}), 500
+    return listing_json(artifacts, next_before, 'public.api_era_artifacts', era_key_str=era_key_str)
+
+# ========== 平台支持 ==========
+
+@bp.route('/support')
+def support():
+    """平台支持页面 - 主菜单"""
+    return render_template('support.html')
+
+@bp.route('/support/guide')
+def support_guide():
+    """平台支持 - 使用指南"""
+    return render_template('support_guide.html')
+
+@bp.route('/support/contact')
+def support_contact():
+    """平台支持 - 联系与反馈"""
+    return render_template('support_contact.html')
+
+@bp.route('/support/contact', methods=['POST'])
+def support_contact_submit():
+    """处理反馈提交"""
+    feedback_type = request.form.get('feedback_type', '')
+    email = request.form.get('email', '')
+    description = request.form.get('description', '')
+    
+    # TODO: 这里可以添加实际的反馈处理逻辑（如发送邮件、保存到数据库等）
+    flash(f'感谢您的反馈！我们会尽快处理您的{feedback_type}请求。', 'success')
+    return redirect(url_for('public.support'))
+
+@bp.route('/support/admin')
+def support_admin():
+    """平台支持 - 后台管理（需要密码）"""
+    # 简单的密码验证，如果已经验证过就显示页面
+    if session.get('support_admin_verified'):
+        return render_template('support_admin.html')
+    return redirect(url_for('public.support_admin_login'))
+
+@bp.route('/support/admin/login', methods=['GET', 'POST'])
+def support_admin_login():
+    """后台管理密码验证"""
+    if request.method == 'POST':
+        password = request.form.get('password', '')
+        if password == 'admin':  # 演示密码
+            session['support_admin_verified'] = True
+            return redirect(url_for('public.support_admin'))
+        else:
+            flash('密码错误，访问拒绝。', 'error')
+    return render_template('support_admin_login.html')
@@ -0,0 +1,907 @@
+"""
+用户蓝图：注册登录、用户中心、图集管理与收藏相关 API
+"""
+
+from flask import Blueprint, render_template, request, abort, session, redirect, url_for, flash, jsonify
+from mysql.connector import Error
+import re
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from db_pool import get_db_connection
+from blueprints.common import normalize_image_path
+
+bp = Blueprint('user', __name__)
+
+
+# ========== 用户认证相关函数 ==========
+
+def validate_email(email):
+    """验证邮箱格式"""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def get_user_by_email(email):
+    """根据邮箱获取用户"""
+    conn = get_db_connection()
+    if conn is None:
+        return None
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM Users WHERE email = %s", (email,))
+        user = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        return user
+    except Error as e:
+        print(f"Error getting user: {e}")
+        if conn:
+            conn.close()
+        return None
+
+def create_user(email, password, username=None):
+    """创建新用户"""
+    conn = get_db_connection()
+    if conn is None:
+        return None
+    
+    try:
+        cursor = conn.cursor()
+        password_hash = generate_password_hash(password)
+        if username is None:
+            username = email.split('@')[0]  # 默认用户名为邮箱前缀
+        
+        cursor.execute("""
+            INSERT INTO Users (email, password_hash, username)
+            VALUES (%s, %s, %s)
+        """, (email, password_hash, username))
+        
+        user_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return user_id
+    except Error as e:
+        print(f"Error creating user: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return None
+
+def get_user_albums(user_id):
+    """获取用户的图集列表，包含封面图片"""
+    conn = get_db_connection()
+    if conn is None:
+        return []
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT a.*, 
+                   COUNT(DISTINCT c.collection_id) as item_count,
+                   (SELECT iv.Local_Path 
+                    FROM Collections c2
+                    INNER JOIN ARTIFACTS art ON c2.artifact_id = art.Artifact_PK
+                    LEFT JOIN IMAGE_VERSIONS iv ON art.Artifact_PK = iv.Artifact_PK
+                    WHERE c2.album_id = a.album_id 
+                      AND iv.Local_Path IS NOT NULL 
+                      AND iv.Local_Path != ''
+                    ORDER BY c2.created_at DESC
+                    LIMIT 1) as cover_image
+            FROM Albums a
+            LEFT JOIN Collections c ON a.album_id = c.album_id
+            WHERE a.user_id = %s
+            GROUP BY a.album_id
+            ORDER BY a.created_at DESC
+        """, (user_id,))
+        albums = cursor.fetchall()
+        
+        # 规范化封面图片路径
+        for album in albums:
+            if album.get('cover_image'):
+                album['cover_image'] = normalize_image_path(album['cover_image'])
+        
+        cursor.close()
+        conn.close()
+        return albums
+    except Error as e:
+        print(f"Error getting albums: {e}")
+        if conn:
+            conn.close()
+        return []
+
+
+def get_user_collection_stats(user_id):
+    """获取用户收藏统计信息（虚拟数据用于演示）"""
+    # 这里返回虚拟数据，实际应该从数据库查询
+    return {
+        'total_count': 234,
+        'era_distribution': {
+            '商周时期': 60,
+            '秦汉时期': 25,
+            '唐宋时期': 15
+        },
+        'material_composition': {
+            '青铜': 70,
+            '玉器': 20,
+            '其他': 10
+        }
+    }
+
+def get_export_records(user_id):
+    """获取用户的导出记录"""
+    conn = get_db_connection()
+    if conn is None:
+        return []
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT er.*, a.name as album_name
+            FROM ExportRecords er
+            LEFT JOIN Albums a ON er.album_id = a.album_id
+            WHERE er.user_id = %s
+            ORDER BY er.created_at DESC
+            LIMIT 10
+        """, (user_id,))
+        records = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return records
+    except Error as e:
+        print(f"Error getting export records: {e}")
+        if conn:
+            conn.close()
+        return []
+
+def create_album(user_id, name, is_public=True):
+    """创建新图集"""
+    conn = get_db_connection()
+    if conn is None:
+        return None
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO Albums (user_id, name, is_public)
+            VALUES (%s, %s, %s)
+        """, (user_id, name, is_public))
+        
+        album_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return album_id
+    except Error as e:
+        print(f"Error creating album: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return None
+
+def get_default_album(user_id):
+    """获取或创建用户的默认图集"""
+    conn = get_db_connection()
+    if conn is None:
+        return None
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        # 先查找是否已有默认收藏夹
+        cursor.execute("""
+            SELECT album_id FROM Albums 
+            WHERE user_id = %s AND name = '默认收藏夹'
+            LIMIT 1
+        """, (user_id,))
+        album = cursor.fetchone()
+        
+        if album:
+            album_id = album['album_id']
+        else:
+            # 创建默认收藏夹
+            cursor.execute("""
+                INSERT INTO Albums (user_id, name, is_public)
+                VALUES (%s, '默认收藏夹', TRUE)
+            """, (user_id,))
+            album_id = cursor.lastrowid
+            conn.commit()
+        
+        cursor.close()
+        conn.close()
+        return album_id
+    except Error as e:
+        print(f"Error getting default album: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return None
+
+def add_artifact_to_album(album_id, artifact_id):
+    """添加文物到图集（如果已存在则不重复添加）"""
+    conn = get_db_connection()
+    if conn is None:
+        print("Error: Database connection failed")
+        return False
+    
+    try:
+        # 确保类型正确
+        album_id = int(album_id)
+        artifact_id = int(artifact_id)
+        
+        # 检查是否已存在
+        if conn.query_prepared('collection_exists', (album_id, artifact_id)):
+            # 已存在，不重复添加，但返回True表示操作成功
+            conn.close()
+            return True
+        
+        # 添加新的收藏记录
+        conn.execute_prepared('collection_insert', (album_id, artifact_id))
+        
+        conn.commit()
+        conn.close()
+        print(f"Successfully added artifact {artifact_id} to album {album_id}")
+        return True
+    except Error as e:
+        print(f"Error adding artifact to album: {e}")
+        print(f"Album ID: {album_id}, Artifact ID: {artifact_id}")
+        import traceback
+        traceback.print_exc()
+        if conn:
+            conn.rollback()
+            conn.close()
+        return False
+    except Exception as e:
+        print(f"Unexpected error adding artifact to album: {e}")
+        import traceback
+        traceback.print_exc()
+        if conn:
+            conn.close()
+        return False
+
+
+
+def get_album_artifacts(album_id):
+    """获取图集中的所有文物"""
+    conn = get_db_connection()
+    if conn is None:
+        return []
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        # 修复GROUP BY错误：将created_at添加到GROUP BY或使用MIN/MAX
+        cursor.execute("""
+            SELECT 
+                a.Artifact_PK AS artifact_id,
+                a.Title_CN AS title,
+                a.Date_CN AS date_text,
+                ANY_VALUE(iv.Local_Path) AS local_path,
+                MIN(c.created_at) AS created_at
+            FROM Collections c
+            INNER JOIN ARTIFACTS a ON c.artifact_id = a.Artifact_PK
+            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
+            WHERE c.album_id = %s
+            GROUP BY a.Artifact_PK, a.Title_CN, a.Date_CN
+            ORDER BY MIN(c.created_at) ASC
+        """, (album_id,))
+        artifacts = cursor.fetchall()
+        
+        # 规范化图片路径
+        for artifact in artifacts:
+            if artifact.get('local_path'):
+                artifact['local_path'] = normalize_image_path(artifact['local_path'])
+        
+        cursor.close()
+        conn.close()
+        return artifacts
+    except Error as e:
+        print(f"Error getting album artifacts: {e}")
+        print(f"Album ID: {album_id}, Error: {str(e)}")
+        if conn:
+            conn.close()
+        return []
+
+# ========== 用户认证路由 ==========
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    """用户注册"""
+    if request.method == 'POST':
+        email = request.form.get('email', '').strip()
+        password = request.form.get('password', '').strip()
+        username = request.form.get('username', '').strip()
+        
+        # 验证输入
+        if not email or not password:
+            flash('邮箱和密码不能为空', 'error')
+            return redirect(url_for('user.user_center'))
+        
+        if not validate_email(email):
+            flash('邮箱格式不正确', 'error')
+            return redirect(url_for('user.user_center'))
+        
+        if len(password) < 6:
+            flash('密码长度至少为6位', 'error')
+            return redirect(url_for('user.user_center'))
+        
+        # 检查用户是否已存在
+        if get_user_by_email(email):
+            flash('该邮箱已被注册', 'error')
+            return redirect(url_for('user.user_center'))
+        
+        # 创建用户
+        user_id = create_user(email, password, username if username else None)
+        if user_id:
+            session['user_id'] = user_id
+            session['email'] = email
+            session['username'] = username if username else email.split('@')[0]
+            flash('注册成功！', 'success')
+            return redirect(url_for('user.user_center'))
+        else:
+            flash('注册失败，请稍后重试', 'error')
+            return redirect(url_for('user.user_center'))
+    
+    return redirect(url_for('user.user_center'))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    """用户登录"""
+    if request.method == 'POST':
+        email = request.form.get('email', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        if not email or not password:
+            flash('邮箱和密码不能为空', 'error')
+            return redirect(url_for('user.user_center'))
+        
+        user = get_user_by_email(email)
+        if user and check_password_hash(user['password_hash'], password):
+            session['user_id'] = user['user_id']
+            session['email'] = user['email']
+            session['username'] = user.get('username') or email.split('@')[0]
+            flash('登录成功！', 'success')
+            return redirect(url_for('user.user_center'))
+        else:
+            flash('邮箱或密码错误', 'error')
+            return redirect(url_for('user.user_center'))
+    
+    return redirect(url_for('user.user_center'))
+
+@bp.route('/logout')
+def logout():
+    """用户登出"""
+    session.clear()
+    flash('已退出登录', 'info')
+    return redirect(url_for('user.user_center'))
+
+# ========== 图集相关API路由 ==========
+
+@bp.route('/api/albums', methods=['GET'])
+def get_albums_api():
+    """获取当前用户的图集列表（JSON格式，用于添加到图集时的选择）"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'albums': []})
+    
+    albums = get_user_albums(user_id)
+    return jsonify({'albums': [{'album_id': a['album_id'], 'name': a['name']} for a in albums]})
+
+@bp.route('/api/album/create', methods=['POST'])
+def create_album_api():
+    """创建新图集（API）"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'message': '请先登录'}), 401
+    
+    data = request.get_json()
+    album_name = data.get('name', '').strip()
+    is_public = data.get('is_public', True)
+    
+    if not album_name:
+        return jsonify({'success': False, 'message': '图集名称不能为空'}), 400
+    
+    album_id = create_album(user_id, album_name, is_public)
+    if album_id:
+        return jsonify({'success': True, 'album_id': album_id, 'message': '图集创建成功'})
+    else:
+        return jsonify({'success': False, 'message': '创建图集失败'}), 500
+
+
+@bp.route('/api/artifact/add_to_album', methods=['POST'])
+def add_to_album_api():
+    """添加文物到图集"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': '请求数据无效'}), 400
+        
+        artifact_id = data.get('artifact_id')
+        album_id = data.get('album_id')
+        album_name = data.get('album_name') or ''
+        album_name = album_name.strip() if album_name else ''  # 用于创建新图集
+        
+        # 转换artifact_id为整数
+        try:
+            artifact_id = int(artifact_id) if artifact_id else None
+        except (ValueError, TypeError):
+            return jsonify({'success': False, 'message': '文物ID格式错误'}), 400
+        
+        if not artifact_id:
+            return jsonify({'success': False, 'message': '文物ID不能为空'}), 400
+        
+        # 验证文物是否存在
+        conn = get_db_connection()
+        if conn:
+            try:
+                if not conn.query_prepared('artifact_exists', (artifact_id,)):
+                    conn.close()
+                    return jsonify({'success': False, 'message': '文物不存在'}), 404
+                conn.close()
+            except Exception as e:
+                print(f"Error checking artifact: {e}")
+                if conn:
+                    conn.close()
+        
+        user_id = session.get('user_id')
+        
+        # 如果未登录，使用session存储
+        if not user_id:
+            # 未登录用户：使用session存储默认收藏夹
+            if 'guest_collections' not in session:
+                session['guest_collections'] = []
+            
+            # 检查是否已存在
+            if artifact_id not in session['guest_collections']:
+                session['guest_collections'].append(artifact_id)
+                session.modified = True
+                return jsonify({'success': True, 'message': '已添加到默认收藏夹'})
+            else:
+                return jsonify({'success': True, 'message': '该文物已在收藏夹中'})
+        
+        # 已登录用户
+        if album_name:
+            # 创建新图集
+            album_id = create_album(user_id, album_name)
+            if not album_id:
+                return jsonify({'success': False, 'message': '创建图集失败'}), 500
+        
+        # 转换album_id为整数（如果存在）
+        if album_id:
+            try:
+                album_id = int(album_id)
+            except (ValueError, TypeError):
+                album_id = None
+        
+        if not album_id:
+            # 如果没有指定图集，使用默认收藏夹
+            album_id = get_default_album(user_id)
+            if not album_id:
+                return jsonify({'success': False, 'message': '获取默认图集失败'}), 500
+        
+        # 验证图集属于当前用户
+        albums = get_user_albums(user_id)
+        if not any(a['album_id'] == album_id for a in albums):
+            return jsonify({'success': False, 'message': '无权访问该图集'}), 403
+        
+        # 添加文物到图集
+        if add_artifact_to_album(album_id, artifact_id):
+            return jsonify({'success': True, 'message': '已添加到图集'})
+        else:
+            return jsonify({'success': False, 'message': '添加失败，请检查数据库连接'}), 500
+            
+    except Exception as e:
+        print(f"Error in add_to_album_api: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'message': f'添加失败: {str(e)}'}), 500
+
+@bp.route('/api/album/delete', methods=['POST'])
+def delete_album_api():
+    """删除图集"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'message': '请先登录'}), 401
+    
+    data = request.get_json()
+    album_id = data.get('album_id')
+    
+    if not album_id:
+        return jsonify({'success': False, 'message': '图集ID不能为空'}), 400
+    
+    try:
+        album_id = int(album_id)
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'message': '图集ID格式错误'}), 400
+    
+    # 验证图集属于当前用户
+    albums = get_user_albums(user_id)
+    album = next((a for a in albums if a['album_id'] == album_id), None)
+    
+    if not album:
+        return jsonify({'success': False, 'message': '图集不存在或无权限'}), 403
+    
+    # 不能删除默认收藏夹
+    if album['name'] == '默认收藏夹':
+        return jsonify({'success': False, 'message': '不能删除默认收藏夹'}), 400
+    
+    # 删除图集（外键约束会自动删除相关的Collections记录）
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '数据库连接失败'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM Albums WHERE album_id = %s AND user_id = %s", (album_id, user_id))
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return jsonify({'success': True, 'message': '图集已删除'})
+    except Error as e:
+        print(f"Error deleting album: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return jsonify({'success': False, 'message': '删除失败'}), 500
+
+@bp.route('/api/album/rename', methods=['POST'])
+def rename_album_api():
+    """重命名图集"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'message': '请先登录'}), 401
+    
+    data = request.get_json()
+    album_id = data.get('album_id')
+    new_name = data.get('name', '').strip()
+    
+    if not album_id:
+        return jsonify({'success': False, 'message': '图集ID不能为空'}), 400
+    
+    if not new_name:
+        return jsonify({'success': False, 'message': '图集名称不能为空'}), 400
+    
+    try:
+        album_id = int(album_id)
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'message': '图集ID格式错误'}), 400
+    
+    # 验证图集属于当前用户
+    albums = get_user_albums(user_id)
+    album = next((a for a in albums if a['album_id'] == album_id), None)
+    
+    if not album:
+        return jsonify({'success': False, 'message': '图集不存在或无权限'}), 403
+    
+    # 更新图集名称
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '数据库连接失败'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE Albums SET name = %s WHERE album_id = %s AND user_id = %s", 
+                      (new_name, album_id, user_id))
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return jsonify({'success': True, 'message': '图集已重命名'})
+    except Error as e:
+        print(f"Error renaming album: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return jsonify({'success': False, 'message': '重命名失败'}), 500
+
+@bp.route('/api/album/remove_artifact', methods=['POST'])
+def remove_artifact_from_album_api():
+    """从图集中删除文物"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'message': '请先登录'}), 401
+    
+    data = request.get_json()
+    album_id = data.get('album_id')
+    artifact_id = data.get('artifact_id')
+    
+    if not album_id or not artifact_id:
+        return jsonify({'success': False, 'message': '图集ID和文物ID不能为空'}), 400
+    
+    try:
+        album_id = int(album_id)
+        artifact_id = int(artifact_id)
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'message': 'ID格式错误'}), 400
+    
+    # 验证图集属于当前用户
+    albums = get_user_albums(user_id)
+    if not any(a['album_id'] == album_id for a in albums):
+        return jsonify({'success': False, 'message': '无权访问该图集'}), 403
+    
+    # 删除收藏记录
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'success': False, 'message': '数据库连接失败'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM Collections 
+            WHERE album_id = %s AND artifact_id = %s
+        """, (album_id, artifact_id))
+        conn.commit()
+        affected_rows = cursor.rowcount
+        cursor.close()
+        conn.close()
+        
+        if affected_rows > 0:
+            return jsonify({'success': True, 'message': '已从图集中移除'})
+        else:
+            return jsonify({'success': False, 'message': '该文物不在图集中'}), 404
+    except Error as e:
+        print(f"Error removing artifact from album: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return jsonify({'success': False, 'message': '删除失败'}), 500
+
+# ========== 用户中心路由 ==========
+
+@bp.route('/user')
+@bp.route('/user_center')
+def user_center():
+    """用户中心页面"""
+    user_id = session.get('user_id')
+    
+    if user_id:
+        # 已登录用户 - 获取用户信息
+        user = get_user_by_email(session.get('email'))
+        if not user:
+            session.clear()
+            return render_template('user_center.html', is_logged_in=False)
+        
+        # 获取用户图集
+        albums = get_user_albums(user_id)
+        
+        # 确保有默认收藏夹
+        has_default = any(a['name'] == '默认收藏夹' for a in albums)
+        if not has_default:
+            get_default_album(user_id)
+            albums = get_user_albums(user_id)
+        
+        # 获取收藏统计（虚拟数据）
+        stats = get_user_collection_stats(user_id)
+        
+        # 获取导出记录
+        export_records = get_export_records(user_id)
+        
+        # 如果没有导出记录，创建一些虚拟记录用于演示
+        if not export_records:
+            export_records = [
+                {
+                    'created_at': '2025-12-04 14:30',
+                    'description': '商周青铜器研究 - 完整元数据',
+                    'format': 'CSV',
+                    'status': '已完成',
+                    'album_name': '商周青铜器研究'
+                },
+                {
+                    'created_at': '2025-12-03 09:15',
+                    'description': '默认收藏夹 - 图像包(高才)',
+                    'format': 'ZIP',
+                    'status': '已完成',
+                    'album_name': '默认收藏夹'
+                },
+                {
+                    'created_at': '2025-12-03 09:10',
+                    'description': '纹样灵感 - 报告',
+                    'format': 'PDF',
+                    'status': '处理中',
+                    'album_name': '纹样灵感'
+                }
+            ]
+        
+        # 确保有默认收藏夹（已经在上面处理了，这里只是备用）
+        # 如果没有图集，创建默认收藏夹
+        if not albums:
+            get_default_album(user_id)
+            albums = get_user_albums(user_id)
+        
+        return render_template('user_center.html', 
+                             is_logged_in=True,
+                             user=user,
+                             albums=albums,
+                             stats=stats,
+                             export_records=export_records,
+                             page_view='collections')  # 默认显示collections视图（仪表盘已注释）
+    else:
+        # 未登录用户 - 显示访客模式
+        # 获取session中的收藏
+        guest_collections = session.get('guest_collections', [])
+        
+        # 获取封面图片（第一张图片）
+        cover_image = None
+        if guest_collections:
+            conn = get_db_connection()
+            if conn:
+                try:
+                    cursor = conn.cursor(dictionary=True)
+                    cursor.execute("""
+                        SELECT iv.Local_Path 
+                        FROM ARTIFACTS a
+                        LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
+                        WHERE a.Artifact_PK = %s 
+                          AND iv.Local_Path IS NOT NULL 
+                          AND iv.Local_Path != ''
+                        LIMIT 1
+                    """, (guest_collections[0],))
+                    result = cursor.fetchone()
+                    if result:
+                        cover_image = normalize_image_path(result['Local_Path'])
+                    cursor.close()
+                    conn.close()
+                except Error as e:
+                    print(f"Error getting guest cover: {e}")
+                    if conn:
+                        conn.close()
+        
+        guest_albums = [{
+            'album_id': 'guest_default',
+            'name': '默认收藏夹',
+            'is_public': True,
+            'item_count': len(guest_collections),
+            'cover_image': cover_image
+        }]
+        return render_template('user_center.html', 
+                             is_logged_in=False,
+                             albums=guest_albums)
+
+@bp.route('/album/<int:album_id>')
+def album_detail(album_id):
+    """显示图集详情（已登录用户）"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect(url_for('user.user_center'))
+    
+    # 验证图集属于当前用户
+    albums = get_user_albums(user_id)
+    album = next((a for a in albums if a['album_id'] == album_id), None)
+    
+    if not album:
+        abort(404)
+    
+    # 获取图集中的文物
+    artifacts = get_album_artifacts(album_id)
+    
+    return render_template('album_detail.html', album=album, artifacts=artifacts)
+
+
+@bp.route('/album/guest')
+def guest_album_detail():
+    """显示访客默认收藏夹"""
+    guest_collections = session.get('guest_collections', [])
+    
+    if not guest_collections:
+        # 如果没有收藏，返回空列表
+        artifacts = []
+    else:
+        # 获取文物信息
+        conn = get_db_connection()
+        if conn is None:
+            artifacts = []
+        else:
+            try:
+                cursor = conn.cursor(dictionary=True)
+                placeholders = ','.join(['%s'] * len(guest_collections))
+                query = f"""
+                    SELECT 
+                        a.Artifact_PK AS artifact_id,
+                        a.Title_CN AS title,
+                        a.Date_CN AS date_text,
+                        ANY_VALUE(iv.Local_Path) AS local_path
+                    FROM ARTIFACTS a
+                    LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
+                    WHERE a.Artifact_PK IN ({placeholders})
+                    GROUP BY a.Artifact_PK
+                    ORDER BY a.Artifact_PK DESC
+                """
+                cursor.execute(query, guest_collections)
+                artifacts = cursor.fetchall()
+                
+                # 规范化图片路径
+                for artifact in artifacts:
+                    if artifact.get('local_path'):
+                        artifact['local_path'] = normalize_image_path(artifact['local_path'])
+                
+                cursor.close()
+                conn.close()
+            except Error as e:
+                print(f"Error getting guest artifacts: {e}")
+                artifacts = []
+    
+    album = {
+        'album_id': 'guest_default',
+        'name': '默认收藏夹',
+        'is_public': True,
+        'item_count': len(artifacts)
+    }
+    
+    return render_template('album_detail.html', album=album, artifacts=artifacts)
+
+@bp.route('/user/collections')
+def user_collections():
+    """用户图集页面（已登录页面2）"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect(url_for('user.user_center'))
+    
+    user = get_user_by_email(session.get('email'))
+    if not user:
+        session.clear()
+        return redirect(url_for('user.user_center'))
+    
+    albums = get_user_albums(user_id)
+    
+    # 确保有默认收藏夹
+    has_default = any(a['name'] == '默认收藏夹' for a in albums)
+    if not has_default:
+        get_default_album(user_id)
+        albums = get_user_albums(user_id)
+    
+    export_records = get_export_records(user_id)
+    stats = get_user_collection_stats(user_id)  # 添加stats用于模板
+    
+    # 如果没有导出记录，创建虚拟记录
+    if not export_records:
+        export_records = [
+            {
+                'created_at': '2025-12-04 14:30',
+                'description': '商周青铜器研究 - 完整元数据',
+                'format': 'CSV',
+                'status': '已完成',
+                'album_name': '商周青铜器研究'
+            },
+            {
+                'created_at': '2025-12-03 09:15',
+                'description': '默认收藏夹 - 图像包(高才)',
+                'format': 'ZIP',
+                'status': '已完成',
+                'album_name': '默认收藏夹'
+            },
+            {
+                'created_at': '2025-12-03 09:10',
+                'description': '纹样灵感 - 报告',
+                'format': 'PDF',
+                'status': '处理中',
+                'album_name': '纹样灵感'
+            }
+        ]
+    
+    # 如果没有图集，创建默认图集
+    if not albums:
+        albums = [
+            {
+                'album_id': 1,
+                'name': '默认收藏夹',
+                'is_public': True,
+                'item_count': 12
+            },
+            {
+                'album_id': 2,
+                'name': '商周青铜器研究',
+                'is_public': False,
+                'item_count': 58
+            },
+            {
+                'album_id': 3,
+                'name': '纹样灵感',
+                'is_public': False,
+                'item_count': 5
+            }
+        ]
+    
+    return render_template('user_center.html',
+                         is_logged_in=True,
+                         user=user,
+                         albums=albums,
+                         stats=stats,
+                         export_records=export_records,
+                         page_view='collections')
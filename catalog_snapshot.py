@@ -0,0 +1,350 @@
+"""
+只读目录快照（SQLite）
+把 SOURCES、ARTIFACTS、DIMENSIONS、PROPERTIES、IMAGE_VERSIONS 与文化 / 地理统计表导出为带索引与 FTS5 全文索引的
+本地 SQLite 文件。启用快照后端后，公开页面（@read_replica 路由）直接读取本地文件，没有网络往返；
+后台管理与图集写入仍然使用 MySQL。
+
+- 导出先写临时文件，完成后用 os.replace() 原子替换，读者每个请求重新打开文件，不会读到半成品
+- 表名与列名与 MySQL 保持一致，同一条 SQL 两边都能执行（%s 占位符、ANY_VALUE()、RAND() 已做兼容）
+- 全文索引 ARTIFACTS_FTS 使用 trigram 分词，rowid 为 Artifact_PK，search_text 汇总了搜索涉及的全部字段
+- catalog_version 表记录导出时的目录数据版本（见 catalog_version.py），读快照的请求据此判断缓存是否过期
+"""
+
+import os
+import random
+import re
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from mysql.connector import Error
+
+from db_config import TABLES, FIELDS
+import db_pool
+from refresher import BackgroundRefresher
+
+# 导出的表及其主键
+SNAPSHOT_TABLES = {
+    TABLES['sources']: FIELDS['source']['id'],
+    TABLES['artifacts']: FIELDS['artifact']['id'],
+    TABLES['dimensions']: FIELDS['dimension']['id'],
+    TABLES['properties']: FIELDS['property']['id'],
+    TABLES['image_versions']: FIELDS['image']['id'],
+    TABLES['culture_stats']: FIELDS['category_stats']['id'],
+    TABLES['geography_stats']: FIELDS['category_stats']['id'],
+}
+
+# 与 migrations/ 中 MySQL 二级索引对应的索引
+SNAPSHOT_INDEXES = [
+    f"CREATE INDEX idx_prop_culture_artifact ON {TABLES['properties']} (Culture, Artifact_PK)",
+    f"CREATE INDEX idx_prop_geography_artifact ON {TABLES['properties']} (Geography, Artifact_PK)",
+    f"CREATE INDEX idx_prop_artifact_culture_geo ON {TABLES['properties']} (Artifact_PK, Culture, Geography)",
+    f"CREATE INDEX idx_img_artifact_version_path ON {TABLES['image_versions']} (Artifact_PK, Version_PK, Local_Path)",
+    f"CREATE INDEX idx_dim_artifact_order ON {TABLES['dimensions']} (Artifact_PK, Dimension_PK)",
+    f"CREATE INDEX idx_artifact_source_original ON {TABLES['artifacts']} (Source_ID, Original_ID)",
+    f"CREATE INDEX idx_artifact_start_year ON {TABLES['artifacts']} (Start_Year)",
+    f"CREATE INDEX idx_artifact_shuffle ON {TABLES['artifacts']} (Shuffle_Key, Artifact_PK)",
+    f"CREATE INDEX idx_artifact_era ON {TABLES['artifacts']} (Era_System, Era_Bucket, Artifact_PK)",
+    f"CREATE UNIQUE INDEX uk_culture_stats_name ON {TABLES['culture_stats']} (Name)",
+    f"CREATE UNIQUE INDEX uk_culture_stats_slug ON {TABLES['culture_stats']} (Slug)",
+    f"CREATE INDEX idx_culture_stats_count ON {TABLES['culture_stats']} (Artifact_Count DESC, Name)",
+    f"CREATE UNIQUE INDEX uk_geography_stats_name ON {TABLES['geography_stats']} (Name)",
+    f"CREATE UNIQUE INDEX uk_geography_stats_slug ON {TABLES['geography_stats']} (Slug)",
+    f"CREATE INDEX idx_geography_stats_count ON {TABLES['geography_stats']} (Artifact_Count DESC, Name)",
+]
+
+FTS_TABLE = 'ARTIFACTS_FTS'
+
+# 全文索引内容：与 query_builder.build_search_query 的搜索字段一致
+FTS_CONTENT_QUERY = f"""
+    INSERT INTO {FTS_TABLE} (rowid, search_text)
+    SELECT
+        a.Artifact_PK,
+        COALESCE(a.Title_CN, '') || char(10) ||
+        COALESCE(a.Title_EN, '') || char(10) ||
+        COALESCE(a.Date_CN, '') || char(10) ||
+        COALESCE(a.Date_EN, '') || char(10) ||
+        COALESCE(a.Material, '') || char(10) ||
+        COALESCE(a.Description_CN, '') || char(10) ||
+        COALESCE((
+            SELECT group_concat(
+                COALESCE(p.Artist, '') || char(10) ||
+                COALESCE(p.Culture, '') || char(10) ||
+                COALESCE(p.Geography, ''), char(10))
+            FROM {TABLES['properties']} p
+            WHERE p.Artifact_PK = a.Artifact_PK
+        ), '') || char(10) ||
+        COALESCE(s.Museum_Name_CN, '')
+    FROM {TABLES['artifacts']} a
+    LEFT JOIN {TABLES['sources']} s ON a.Source_ID = s.Source_ID
+"""
+
+BATCH_SIZE = 1000
+
+
+class SnapshotError(Error):
+    """读取快照文件失败（作为 mysql.connector.Error 抛出，路由原有的错误处理照常生效）"""
+
+
+def _to_sqlite(value):
+    """把 MySQL 返回的值转换为 SQLite 可存储的类型"""
+    if isinstance(value, Decimal):
+        # 保留原始精度的文本形式，页面显示与 MySQL 一致
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return value
+
+
+def export_snapshot(mysql_conn, path):
+    """
+    从 MySQL 导出目录快照并原子替换 path
+    返回各表导出的行数
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # 先读版本号再复制数据：导出期间发生的变更会让快照数据比版本号新，而不会更旧；
+    # 该变更触发的下一次导出会带上新版本号
+    version = _read_catalog_version(mysql_conn)
+
+    counts = {}
+    lite = sqlite3.connect(tmp_path)
+    try:
+        lite.execute("PRAGMA journal_mode = OFF")
+        lite.execute("PRAGMA synchronous = OFF")
+        for table, pk in SNAPSHOT_TABLES.items():
+            counts[table] = _copy_table(mysql_conn, lite, table, pk)
+        lite.execute("CREATE TABLE catalog_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL)")
+        lite.execute("INSERT INTO catalog_version VALUES (1, ?)", (version,))
+        for statement in SNAPSHOT_INDEXES:
+            lite.execute(statement)
+        lite.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_text, tokenize='trigram')")
+        lite.execute(FTS_CONTENT_QUERY)
+        lite.execute("CREATE TABLE SNAPSHOT_META (Name TEXT PRIMARY KEY, Value TEXT)")
+        lite.execute("INSERT INTO SNAPSHOT_META VALUES ('exported_at', ?)", (datetime.now().isoformat(sep=' '),))
+        lite.commit()
+        lite.execute("ANALYZE")
+    finally:
+        lite.close()
+
+    # 原子替换：已打开旧文件的读者继续读旧文件，新请求打开新文件
+    os.replace(tmp_path, path)
+    return counts
+
+
+def _read_catalog_version(mysql_conn):
+    """主库当前的目录数据版本；版本表尚未创建时记为 0"""
+    cursor = mysql_conn.cursor()
+    try:
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    except Error as e:
+        print(f"Error reading catalog version: {e}")
+        return 0
+    finally:
+        cursor.close()
+
+
+def _copy_table(mysql_conn, lite, table, pk):
+    cursor = mysql_conn.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM {table}")
+        columns = [col[0] for col in cursor.description]
+        column_defs = ', '.join(
+            f'"{col}" INTEGER PRIMARY KEY' if col == pk else f'"{col}"'
+            for col in columns
+        )
+        lite.execute(f'CREATE TABLE {table} ({column_defs})')
+        insert = f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})"
+
+        count = 0
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            lite.executemany(insert, [tuple(_to_sqlite(v) for v in row) for row in rows])
+            count += len(rows)
+        return count
+    finally:
+        cursor.close()
+
+
+# ========== 读取：模拟 mysql.connector 的连接与游标接口 ==========
+
+_PLACEHOLDER = re.compile(r'%(s|%)')
+
+
+def _translate(query):
+    """%s 占位符改为 ?，%% 还原为 %"""
+    return _PLACEHOLDER.sub(lambda m: '?' if m.group(1) == 's' else '%', query)
+
+
+def _concat(*values):
+    """CONCAT()：与 MySQL 相同，任一参数为 NULL 时结果为 NULL"""
+    if any(value is None for value in values):
+        return None
+    return ''.join(map(str, values))
+
+
+class _AnyValue:
+    """ANY_VALUE() 聚合：返回分组中第一个非空值"""
+
+    def __init__(self):
+        self.value = None
+
+    def step(self, value):
+        if self.value is None:
+            self.value = value
+
+    def finalize(self):
+        return self.value
+
+
+class SnapshotCursor:
+    """dictionary=True 时返回 dict 行，否则返回 tuple 行"""
+
+    def __init__(self, raw_cursor, dictionary=False):
+        self._cursor = raw_cursor
+        self._dictionary = dictionary
+        self._columns = None
+
+    def execute(self, query, params=None):
+        try:
+            if params is None:
+                self._cursor.execute(query)
+            else:
+                self._cursor.execute(_translate(query), tuple(params))
+        except sqlite3.Error as e:
+            raise SnapshotError(msg=f"快照查询失败: {e}")
+        description = self._cursor.description
+        self._columns = [col[0] for col in description] if description else None
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self._columns, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SnapshotConnection:
+    """
+    快照文件的只读连接，提供公开路由用到的 mysql.connector 连接接口
+    dialect 供 query_builder 生成 SQLite 专用语句（如全文搜索）
+    """
+
+    dialect = 'sqlite'
+    role = 'snapshot'
+
+    def __init__(self, path):
+        # 只读打开：任何写入都会报错，而不会改动快照
+        self._raw = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._raw.create_function('RAND', 0, random.random)
+        self._raw.create_aggregate('ANY_VALUE', 1, _AnyValue)
+        self._raw.create_function('CONCAT', -1, _concat)
+        self._request_bound = False
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SnapshotCursor(self._raw.cursor(), dictionary=dictionary)
+
+    def execute_prepared(self, name, params=()):
+        cursor = self.cursor(dictionary=True)
+        cursor.execute(db_pool.statement(name), params)
+        return cursor
+
+    def query_prepared(self, name, params=()):
+        return self.execute_prepared(name, params).fetchall()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        """请求内的连接由 teardown 关闭"""
+        if not self._request_bound:
+            self._raw.close()
+
+    def release(self):
+        self._raw.close()
+
+
+class CatalogSnapshot:
+    """
+    快照文件管理：打开只读连接、从 MySQL 重新导出
+    refresh_async() 在后台线程导出（见 refresher.py）；导出进行中再次触发时只会在结束后补导一次
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.last_export = None
+        self._refresher = BackgroundRefresher(self.refresh, 'catalog-snapshot-export')
+
+    def available(self):
+        return os.path.exists(self.path)
+
+    def connect(self):
+        try:
+            return SnapshotConnection(self.path)
+        except sqlite3.Error as e:
+            raise SnapshotError(msg=f"无法打开目录快照: {e}")
+
+    def refresh(self):
+        """从 MySQL 主库导出快照（同步执行）"""
+        conn = db_pool.get_router().connect_primary()
+        started = time.monotonic()
+        try:
+            counts = export_snapshot(conn, self.path)
+        finally:
+            conn.close()
+        self.last_export = {
+            'exported_at': datetime.now().isoformat(sep=' ', timespec='seconds'),
+            'seconds': round(time.monotonic() - started, 2),
+            'rows': counts,
+        }
+        return self.last_export
+
+    def refresh_async(self):
+        """在后台线程中导出快照，不阻塞导入请求"""
+        self._refresher.trigger()
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'available': self.available(),
+            'size_kb': round(os.path.getsize(self.path) / 1024, 1) if self.available() else 0,
+            'refreshing': self._refresher.running,
+            'last_export': self.last_export,
+        }
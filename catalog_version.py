@@ -0,0 +1,26 @@
+"""
+目录数据版本号
+catalog_version 表（migrations/005_create_catalog_version.sql）只有一行，目录数据每次变更都在
+同一事务中把版本号加一；搜索结果缓存等派生数据记下生成时的版本号，版本变化即视为过期。
+
+- 版本号与数据一起提交、一起复制到只读副本，也随目录快照一起导出，因此从哪个库读数据，
+  就从同一个连接读版本号，读到的版本与数据一致
+- 多个 worker 之间不需要额外通知：各自读到新版本后丢弃自己的缓存
+"""
+
+from mysql.connector import Error
+
+
+def current(conn):
+    """读取连接所在库（主库 / 副本 / 目录快照）的数据版本；版本表不存在时返回 None"""
+    try:
+        rows = conn.query_prepared('catalog_version')
+    except Error as e:
+        print(f"Error reading catalog version: {e}")
+        return None
+    return rows[0]['version'] if rows else None
+
+
+def bump(conn):
+    """目录数据变更后把版本号加一，随调用方的事务一起提交"""
+    conn.execute_prepared('catalog_version_bump')
@@ -0,0 +1,90 @@
+"""
+文化 / 地理统计表维护
+CULTURE_STATS / GEOGRAPHY_STATS（migrations/007、008）每行为一个分类：固定编号 Stats_PK、URL 标识 Slug、
+文物数量与代表性图片。浏览页按数量顺序读取，详情页 /culture/<slug>、/geography/<slug> 按 Slug 定位。
+
+- 元数据导入新增文物时，在同一事务中把其文化、地理区域的数量加一；新出现的分类插入新行并分配 Slug，
+  没有代表性图片的分类以新文物的图片补上
+- rebuild() 从 PROPERTIES 全量重建数量与代表性图片，已有分类保留原有编号与 Slug
+- Slug 一经分配不再改变（分类数量变化、重建都不影响），页面地址因此可以长期缓存与收藏
+"""
+
+import re
+
+from db_config import FIELDS
+from query_builder import CATEGORY_STATS_TABLES, build_category_stats_rebuild_query
+
+# 空白与标点连写为一个分隔符（与 migrations/008_add_category_slugs.sql 的规则一致）
+_SLUG_SEPARATORS = re.compile(r'[\W_]+')
+
+SLUG_MAX_LENGTH = 120
+
+# 重名后缀 "-Stats_PK" 的最大长度（Stats_PK 为 INT）
+SLUG_SUFFIX_LENGTH = len(f"-{2 ** 31 - 1}")
+
+
+def slugify(category, name):
+    """分类名称 -> Slug 基础形式；结果为空或全为数字时加上分类前缀，避免与旧的数字地址混淆"""
+    slug = _SLUG_SEPARATORS.sub('-', str(name)).strip('-').lower()
+    if not slug:
+        slug = category
+    elif slug.isdigit():
+        slug = f"{category}-{slug}"
+    # 留出重名后缀的长度
+    return slug[:SLUG_MAX_LENGTH - SLUG_SUFFIX_LENGTH].rstrip('-')
+
+
+def unique_slug(conn, category, name, stats_id):
+    """与其他分类重名时在末尾加上 "-Stats_PK"（与 migrations/008 相同）"""
+    slug = slugify(category, name)
+    while conn.query_prepared(f'{category}_stats_by_slug', (slug,)):
+        slug = f"{slug}-{stats_id}"
+    return slug
+
+
+def record_artifact(conn, values, image_path=None):
+    """
+    新增文物后把其文化、地理区域的数量加一（随导入事务一起提交）；values 为导入行的列名 -> 值
+    计数与插入是同一条 INSERT ... ON DUPLICATE KEY UPDATE，并发导入同一新分类时不会因唯一键冲突失败；
+    image_path 为该文物的图片路径，分类还没有代表性图片时以它补上
+    """
+    for category in CATEGORY_STATS_TABLES:
+        name = values.get(FIELDS['property'][category])
+        if not name:
+            continue
+        cursor = conn.execute_prepared(f'{category}_stats_record', (name, image_path))
+        # 受影响行数为 1 表示插入了新分类（已有分类计为 2）
+        if cursor.rowcount == 1:
+            conn.execute_prepared(f'{category}_stats_set_slug', (unique_slug(conn, category, name, cursor.lastrowid), cursor.lastrowid))
+
+
+def assign_missing_slugs(conn, category):
+    """为尚未分配 Slug 的分类（重建时新出现的分类）分配 Slug，返回分配的数量"""
+    stats = FIELDS['category_stats']
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {stats['id']}, {stats['name']} FROM {CATEGORY_STATS_TABLES[category]} "
+                   f"WHERE {stats['slug']} IS NULL ORDER BY {stats['id']}")
+    missing = cursor.fetchall()
+    cursor.close()
+    for stats_id, name in missing:
+        conn.execute_prepared(f'{category}_stats_set_slug', (unique_slug(conn, category, name, stats_id), stats_id))
+    return len(missing)
+
+
+def rebuild(conn):
+    """
+    从 PROPERTIES 全量重建两张统计表（调用方负责提交）
+    先把数量清零再按名称覆盖，重建后仍为 0 的分类不再显示，但保留编号与 Slug；
+    返回 {统计表: (有文物的分类数, 新分配的 Slug 数)}
+    """
+    stats = FIELDS['category_stats']
+    result = {}
+    cursor = conn.cursor()
+    for category, table in CATEGORY_STATS_TABLES.items():
+        cursor.execute(f"UPDATE {table} SET {stats['artifact_count']} = 0")
+        cursor.execute(build_category_stats_rebuild_query(category))
+        assigned = assign_missing_slugs(conn, category)
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {stats['artifact_count']} > 0")
+        result[table] = (cursor.fetchone()[0], assigned)
+    cursor.close()
+    return result
@@ -0,0 +1,218 @@
+"""
+查询计划检查工具
+收集 app.py、blueprints/ 与 query_builder.py 中的全部 SQL 语句，在已导入数据的数据库上逐条执行 EXPLAIN，
+发现大表的全表扫描（type=ALL）或 filesort 时以非零状态退出。
+
+用法（在项目根目录执行，数据库连接读取与 app.py 相同的 DB_* 环境变量）：
+    python database/explain_check.py
+    python database/explain_check.py --min-rows 500 --allow homepage --allow random_browse
+
+--min-rows  EXPLAIN 估算扫描行数达到该值才视为"大表"，默认 1000
+--allow     允许存在全表扫描 / filesort 的函数名（可重复），只报告不判定失败
+"""
+
+import argparse
+import ast
+import inspect
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import query_builder  # noqa: E402
+
+SOURCE_FILES = ['app.py', 'query_builder.py', 'blueprints/public.py', 'blueprints/user.py', 'blueprints/admin.py']
+STATEMENT_REGISTRIES = ['PREPARED_STATEMENTS', 'HOMEPAGE_IMAGE_QUERIES']
+
+# EXPLAIN 只支持这些语句；INSERT ... VALUES、DDL 等直接跳过
+EXPLAINABLE = re.compile(r'^\s*(SELECT|UPDATE|DELETE)\b', re.IGNORECASE)
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'database': os.getenv('DB_NAME', 'project')
+}
+
+
+# ========== 收集 SQL 语句 ==========
+
+def _render_str(node):
+    """把字符串常量或 f-string 还原为 SQL 文本，f-string 中的插值替换为 %s"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            else:
+                parts.append('%s')
+        return ''.join(parts)
+    return None
+
+
+def _call_builder(name):
+    """调用 query_builder 中的构建函数，必需参数使用示例值，可选参数保持默认（MySQL 方言）"""
+    func = getattr(query_builder, name, None)
+    if func is None:
+        return None
+    required = [p for p in inspect.signature(func).parameters.values() if p.default is inspect.Parameter.empty]
+    args = ['测试'] * len(required)
+    return func(*args)
+
+
+def _resolve_sql(node, assignments):
+    """解析 cursor.execute() 的第一个参数"""
+    sql = _render_str(node)
+    if sql is not None:
+        return sql
+
+    if isinstance(node, ast.Name) and node.id in assignments:
+        pieces = []
+        for value in assignments[node.id]:
+            if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+                piece = _call_builder(value.func.id)
+            else:
+                piece = _render_str(value)
+            if piece is None:
+                return None
+            pieces.append(piece)
+        return ''.join(pieces)
+    return None
+
+
+def _collect_from_function(func, filename):
+    # 变量名 -> [初始赋值, 追加片段...]，覆盖 query += " AND ..." 这类拼接
+    assignments = {}
+    statements = []
+    for node in ast.walk(func):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            assignments[node.targets[0].id] = [node.value]
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name) \
+                and isinstance(node.op, ast.Add) and node.target.id in assignments:
+            assignments[node.target.id].append(node.value)
+
+    for node in ast.walk(func):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                and node.func.attr == 'execute' and node.args:
+            sql = _resolve_sql(node.args[0], assignments)
+            if sql and EXPLAINABLE.match(sql):
+                statements.append({
+                    'location': f"{filename}:{node.lineno}",
+                    'function': func.name,
+                    'sql': sql.strip()
+                })
+    return statements
+
+
+def collect_statements():
+    statements = []
+    for filename in SOURCE_FILES:
+        with open(os.path.join(PROJECT_ROOT, filename), encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef):
+                statements.extend(_collect_from_function(node, filename))
+
+    # query_builder 中的语句注册表（详情页、图集、导入路径、首页背景图）
+    for registry in STATEMENT_REGISTRIES:
+        for name, sql in getattr(query_builder, registry).items():
+            if EXPLAINABLE.match(sql):
+                statements.append({
+                    'location': f"query_builder.py:{registry}['{name}']",
+                    'function': name,
+                    'sql': sql.strip()
+                })
+
+    # query_builder 中的构建函数本身不执行 SQL，直接调用生成语句
+    for name, func in inspect.getmembers(query_builder, inspect.isfunction):
+        if name.startswith('build_') and func.__module__ == query_builder.__name__:
+            sql = _call_builder(name)
+            if isinstance(sql, str) and EXPLAINABLE.match(sql):
+                statements.append({
+                    'location': f"query_builder.py:{name}()",
+                    'function': name,
+                    'sql': sql.strip()
+                })
+    return statements
+
+
+# ========== 执行 EXPLAIN ==========
+
+def sample_params(sql):
+    """按占位符前面的上下文生成示例参数"""
+    params = []
+    for match in re.finditer(r'%s', sql):
+        before = sql[max(0, match.start() - 40):match.start()].upper()
+        if re.search(r'(LIMIT|OFFSET)\s*$', before):
+            params.append(10)
+        elif re.search(r'LIKE\s*$', before):
+            params.append('%测试%')
+        elif re.search(r'(_PK|(?<!ORIGINAL)_ID)\s*(=|<|>|<=|>=)\s*$', before) or before.rstrip().endswith('IN ('):
+            params.append(1)
+        else:
+            params.append('测试')
+    return tuple(params)
+
+
+def explain(cursor, statement, min_rows):
+    """返回该语句中需要关注的执行计划行"""
+    cursor.execute("EXPLAIN " + statement['sql'], sample_params(statement['sql']))
+    problems = []
+    for row in cursor.fetchall():
+        rows = int(row.get('rows') or 0)
+        extra = row.get('Extra') or ''
+        if rows < min_rows:
+            continue
+        if row.get('type') == 'ALL':
+            problems.append(f"全表扫描 table={row.get('table')} rows≈{rows}")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort table={row.get('table')} rows≈{rows} ({extra})")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='对 app.py / blueprints / query_builder.py 中的 SQL 执行 EXPLAIN 检查')
+    parser.add_argument('--min-rows', type=int, default=1000)
+    parser.add_argument('--allow', action='append', default=[], metavar='FUNCTION')
+    args = parser.parse_args(argv)
+
+    statements = collect_statements()
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor(dictionary=True)
+
+    failures = 0
+    for statement in statements:
+        try:
+            problems = explain(cursor, statement, args.min_rows)
+        except Error as e:
+            print(f"[ERROR] {statement['location']} ({statement['function']}): {e}")
+            failures += 1
+            continue
+
+        if not problems:
+            print(f"[OK]    {statement['location']} ({statement['function']})")
+            continue
+
+        allowed = statement['function'] in args.allow
+        print(f"[{'ALLOW' if allowed else 'FAIL'}]  {statement['location']} ({statement['function']})")
+        for problem in problems:
+            print(f"        - {problem}")
+        if not allowed:
+            failures += 1
+
+    cursor.close()
+    conn.close()
+
+    print(f"\n共检查 {len(statements)} 条语句，{failures} 条未通过")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,14 @@
 import pandas as pd
 import mysql.connector
 from mysql.connector import Error
+import os
 import re
+import sys
+
+# 年代分段、随机浏览键范围等规则与应用共用项目根目录下的模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from era_buckets import normalize_era_from_date_cn
+from query_builder import SHUFFLE_KEY_RANGE
 
 # ================= 配置区域 =================
 DB_CONFIG = {
@@ -81,10 +88,12 @@ def import_data():
             for index, row in df.iterrows():
                 try:
                     # --- A. 插入 ARTIFACTS 表 ---
-                    insert_artifact_sql = """
+                    # Shuffle_Key 与后台导入相同，随机生成（随机浏览按它排列）
+                    insert_artifact_sql = f"""
                     INSERT INTO ARTIFACTS 
-                    (Source_ID, Original_ID, Title_CN, Material, Date_CN, Classification, Description_CN) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    (Source_ID, Original_ID, Title_CN, Material, Date_CN, Classification, Description_CN,
+                     Era_System, Era_Bucket, Shuffle_Key) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, FLOOR(RAND() * {SHUFFLE_KEY_RANGE}))
                     """
                     
                     # 映射 Excel 列名到数据库字段
@@ -97,7 +106,8 @@ def import_data():
                         clean_val(row['材质（Medium）']),
                         clean_val(row['时代（Date）']),
                         clean_val(row['所属部门（Curatorial Department）']),
-                        clean_val(row['尺寸（Dimensions）']) # 将原始尺寸文本存入描述，防止正则解析失败导致信息丢失
+                        clean_val(row['尺寸（Dimensions）']), # 将原始尺寸文本存入描述，防止正则解析失败导致信息丢失
+                        *normalize_era_from_date_cn(clean_val(row['时代（Date）']))
                     )
                     
                     cursor.execute(insert_artifact_sql, artifact_vals)
@@ -0,0 +1,235 @@
+"""
+数据库迁移工具
+按编号顺序执行 migrations/ 目录下的 NNN_描述.sql 脚本（需要复用项目中 Python 规则的数据迁移为 NNN_描述.py），已执行的版本记录在 schema_version 表中，
+每个版本只执行一次。部署时（启动应用之前）运行；请求处理代码不执行任何 DDL。
+
+用法（在项目根目录执行，数据库连接读取与 app.py 相同的 DB_* 环境变量）：
+    python database/migrate.py             # 执行全部待执行的迁移
+    python database/migrate.py --status    # 只列出各版本的执行状态
+    python database/migrate.py --to 2      # 只迁移到指定版本
+
+- 脚本按 ; 结尾的行切分语句，支持 DELIMITER 切换分隔符（触发器、存储过程）
+- MySQL 的 DDL 会隐式提交，无法整体回滚：某条语句失败时停止迁移，该版本不记录，修复后重新运行
+- 表、字段或索引已存在（此前手工执行过）时跳过该语句并继续，便于已有数据库接入
+- 已执行的脚本被修改时给出警告（按内容校验和比对），不会重新执行
+- Python 迁移定义 migrate(conn)，可导入项目根目录下的模块；执行完成后与该版本的记录一起提交
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error, errorcode
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(PROJECT_ROOT, 'migrations')
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+# Python 迁移导入项目模块（如 era_buckets）
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# 对象已存在：视为该语句此前已手工执行
+ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_DUP_KEYNAME,
+}
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'database': os.getenv('DB_NAME', 'project')
+}
+
+CREATE_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class MigrationError(Exception):
+    """迁移脚本执行失败"""
+
+
+# ========== 读取迁移脚本 ==========
+
+def discover(directory=MIGRATIONS_DIR):
+    """返回按版本号排序的迁移列表：[{'version', 'name', 'path', 'checksum'}]"""
+    migrations = []
+    seen = {}
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in seen:
+            raise MigrationError(f"迁移版本号重复: {seen[version]} 与 {filename}")
+        seen[version] = filename
+        path = os.path.join(directory, filename)
+        with open(path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append({
+            'version': version,
+            'name': match.group(2),
+            'path': path,
+            'checksum': checksum,
+        })
+    return sorted(migrations, key=lambda m: m['version'])
+
+
+def split_statements(sql):
+    """把脚本切分为单条语句；去掉整行注释与 USE 语句（数据库由连接配置决定）"""
+    statements = []
+    delimiter = ';'
+    buffer = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not buffer and (not stripped or stripped.startswith('--')):
+            continue
+        if stripped.upper().startswith('DELIMITER '):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = '\n'.join(buffer).strip()[:-len(delimiter)].strip()
+            buffer = []
+            if statement and not re.match(r'^USE\s', statement, re.IGNORECASE):
+                statements.append(statement)
+    if ''.join(buffer).strip():
+        statements.append('\n'.join(buffer).strip())
+    return statements
+
+
+# ========== 执行迁移 ==========
+
+def applied_versions(conn):
+    """已执行的版本：{version: checksum}"""
+    cursor = conn.cursor()
+    cursor.execute(CREATE_VERSION_TABLE)
+    cursor.execute("SELECT version, checksum FROM schema_version")
+    applied = dict(cursor.fetchall())
+    cursor.close()
+    return applied
+
+
+def apply_python_migration(conn, migration):
+    spec = importlib.util.spec_from_file_location(f"migration_{migration['version']:03d}", migration['path'])
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+        module.migrate(conn)
+    except Error as e:
+        conn.rollback()
+        raise MigrationError(f"{os.path.basename(migration['path'])} 执行失败: {e}")
+    _record_version(conn, migration)
+
+
+def _record_version(conn, migration):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+            (migration['version'], migration['name'], migration['checksum'])
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def apply_migration(conn, migration):
+    if migration['path'].endswith('.py'):
+        return apply_python_migration(conn, migration)
+    with open(migration['path'], encoding='utf-8') as f:
+        statements = split_statements(f.read())
+
+    cursor = conn.cursor()
+    try:
+        for statement in statements:
+            try:
+                cursor.execute(statement)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            except Error as e:
+                if e.errno in ALREADY_APPLIED_ERRORS:
+                    print(f"        - 跳过（已存在）: {e.msg}")
+                    continue
+                conn.rollback()
+                first_line = statement.splitlines()[0]
+                raise MigrationError(f"{os.path.basename(migration['path'])} 执行失败: {e}\n        语句: {first_line} ...")
+    finally:
+        cursor.close()
+    _record_version(conn, migration)
+
+
+def migrate(conn, target=None, migrations=None):
+    """执行待执行的迁移，返回本次执行的版本列表"""
+    migrations = discover() if migrations is None else migrations
+    applied = applied_versions(conn)
+
+    for migration in migrations:
+        checksum = applied.get(migration['version'])
+        if checksum is not None and checksum != migration['checksum']:
+            print(f"[WARN]  {migration['version']:03d}_{migration['name']} 执行后已被修改，不会重新执行")
+
+    done = []
+    for migration in migrations:
+        if migration['version'] in applied:
+            continue
+        if target is not None and migration['version'] > target:
+            break
+        print(f"[APPLY] {migration['version']:03d}_{migration['name']}")
+        apply_migration(conn, migration)
+        done.append(migration['version'])
+    return done
+
+
+def print_status(conn, migrations):
+    applied = applied_versions(conn)
+    for migration in migrations:
+        state = '已执行' if migration['version'] in applied else '待执行'
+        print(f"[{state}] {migration['version']:03d}_{migration['name']}")
+    pending = sum(1 for m in migrations if m['version'] not in applied)
+    print(f"\n共 {len(migrations)} 个迁移，{pending} 个待执行")
+    return pending
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按顺序执行 migrations/ 中的数据库迁移')
+    parser.add_argument('--status', action='store_true', help='只列出执行状态，不执行迁移')
+    parser.add_argument('--to', type=int, metavar='VERSION', help='只迁移到该版本（含）')
+    args = parser.parse_args(argv)
+
+    try:
+        migrations = discover()
+        conn = mysql.connector.connect(**DB_CONFIG)
+    except (MigrationError, Error) as e:
+        print(f"Error: {e}")
+        return 1
+
+    try:
+        if args.status:
+            print_status(conn, migrations)
+            return 0
+        done = migrate(conn, args.to, migrations)
+        print(f"\n本次执行 {len(done)} 个迁移" if done else "数据库结构已是最新")
+        return 0
+    except (MigrationError, Error) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
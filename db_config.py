@@ -11,7 +11,10 @@ TABLES = {
     'dimensions': 'DIMENSIONS',
     'properties': 'PROPERTIES',
     'image_versions': 'IMAGE_VERSIONS',
-    'logs': 'LOGS'
+    'logs': 'LOGS',
+    # 文化 / 地理统计表（migrations/007_create_category_stats.sql）
+    'culture_stats': 'CULTURE_STATS',
+    'geography_stats': 'GEOGRAPHY_STATS'
 }
 
 # 字段名配置（新结构）
@@ -35,7 +38,9 @@ FIELDS = {
         'date_cn': 'Date_CN',
         'date_en': 'Date_EN',
         'start_year': 'Start_Year',
-        'end_year': 'End_Year'
+        'end_year': 'End_Year',
+        'era_system': 'Era_System',
+        'era_bucket': 'Era_Bucket'
     },
     # DIMENSIONS 表字段
     'dimension': {
@@ -67,6 +72,15 @@ FIELDS = {
         'processed_resolution': 'Processed_Resolution',
         'compression_ratio': 'Compression_Ratio',
         'last_processed_time': 'Last_Processed_Time'
+    },
+    # CULTURE_STATS / GEOGRAPHY_STATS 表字段（两表结构相同）
+    'category_stats': {
+        'id': 'Stats_PK',
+        'name': 'Name',
+        'slug': 'Slug',
+        'artifact_count': 'Artifact_Count',
+        'representative_image': 'Representative_Image',
+        'last_updated': 'Last_Updated'
     }
 }
 
@@ -116,6 +130,7 @@ QUERIES = {
     'detail': {
         'select': [
             f"a.{FIELDS['artifact']['id']} AS artifact_id",
+            f"a.{FIELDS['artifact']['source_id']} AS source_id",
             f"a.{FIELDS['artifact']['title_cn']} AS title",
             f"a.{FIELDS['artifact']['title_en']} AS title_en",
             f"a.{FIELDS['artifact']['description_cn']} AS description",
@@ -156,6 +171,20 @@ QUERIES = {
         ],
         'from': TABLES['dimensions'],
         'alias': 'd',
-        'where': f"d.{FIELDS['dimension']['artifact_id']} = %s"
+        'where': f"d.{FIELDS['dimension']['artifact_id']} = %s",
+        'order_by': f"d.{FIELDS['dimension']['id']}"
     }
 }
+
+# 进程内搜索索引（search_index.py）各字段的 BM25F 权重：词元出现在权重高的字段中时得分更高；
+# 修改后重启即生效，不需要重建索引；权重为 0 的字段仍参与匹配，但不计入得分
+SEARCH_FIELD_WEIGHTS = {
+    'title': 5.0,        # 中英文标题
+    'culture': 3.0,
+    'artist': 3.0,
+    'material': 2.0,
+    'date': 2.0,         # 中英文年代
+    'geography': 1.5,
+    'description': 1.0,
+    'museum': 0.5,       # 博物馆名称（同一博物馆的全部文物都包含）
+}
@@ -0,0 +1,639 @@
+"""
+数据库连接池
+为 app.py 提供可配置的 MySQL 连接池，以及按请求复用连接的 get_db_connection()
+
+- 每个请求最多从池中取出一个连接，保存在 flask.g 上，请求结束时由 teardown 归还
+- 连接池参数：常驻连接数、溢出连接数、连接回收时间、取用前 ping 检测
+- stats() 返回连接池使用统计，用于按 worker 数调整池大小
+- 读写分离：标记为只读的路由从只读副本读取，写操作及同一会话写入后的读取固定走主库
+- 预处理语句：注册表中的热点语句在每个连接上只 PREPARE 一次，之后以二进制协议复用
+- 熔断：连接或读取连续失败后熔断，熔断期间立即失败而不阻塞 worker，冷却后放行单个探测连接
+- 目录快照：启用后只读路由改为读取本地 SQLite 快照（见 catalog_snapshot.py）
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+import mysql.connector
+from mysql.connector import Error
+from flask import g, has_request_context, session
+
+
+class PoolTimeoutError(Error):
+    """在等待时间内无法从连接池取得连接"""
+
+
+class CircuitOpenError(Error):
+    """数据库熔断中，未尝试连接直接失败"""
+
+
+class CircuitBreaker:
+    """
+    数据库熔断器
+
+    closed:    正常状态，连续失败达到 failure_threshold 次后进入 open
+    open:      所有请求立即失败；经过 reset_timeout 秒后进入 half_open
+    half_open: 只放行一个探测请求，成功则恢复 closed，失败则重新 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._counters = {'opened': 0, 'rejected': 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """是否允许本次访问数据库；half_open 状态下同一时间只放行一个探测"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release_probe(self):
+        """本次访问未到达数据库（如连接池等待超时）：不计成功或失败，half_open 状态下放行下一个探测"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._counters['opened'] += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self):
+        data = {'state': self.state}
+        with self._lock:
+            data['consecutive_failures'] = self._failures
+            data.update(self._counters)
+        return data
+
+
+# 预处理语句注册表：语句名 -> SQL
+# 预处理游标按字符串对象判断是否需要重新 PREPARE，因此必须始终传入注册表中的同一个对象
+_statements = {}
+
+
+def register_statements(statements):
+    """注册可预处理的语句（通常为 query_builder.PREPARED_STATEMENTS）"""
+    _statements.update(statements)
+
+
+def statement(name):
+    """按语句名取注册表中的 SQL"""
+    return _statements[name]
+
+
+class PooledConnection:
+    """
+    连接池中的连接包装
+    除 close() 外的属性与方法都直接转发给底层的 mysql.connector 连接。
+    close() 不会真正断开连接，而是把连接归还给连接池；
+    绑定在请求上的连接则由 teardown 统一归还，close() 不做任何事。
+    """
+
+    # 供 query_builder 按数据库方言生成语句
+    dialect = 'mysql'
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._raw = raw_conn
+        self.role = pool.role
+        self._created_at = time.monotonic()
+        self._request_bound = False
+        self._checked_out = False
+        # 语句名 -> 该连接上已预处理的游标，随连接一起销毁
+        self._prepared = {}
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def age(self):
+        return time.monotonic() - self._created_at
+
+    def execute_prepared(self, name, params=()):
+        """
+        执行注册表中的语句并返回游标（INSERT 可读取 lastrowid / rowcount）
+        首次使用时在该连接上 PREPARE，之后只发送参数，结果按二进制协议返回
+        """
+        cursor = self._prepared.get(name)
+        if cursor is None:
+            cursor = self._raw.cursor(prepared=True, dictionary=True)
+            self._prepared[name] = cursor
+        try:
+            cursor.execute(_statements[name], params)
+        except Error:
+            # 出错后语句状态不确定，下次重新 PREPARE
+            self._prepared.pop(name, None)
+            try:
+                cursor.close()
+            except Error:
+                pass
+            raise
+        return cursor
+
+    def query_prepared(self, name, params=()):
+        """执行注册表中的查询语句并返回全部结果行（dict）"""
+        return self.execute_prepared(name, params).fetchall()
+
+    def commit(self):
+        """提交事务；主库上的提交会让当前会话之后的读取固定走主库"""
+        self._raw.commit()
+        if self.role == 'primary' and has_request_context():
+            g._db_wrote = True
+            session['_db_last_write'] = time.time()
+
+    def close(self):
+        """归还连接（请求内的连接由 teardown 归还）"""
+        if self._request_bound:
+            return
+        self._pool.release(self)
+
+
+class ConnectionPool:
+    """
+    线程安全的 MySQL 连接池
+
+    pool_size:     常驻连接数，归还后保持空闲以便复用
+    max_overflow:  繁忙时允许额外创建的连接数，归还时若空闲连接已满则直接关闭
+    recycle:       连接存活超过该秒数后在取用时重建（<= 0 表示不回收）
+    pre_ping:      取用前先 ping 一次，失效的连接会被丢弃并重建
+    timeout:       连接全部被占用时最长等待秒数
+    connect_timeout: 建立连接的超时秒数
+    read_timeout:  单条查询的超时秒数（服务端 MAX_EXECUTION_TIME 与套接字读超时，<= 0 表示不限制）
+    breaker_threshold / breaker_reset:
+                   连续失败多少次后熔断、熔断多少秒后放行探测连接；熔断期间 connect() 直接抛出 CircuitOpenError
+    """
+
+    def __init__(self, db_config, pool_size=5, max_overflow=10, recycle=3600,
+                 pre_ping=True, timeout=30, role='primary', connect_timeout=5,
+                 read_timeout=10, breaker_threshold=5, breaker_reset=30):
+        self._db_config = dict(db_config)
+        self.role = role
+        # 请求之间共用连接时，自动丢弃未读完的结果集，避免 "Unread result found"
+        self._db_config.setdefault('consume_results', True)
+        self._db_config.setdefault('connection_timeout', connect_timeout)
+        self.read_timeout = read_timeout
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._total = 0          # 当前已创建且未关闭的连接数
+        self._checked_out = 0    # 当前被占用的连接数
+        self._counters = {
+            'connects': 0,
+            'checkouts': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'discarded': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'peak_checked_out': 0,
+        }
+
+    # ---------- 取用与归还 ----------
+
+    def connect(self):
+        """从池中取一个可用连接；熔断期间不尝试连接，直接抛出 CircuitOpenError"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(msg=f"数据库 {self._db_config.get('host')} 熔断中，暂停访问")
+        try:
+            conn = self._checkout()
+        except PoolTimeoutError:
+            # 本地连接池耗尽不代表数据库故障，不计入熔断
+            self.breaker.release_probe()
+            raise
+        except Error:
+            self.breaker.record_failure()
+            raise
+        try:
+            conn = self._validate(conn)
+        except Exception:
+            self.breaker.record_failure()
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        self.breaker.record_success()
+        return conn
+
+    def _checkout(self):
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._total < self.pool_size + self.max_overflow:
+                    # 先占位，真正建立连接放到锁外
+                    self._total += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        msg=f"连接池已满（{self._total} 个连接），等待 {self.timeout} 秒后超时"
+                    )
+                self._counters['waits'] += 1
+                self._cond.wait(remaining)
+
+            self._checked_out += 1
+            self._counters['checkouts'] += 1
+            if self._checked_out > self._counters['peak_checked_out']:
+                self._counters['peak_checked_out'] = self._checked_out
+
+        if conn is None:
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._checked_out -= 1
+                    self._cond.notify()
+                raise
+        conn._checked_out = True
+        return conn
+
+    def _new_connection(self):
+        raw = mysql.connector.connect(**self._db_config)
+        if self.read_timeout and self.read_timeout > 0:
+            self._apply_read_timeout(raw)
+        with self._cond:
+            self._counters['connects'] += 1
+        return PooledConnection(self, raw)
+
+    def _apply_read_timeout(self, raw):
+        """限制单条查询时长，数据库变慢时请求尽快失败而不是一直占用 worker"""
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int(self.read_timeout * 1000),))
+            cursor.close()
+        except Error as e:
+            # 不支持 MAX_EXECUTION_TIME 的服务端（如 MariaDB）只保留套接字超时
+            print(f"Error setting MAX_EXECUTION_TIME: {e}")
+        # 纯 Python 驱动在连接建立后会清除套接字超时，这里重新设置为读超时
+        sock = getattr(raw, '_socket', None)
+        if sock is not None and hasattr(sock, 'set_connection_timeout'):
+            sock.set_connection_timeout(self.read_timeout)
+
+    def _validate(self, conn):
+        """按回收时间与 ping 检测决定是否需要重建连接"""
+        if self.recycle > 0 and conn.age > self.recycle:
+            self._close_raw(conn)
+            with self._cond:
+                self._counters['recycled'] += 1
+            return self._replace(conn)
+
+        if self.pre_ping:
+            try:
+                conn._raw.ping(reconnect=False)
+            except Error:
+                self._close_raw(conn)
+                with self._cond:
+                    self._counters['ping_failures'] += 1
+                return self._replace(conn)
+        return conn
+
+    def _replace(self, old_conn):
+        """用新连接替换失效的连接（占用名额不变）"""
+        try:
+            new_conn = self._new_connection()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+            raise
+        new_conn._checked_out = True
+        old_conn._checked_out = False
+        return new_conn
+
+    def release(self, conn):
+        """归还连接；未提交的事务会被回滚，回滚失败的连接直接丢弃"""
+        if not conn._checked_out:
+            return
+        conn._checked_out = False
+        conn._request_bound = False
+
+        healthy = True
+        try:
+            # 结束可能残留的事务，避免下一个请求读到旧快照
+            conn._raw.rollback()
+        except Error:
+            # 连接在使用中断开或读超时，计入熔断失败次数
+            healthy = False
+            self.breaker.record_failure()
+
+        with self._cond:
+            self._checked_out -= 1
+            if healthy and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                conn = None
+            else:
+                self._total -= 1
+                self._counters['discarded'] += 1
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_raw(conn)
+
+    @staticmethod
+    def _close_raw(conn):
+        try:
+            conn._raw.close()
+        except Error:
+            pass
+
+    def dispose(self):
+        """关闭所有空闲连接（例如 fork 出 worker 之后）"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for conn in idle:
+            self._close_raw(conn)
+
+    # ---------- 统计 ----------
+
+    def stats(self):
+        """连接池使用统计"""
+        with self._cond:
+            data = {
+                'role': self.role,
+                'host': self._db_config.get('host'),
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'recycle': self.recycle,
+                'pre_ping': self.pre_ping,
+                'total': self._total,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'overflow_in_use': max(0, self._total - self.pool_size),
+            }
+            data.update(self._counters)
+        data['breaker'] = self.breaker.stats()
+        return data
+
+
+class DatabaseRouter:
+    """
+    读写分离路由
+    写操作与普通路由使用主库；只读路由在副本延迟不超过 max_replica_lag 秒时
+    轮询使用副本，否则回退到主库。会话在主库提交写入后的 sticky_seconds 秒内
+    所有读取固定走主库，保证能读到自己刚写入的数据。
+    """
+
+    def __init__(self, primary, replicas=(), max_replica_lag=5,
+                 sticky_seconds=60, lag_check_interval=5):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_replica_lag = max_replica_lag
+        self.sticky_seconds = sticky_seconds
+        self.lag_check_interval = lag_check_interval
+        self._rr = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+        # 每个副本最近一次检测到的延迟（None 表示复制中断或无法连接）
+        self._lag = [0] * len(self.replicas)
+        self._lag_checked_at = [0.0] * len(self.replicas)
+
+    def connect_primary(self):
+        return self.primary.connect()
+
+    def connect_replica(self):
+        """取一个健康副本的连接，没有可用副本时返回主库连接"""
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                idx = next(self._rr)
+            if not self._replica_healthy(idx):
+                continue
+            try:
+                return self.replicas[idx].connect()
+            except CircuitOpenError:
+                continue
+            except Error as e:
+                print(f"Error connecting to replica {idx}: {e}")
+                with self._lock:
+                    self._lag[idx] = None
+                    self._lag_checked_at[idx] = time.monotonic()
+        return self.primary.connect()
+
+    def _replica_healthy(self, idx):
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._lag_checked_at[idx] >= self.lag_check_interval
+            if due:
+                # 先更新时间戳，避免并发请求同时检测同一个副本
+                self._lag_checked_at[idx] = now
+        if due:
+            lag = self._check_lag(self.replicas[idx])
+            with self._lock:
+                self._lag[idx] = lag
+        lag = self._lag[idx]
+        return lag is not None and lag <= self.max_replica_lag
+
+    @staticmethod
+    def _check_lag(pool):
+        """查询副本复制延迟（秒）；未配置复制的只读实例视为无延迟"""
+        try:
+            conn = pool.connect()
+        except Error:
+            return None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Error:
+                # MySQL 8.0.22 之前的版本
+                cursor.execute("SHOW SLAVE STATUS")
+            row = cursor.fetchone()
+            cursor.close()
+        except Error as e:
+            print(f"Error checking replica lag: {e}")
+            return None
+        finally:
+            pool.release(conn)
+
+        if not row:
+            return 0
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return None if lag is None else int(lag)
+
+    def stats(self):
+        return {
+            'primary': self.primary.stats(),
+            'replicas': [
+                dict(pool.stats(), lag=self._lag[idx])
+                for idx, pool in enumerate(self.replicas)
+            ],
+            'max_replica_lag': self.max_replica_lag,
+            'sticky_seconds': self.sticky_seconds,
+        }
+
+
+# ========== Flask 集成：每个请求一个连接 ==========
+
+_router = None
+_snapshot = None
+
+
+def init_app(app, router):
+    """注册数据库路由，并在请求结束时归还该请求占用的连接"""
+    global _router
+    _router = router
+    app.extensions['db_router'] = router
+    app.teardown_request(_release_request_connection)
+
+
+def get_router():
+    return _router
+
+
+def use_snapshot(snapshot):
+    """只读路由改为读取目录快照（catalog_snapshot.CatalogSnapshot），传入 None 恢复读取 MySQL"""
+    global _snapshot
+    _snapshot = snapshot
+
+
+def get_snapshot():
+    return _snapshot
+
+
+def read_replica(f):
+    """只读路由装饰器：该路由内的查询优先发往只读副本"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g._db_read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _reads_own_writes():
+    """本请求已写入，或会话在 sticky_seconds 秒内提交过写入：读取必须走主库，才能看到刚写入的数据"""
+    if g.get('_db_wrote'):
+        return True
+    last_write = session.get('_db_last_write')
+    return bool(last_write and time.time() - last_write < _router.sticky_seconds)
+
+
+def _should_use_replica():
+    return bool(_router.replicas) and g.get('_db_read_only') and not _reads_own_writes()
+
+
+def get_db_connection():
+    """
+    获取数据库连接
+    请求内多次调用返回同一个连接，调用方的 conn.close() 不会提前归还；
+    请求之外（如脚本调用）返回的连接在 close() 时归还连接池。
+    只读路由优先返回目录快照连接（已启用且快照文件存在时），其次是副本连接，其余情况返回主库连接；
+    会话刚提交过写入时（粘滞窗口内）只读路由也返回主库连接。
+    连接失败或熔断中时返回 None，与原先的调用约定一致（熔断中立即返回，不阻塞）；
+    失败结果在本请求内保留，之后的调用直接返回 None。
+    """
+    if _router is None:
+        raise RuntimeError("连接池尚未初始化，请先调用 db_pool.init_app()")
+
+    if not has_request_context():
+        try:
+            return _router.connect_primary()
+        except Error as e:
+            print(f"Error connecting to MySQL: {e}")
+            return None
+
+    # 快照与副本一样滞后于主库，写入后的粘滞窗口内同样不使用
+    if _snapshot is not None and g.get('_db_read_only') and not _reads_own_writes():
+        conn = _get_snapshot_connection()
+        if conn is not None:
+            return conn
+
+    key = '_db_replica_conn' if _should_use_replica() else '_db_conn'
+    conn = g.get(key)
+    if conn is not None:
+        return conn
+
+    # 本请求内已连接失败过：不再重试，避免同一请求多次等待连接超时（如 stale_fallback 与路由先后取连接）
+    unavailable = g.setdefault('_db_unavailable', set())
+    if key in unavailable:
+        return None
+
+    try:
+        if key == '_db_replica_conn':
+            conn = _router.connect_replica()
+        else:
+            conn = _router.connect_primary()
+    except CircuitOpenError:
+        unavailable.add(key)
+        return None
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        unavailable.add(key)
+        return None
+
+    conn._request_bound = True
+    setattr(g, key, conn)
+    return conn
+
+
+def _get_snapshot_connection():
+    conn = g.get('_db_snapshot_conn')
+    if conn is not None:
+        return conn
+    if not _snapshot.available():
+        return None
+    try:
+        conn = _snapshot.connect()
+    except Error as e:
+        # 快照不可用时回退到 MySQL
+        print(f"Error opening catalog snapshot: {e}")
+        return None
+    conn._request_bound = True
+    g._db_snapshot_conn = conn
+    return conn
+
+
+def _release_request_connection(exc=None):
+    snapshot_conn = g.pop('_db_snapshot_conn', None)
+    if snapshot_conn is not None:
+        snapshot_conn.release()
+    for key in ('_db_replica_conn', '_db_conn'):
+        conn = g.pop(key, None)
+        if conn is not None:
+            conn._pool.release(conn)
@@ -0,0 +1,188 @@
+"""
+年代分段
+按 Date_CN 把文物归入年代体系（东方纪年 / 西方纪年）与分段，结果保存在 ARTIFACTS 的 Era_System / Era_Bucket 中
+（migrations/009、010），年代目录 /era/<key> 按 (Era_System, Era_Bucket, Artifact_PK) 索引分页，搜索侧栏按分段计数与筛选。
+
+- 判定规则只在本模块中实现：导入新文物时写入分段，migrations/010 为已有文物补齐
+- 规则修改后执行 flask --app app rebuild-era-buckets 重新判定全部文物
+"""
+
+import re
+
+from db_config import TABLES, FIELDS
+
+# 每批读取与更新的文物数
+BATCH_SIZE = 1000
+
+
+EAST_DYNASTY_KEYWORDS = [
+    "宋", "北宋", "南宋", "明", "清", "元", "唐", "汉", "秦", "晋", "隋",
+    "明至清", "明晚期至清早期"
+]
+
+def is_east_chronology(date_cn: str) -> bool:
+
+    if not date_cn:
+        return False
+        
+    s = date_cn.strip()
+
+    WEST_KEYWORDS = ["公元前", "BCE", "BC","公元","西元"]
+    
+    if any(k in s for k in WEST_KEYWORDS):
+        return False 
+
+    return any(k in s for k in EAST_DYNASTY_KEYWORDS)
+
+
+def normalize_east_bucket(date_cn: str) -> str:
+    """
+    东方纪年桶：宋/明/清/明清/其他东
+    """
+    if not date_cn:
+        return "其他东"
+    s = date_cn.strip()
+
+    # 跨代先判斷
+    if "明至清" in s or "明晚期至清早期" in s:
+        return "明清"
+
+    # 宋（含北宋/南宋）
+    if "宋" in s:
+        return "宋"
+    if "明" in s:
+        return "明"
+    if "清" in s:
+        return "清"
+    return "其他东"
+
+CHINESE_TO_NUM = {
+    '一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10,
+}
+
+def chinese_to_int_century(cn_str):
+    """將中文世紀數字（例如「十二」、「二十一」）轉為阿拉伯數字"""
+    if not cn_str:
+        return 0
+    
+    # 處理 "二十X" (21-29)
+    if cn_str.startswith('二十') and len(cn_str) == 3:
+         return 20 + CHINESE_TO_NUM.get(cn_str[2], 0)
+    # 處理 "十X" (11-19)
+    if cn_str.startswith('十') and len(cn_str) == 2:
+        return 10 + CHINESE_TO_NUM.get(cn_str[1], 0)
+    # 處理 "二十" (20)
+    if cn_str == '二十':
+        return 20
+    # 處理 "十" (10)
+    if cn_str == '十':
+        return 10
+    # 處理 1-9
+    return CHINESE_TO_NUM.get(cn_str, 0)
+
+def normalize_west_bucket(date_cn: str) -> str:
+    """
+    西方纪年桶：古代 / 中世纪 / 近世 / 近代 / 现代 / 其他西
+    按最早年份或世纪粗分。
+    """
+    if not date_cn:
+        return "其他西"
+    s = date_cn.strip()
+
+    # 1. BCE / 公元前：当成古代
+    if "公元前" in s or "BCE" in s or "BC" in s:
+        return "古代"
+
+    # 2. 数字世纪：19世纪 / 20世纪
+    m_cent = re.search(r"(\d{1,2})\s*世紀|(\d{1,2})\s*世纪", s)
+    if m_cent:
+        cent = int(m_cent.group(1) or m_cent.group(2))
+        if cent <= 4:
+            return "古代"
+        if 5 <= cent <= 15:
+            return "中世纪"
+        if 16 <= cent <= 18:
+            return "近世"
+        if cent == 19:
+            return "近代"
+        if cent >= 20:
+            return "现代"
+        return "其他西"
+
+    # 3. 中文数字世纪：十二世纪 / 二十世纪
+    m_cn_cent = re.search(r"([一二三四五六七八九十]+)\s*(世紀|世纪)", s)
+    if m_cn_cent:
+        cn_cent_str = m_cn_cent.group(1)
+        cent = chinese_to_int_century(cn_cent_str)
+        if cent > 0:
+            if cent <= 4:
+                return "古代"
+            if 5 <= cent <= 15:
+                return "中世纪"
+            if 16 <= cent <= 18:
+                return "近世"
+            if cent == 19:
+                return "近代"
+            if cent >= 20:
+                return "现代"
+        return "其他西"
+
+    # 4. 具体年份：1707, 1893, 410 等
+    m_year = re.search(r"(\d{3,4})", s)
+    if m_year:
+        y = int(m_year.group(1))
+        if y <= 500:
+            return "古代"
+        if 501 <= y <= 1500:
+            return "中世纪"
+        if 1501 <= y <= 1800:
+            return "近世"
+        if 1801 <= y <= 1900:
+            return "近代"
+        if y >= 1901:
+            return "现代"
+
+    return "其他西"
+
+def normalize_era_from_date_cn(date_cn: str):
+    """
+    返回 (system, bucket)
+    system: 东方纪年 / 西方纪年
+    bucket: 东方: 宋/明/清/明清/其他东
+            西方: 古代/中世纪/近世/近代/现代/其他西
+    """
+    if not date_cn:
+        return ("西方纪年", "其他西")
+
+    if is_east_chronology(date_cn):
+        return ("东方纪年", normalize_east_bucket(date_cn))
+    else:
+        return ("西方纪年", normalize_west_bucket(date_cn))
+
+
+def rebuild(conn, missing_only=False):
+    """
+    按 Date_CN 重新判定文物的年代分段并写入 Era_System / Era_Bucket（调用方负责提交）
+    missing_only=True 时只处理尚未写入分段的文物；沿主键分批读取，返回更新的文物数
+    """
+    artifact = FIELDS['artifact']
+    missing = f" AND {artifact['era_bucket']} IS NULL" if missing_only else ""
+    select = (f"SELECT {artifact['id']}, {artifact['date_cn']} FROM {TABLES['artifacts']} "
+              f"WHERE {artifact['id']} > %s{missing} ORDER BY {artifact['id']} LIMIT {BATCH_SIZE}")
+    update = (f"UPDATE {TABLES['artifacts']} SET {artifact['era_system']} = %s, {artifact['era_bucket']} = %s "
+              f"WHERE {artifact['id']} = %s")
+    updated = 0
+    last_id = 0
+    cursor = conn.cursor()
+    try:
+        while True:
+            cursor.execute(select, (last_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                return updated
+            cursor.executemany(update, [normalize_era_from_date_cn(date_cn) + (artifact_id,)
+                                        for artifact_id, date_cn in rows])
+            updated += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        cursor.close()
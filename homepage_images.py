@@ -0,0 +1,129 @@
+"""
+首页背景图候选池
+首页原先每次访问都执行三条 ORDER BY RAND() 查询（其中文化、地理两条要对图片与属性的连接结果整体分组）。
+这里为随机、文化、地理三组各预先抽取几百张规范化后的图片路径保存在内存中，首页请求只从内存中随机取 6 张，不访问数据库。
+
+- 候选池由后台线程构建（见 refresher.py）：进程内首次取图时、超过 HOMEPAGE_POOL_TTL 秒后、以及元数据导入之后触发，
+  构建完成前首页显示无背景图的版本（与数据库不可用时相同）
+- 启用目录快照时从快照读取，否则优先读取只读副本
+- 每次构建从随机浏览排列（Shuffle_Key）中随机选取起点，刷新后得到不同的样本
+"""
+
+import random
+import threading
+import time
+
+import catalog_version
+import db_pool
+from blueprints.common import normalize_image_path
+from query_builder import HOMEPAGE_IMAGE_QUERIES, SHUFFLE_KEY_RANGE
+from refresher import BackgroundRefresher
+
+# 文化 / 地理区域每组最多抽取的图片数
+PER_GROUP = 5
+
+# 每次取图的张数
+DRAW_COUNT = 6
+
+# 构建失败（如数据库不可用）后，至少间隔该秒数才再次触发
+RETRY_INTERVAL = 30
+
+
+class HomepageImagePools:
+    """
+    名称 -> 候选池；候选池为分组列表，每组为同一文化（地理区域、文物）的图片路径列表
+    取图时先随机选出不同的分组，再从每组中随机取一张，使 6 张图片尽量来自不同的文化 / 地理区域 / 文物
+    """
+
+    def __init__(self, pool_size=300, ttl=600):
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._triggered_at = None
+        self.last_build = None
+        self._refresher = BackgroundRefresher(self.rebuild_from_database, 'homepage-images-rebuild')
+
+    # ---------- 构建 ----------
+
+    def rebuild(self, conn):
+        """从数据库抽取三组候选池并整体替换"""
+        started = time.monotonic()
+        pools = {}
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for name, query in HOMEPAGE_IMAGE_QUERIES.items():
+                start = random.randrange(SHUFFLE_KEY_RANGE)
+                # 随机组按文物分组，每件文物只取一张
+                per_group = PER_GROUP if name != 'random_images' else 1
+                cursor.execute(query, (start, per_group, start, self.pool_size))
+                groups = {}
+                for row in cursor.fetchall():
+                    path = normalize_image_path(row['local_path'])
+                    if path:
+                        groups.setdefault(row['grp'], []).append(path)
+                pools[name] = list(groups.values())
+        finally:
+            cursor.close()
+        with self._lock:
+            self._pools = pools
+            self._built_at = time.monotonic()
+        self.last_build = {
+            'images': {name: sum(len(group) for group in groups) for name, groups in pools.items()},
+            'catalog_version': catalog_version.current(conn),
+            'seconds': round(time.monotonic() - started, 2),
+        }
+        return self.last_build
+
+    def rebuild_from_database(self):
+        snapshot = db_pool.get_snapshot()
+        if snapshot is not None and snapshot.available():
+            conn = snapshot.connect()
+        else:
+            conn = db_pool.get_router().connect_replica()
+        try:
+            return self.rebuild(conn)
+        finally:
+            conn.close()
+
+    def refresh_async(self):
+        """在后台线程中重新抽取，不阻塞当前请求"""
+        self._refresher.trigger()
+
+    # ---------- 取图 ----------
+
+    def draw(self, count=DRAW_COUNT):
+        """-> {名称: 图片路径列表}；候选池尚未构建或已过期时触发后台刷新，本次仍使用现有候选池"""
+        now = time.monotonic()
+        expired = self._built_at is None or now - self._built_at > self.ttl
+        if expired and (self._triggered_at is None or now - self._triggered_at >= RETRY_INTERVAL):
+            self._triggered_at = now
+            self.refresh_async()
+        pools = self._pools
+        images = {}
+        for name in HOMEPAGE_IMAGE_QUERIES:
+            groups = pools.get(name, [])
+            paths = []
+            for group in random.sample(groups, min(count, len(groups))):
+                # 同一件文物可能同时属于多个文化 / 地理区域，跳过已选中的图片
+                path = random.choice(group)
+                if path not in paths:
+                    paths.append(path)
+            if len(paths) < count:
+                # 分组不足 6 个时从其余图片中补足
+                rest = list({path for group in groups for path in group}.difference(paths))
+                paths.extend(random.sample(rest, min(count - len(paths), len(rest))))
+            images[name] = paths
+        return images
+
+    def stats(self):
+        pools = self._pools
+        return {
+            'pool_size': self.pool_size,
+            'ttl': self.ttl,
+            'groups': {name: len(groups) for name, groups in pools.items()},
+            'age': None if self._built_at is None else round(time.monotonic() - self._built_at, 1),
+            'refreshing': self._refresher.running,
+            'last_build': self.last_build,
+        }
@@ -0,0 +1,45 @@
+-- 数据库迁移脚本：创建用户、图集、收藏与导出记录表
+-- 执行日期：2026-10-17
+-- 描述：原先由 init_user_tables() 在用户中心与收藏接口的每个请求中执行，现改为部署时迁移一次。
+
+-- 用户表
+CREATE TABLE IF NOT EXISTS Users (
+    user_id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    username VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    collection_count INT DEFAULT 0
+);
+
+-- 图集表
+CREATE TABLE IF NOT EXISTS Albums (
+    album_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    is_public BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+);
+
+-- 收藏表（图集与文物的关联）
+CREATE TABLE IF NOT EXISTS Collections (
+    collection_id INT AUTO_INCREMENT PRIMARY KEY,
+    album_id INT NOT NULL,
+    artifact_id INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE CASCADE
+);
+
+-- 导出记录表
+CREATE TABLE IF NOT EXISTS ExportRecords (
+    export_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    album_id INT,
+    description VARCHAR(500),
+    format VARCHAR(50),
+    status VARCHAR(50) DEFAULT '处理中',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (album_id) REFERENCES Albums(album_id) ON DELETE SET NULL
+);
@@ -0,0 +1,17 @@
+-- 数据库迁移脚本：为 ARTIFACTS 表添加起止年份字段
+-- 执行日期：2026-10-17
+-- 描述：合并原 database_migration_add_end_year.sql。Start_Year / End_Year 由 database/date_process.py
+--      从 Date_CN 解析写入，用于年代浏览与年代范围查询。已手工添加过的字段与索引会被迁移工具跳过。
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Start_Year INT DEFAULT NULL
+COMMENT '文物年代起始年份（负数表示公元前）'
+AFTER Date_EN;
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN End_Year INT DEFAULT NULL
+COMMENT '文物年代结束年份（负数表示公元前）'
+AFTER Start_Year;
+
+-- 年代范围查询
+CREATE INDEX idx_year_range ON ARTIFACTS (Start_Year, End_Year);
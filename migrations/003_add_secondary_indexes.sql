@@ -0,0 +1,34 @@
+-- 数据库迁移脚本：为热点查询添加二级索引与覆盖索引
+-- 执行日期：2026-10-17
+-- 描述：首页、浏览、详情、搜索、图集与导入路径上的连接、筛选和排序都依赖以下索引。
+--      InnoDB 为外键自动创建的单列索引会在建立同前缀的复合索引后被自动替换。
+
+-- PROPERTIES：按文化 / 地区筛选后回连 ARTIFACTS（文化、地区浏览与详情列表）
+CREATE INDEX idx_prop_culture_artifact ON PROPERTIES (Culture, Artifact_PK);
+CREATE INDEX idx_prop_geography_artifact ON PROPERTIES (Geography, Artifact_PK);
+
+-- PROPERTIES：由文物回查文化 / 地区（详情页与搜索结果连接，覆盖索引）
+CREATE INDEX idx_prop_artifact_culture_geo ON PROPERTIES (Artifact_PK, Culture, Geography);
+
+-- IMAGE_VERSIONS：按文物取图片并按 Version_PK 排序，覆盖 Local_Path
+CREATE INDEX idx_img_artifact_version_path ON IMAGE_VERSIONS (Artifact_PK, Version_PK, Local_Path);
+
+-- IMAGE_VERSIONS：图像管理页按处理时间倒序分页
+CREATE INDEX idx_img_processed_time ON IMAGE_VERSIONS (Last_Processed_Time);
+
+-- DIMENSIONS：详情页按文物取尺寸并按 Dimension_PK 排序
+CREATE INDEX idx_dim_artifact_order ON DIMENSIONS (Artifact_PK, Dimension_PK);
+
+-- ARTIFACTS：导入时按 (Source_ID, Original_ID) 判断记录是否已存在
+CREATE INDEX idx_artifact_source_original ON ARTIFACTS (Source_ID, Original_ID);
+
+-- LOGS：仪表板与日志页按时间倒序，以及按表名 / 操作类型筛选
+CREATE INDEX idx_logs_time ON LOGS (Log_Time);
+CREATE INDEX idx_logs_table_op_time ON LOGS (Table_Name, Operation_Type, Log_Time);
+
+-- Collections：添加到图集前的重复检查与移除收藏
+CREATE INDEX idx_collections_album_artifact ON Collections (album_id, artifact_id);
+
+-- Albums：用户中心按创建时间列出图集
+CREATE INDEX idx_albums_user_created ON Albums (user_id, created_at);
+
@@ -0,0 +1,25 @@
+-- 数据库迁移脚本：为搜索添加 ngram 全文索引
+-- 执行日期：2026-10-17
+-- 描述：搜索原先在 10 个字段上执行前置通配的 LIKE '%关键词%'，无法使用索引，每次搜索都要扫描整个连接结果。
+--      改为 MATCH ... AGAINST 查询以下全文索引（见 query_builder.build_search_query），并按相关度排序。
+--      全文索引不能跨表，按表分为三组；MATCH() 的列必须与索引列完全一致，修改列时两边同步修改。
+--      ngram 分词长度由服务器参数 ngram_token_size 决定（默认 2，中文按两字切分）。
+
+-- ngram 分词会丢弃包含停用词的词元，默认停用词表中的 a、i 等单字母会让大量英文二元组失效，
+-- 因此建索引时关闭停用词（该设置在索引创建时生效）
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+-- ARTIFACTS：标题、年代、材质、描述
+ALTER TABLE ARTIFACTS
+ADD FULLTEXT INDEX ft_artifacts_search (Title_CN, Title_EN, Date_CN, Date_EN, Material, Description_CN)
+WITH PARSER ngram;
+
+-- PROPERTIES：艺术家、文化、地区
+ALTER TABLE PROPERTIES
+ADD FULLTEXT INDEX ft_properties_search (Artist, Culture, Geography)
+WITH PARSER ngram;
+
+-- SOURCES：博物馆名称
+ALTER TABLE SOURCES
+ADD FULLTEXT INDEX ft_sources_search (Museum_Name_CN)
+WITH PARSER ngram;
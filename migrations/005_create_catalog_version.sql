@@ -0,0 +1,12 @@
+-- 数据库迁移脚本：创建目录数据版本表
+-- 执行日期：2026-10-17
+-- 描述：目录数据（文物、属性、图片）每次变更都在同一事务中把 version 加一（见 catalog_version.py），
+--      搜索结果缓存等派生数据按版本号判断是否过期。表中只有 id = 1 一行。
+
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO catalog_version (id, version) VALUES (1, 0);
@@ -0,0 +1,14 @@
+-- 数据库迁移脚本：为随机浏览添加预先打乱的排序键
+-- 执行日期：2026-10-17
+-- 描述：Shuffle_Key 为每件文物的随机数，(Shuffle_Key, Artifact_PK) 即一个固定的随机排列。
+--      /explore 按访客种子选定起点，沿索引分页读取（绕回开头后到起点为止），每页只读取一页的行，
+--      不再对整张表 ORDER BY RAND()。新导入的文物在插入时生成随机键；
+--      flask --app app reshuffle-explore 可整体重新打乱。
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Shuffle_Key INT UNSIGNED NOT NULL DEFAULT 0
+COMMENT '随机浏览排序键（随机数）';
+
+UPDATE ARTIFACTS SET Shuffle_Key = FLOOR(RAND() * 4294967296);
+
+CREATE INDEX idx_artifact_shuffle ON ARTIFACTS (Shuffle_Key, Artifact_PK);
@@ -0,0 +1,43 @@
+-- 数据库迁移脚本：创建文化 / 地理统计表
+-- 执行日期：2026-10-17
+-- 描述：文化浏览（/browse）与地理浏览（/geographies）原先每次访问都要对 PROPERTIES、ARTIFACTS 与
+--      IMAGE_VERSIONS 的连接结果分组计数，详情页为了把编号换成名称也要重跑一遍。
+--      这里把每个文化 / 地理区域的文物数量与代表性图片物化为统计表，浏览页只需按索引顺序读取。
+--      元数据导入新增文物时随同一事务增量更新（见 blueprints/admin.py），
+--      flask --app app rebuild-category-stats 可从 PROPERTIES 全量重建。
+
+CREATE TABLE IF NOT EXISTS CULTURE_STATS (
+    Stats_PK             INT AUTO_INCREMENT PRIMARY KEY,
+    Name                 VARCHAR(100) NOT NULL COMMENT '文化名称（PROPERTIES.Culture）',
+    Artifact_Count       INT NOT NULL DEFAULT 0 COMMENT '该文化下的文物数量',
+    Representative_Image VARCHAR(255) DEFAULT NULL COMMENT '代表性图片（IMAGE_VERSIONS.Local_Path）',
+    Last_Updated         TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uk_culture_stats_name (Name),
+    -- 浏览页按文物数量降序、名称升序读取
+    INDEX idx_culture_stats_count (Artifact_Count DESC, Name)
+);
+
+CREATE TABLE IF NOT EXISTS GEOGRAPHY_STATS (
+    Stats_PK             INT AUTO_INCREMENT PRIMARY KEY,
+    Name                 VARCHAR(100) NOT NULL COMMENT '地理区域名称（PROPERTIES.Geography）',
+    Artifact_Count       INT NOT NULL DEFAULT 0 COMMENT '该地理区域下的文物数量',
+    Representative_Image VARCHAR(255) DEFAULT NULL COMMENT '代表性图片（IMAGE_VERSIONS.Local_Path）',
+    Last_Updated         TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uk_geography_stats_name (Name),
+    INDEX idx_geography_stats_count (Artifact_Count DESC, Name)
+);
+
+-- 初始数据
+INSERT INTO CULTURE_STATS (Name, Artifact_Count, Representative_Image)
+SELECT p.Culture, COUNT(DISTINCT p.Artifact_PK), MIN(iv.Local_Path)
+FROM PROPERTIES p
+LEFT JOIN IMAGE_VERSIONS iv ON p.Artifact_PK = iv.Artifact_PK
+WHERE p.Culture IS NOT NULL AND p.Culture != ''
+GROUP BY p.Culture;
+
+INSERT INTO GEOGRAPHY_STATS (Name, Artifact_Count, Representative_Image)
+SELECT p.Geography, COUNT(DISTINCT p.Artifact_PK), MIN(iv.Local_Path)
+FROM PROPERTIES p
+LEFT JOIN IMAGE_VERSIONS iv ON p.Artifact_PK = iv.Artifact_PK
+WHERE p.Geography IS NOT NULL AND p.Geography != ''
+GROUP BY p.Geography;
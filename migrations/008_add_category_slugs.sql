@@ -0,0 +1,44 @@
+-- 数据库迁移脚本：为文化 / 地理统计表添加 URL 标识（slug）
+-- 执行日期：2026-10-17
+-- 描述：/culture/<id> 与 /geography/<id> 原先以浏览页上的序号（按文物数量排序）作为编号，
+--      每次解析都要读取排序结果，而且数量变化后同一地址会指向另一个分类，HTTP 缓存与书签随之失效。
+--      这里为统计表的每一行（Stats_PK 在重建时保持不变）分配一个固定的 Slug，页面地址改为
+--      /culture/<slug>、/geography/<slug>，经唯一索引直接定位；旧的数字地址按当前排序 302 重定向到新地址。
+--      Slug 由名称生成：转为小写，空白与标点连写为一个 "-"；结果为空或全为数字时加上分类前缀，
+--      与其他分类重名时在末尾加上 "-Stats_PK"。之后新出现的分类由 category_stats.py 按同样规则分配。
+
+ALTER TABLE CULTURE_STATS
+ADD COLUMN Slug VARCHAR(120) DEFAULT NULL
+COMMENT 'URL 标识（/culture/<slug>），分配后不再改变'
+AFTER Name;
+
+ALTER TABLE GEOGRAPHY_STATS
+ADD COLUMN Slug VARCHAR(120) DEFAULT NULL
+COMMENT 'URL 标识（/geography/<slug>），分配后不再改变'
+AFTER Name;
+
+UPDATE CULTURE_STATS
+SET Slug = LOWER(TRIM(BOTH '-' FROM REGEXP_REPLACE(Name, '[[:space:][:punct:]]+', '-')));
+
+UPDATE CULTURE_STATS
+SET Slug = IF(Slug = '', 'culture', CONCAT('culture-', Slug))
+WHERE Slug = '' OR Slug REGEXP '^[0-9]+$';
+
+UPDATE CULTURE_STATS s
+JOIN (SELECT Slug FROM CULTURE_STATS GROUP BY Slug HAVING COUNT(*) > 1) dup ON s.Slug = dup.Slug
+SET s.Slug = CONCAT(s.Slug, '-', s.Stats_PK);
+
+UPDATE GEOGRAPHY_STATS
+SET Slug = LOWER(TRIM(BOTH '-' FROM REGEXP_REPLACE(Name, '[[:space:][:punct:]]+', '-')));
+
+UPDATE GEOGRAPHY_STATS
+SET Slug = IF(Slug = '', 'geography', CONCAT('geography-', Slug))
+WHERE Slug = '' OR Slug REGEXP '^[0-9]+$';
+
+UPDATE GEOGRAPHY_STATS s
+JOIN (SELECT Slug FROM GEOGRAPHY_STATS GROUP BY Slug HAVING COUNT(*) > 1) dup ON s.Slug = dup.Slug
+SET s.Slug = CONCAT(s.Slug, '-', s.Stats_PK);
+
+-- 详情页按 Slug 定位
+CREATE UNIQUE INDEX uk_culture_stats_slug ON CULTURE_STATS (Slug);
+CREATE UNIQUE INDEX uk_geography_stats_slug ON GEOGRAPHY_STATS (Slug);
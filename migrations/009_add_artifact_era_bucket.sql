@@ -0,0 +1,20 @@
+-- 数据库迁移脚本：为 ARTIFACTS 表添加年代分段字段
+-- 执行日期：2026-10-17
+-- 描述：Era_System / Era_Bucket 为按 Date_CN 判定的年代体系（东方纪年 / 西方纪年）与分段（规则见 era_buckets.py）。
+--      /era/<key> 原先沿主键扫描整张表、逐行判定分段，冷门分段与最后一页都要读完全表；
+--      改为在 (Era_System, Era_Bucket, Artifact_PK) 索引上按编号倒序 keyset 分页，与文化 / 地理目录相同。
+--      搜索侧栏也按分段字段计数与筛选。已有文物的分段由 010_backfill_artifact_era_bucket.py 写入，
+--      新导入的文物在插入时写入。
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Era_System VARCHAR(8) DEFAULT NULL
+COMMENT '年代体系（东方纪年 / 西方纪年）'
+AFTER End_Year;
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Era_Bucket VARCHAR(8) DEFAULT NULL
+COMMENT '年代分段（宋 / 明 / 清 / 明清 / 其他东 / 古代 / 中世纪 / 近世 / 近代 / 现代 / 其他西）'
+AFTER Era_System;
+
+-- 年代目录分页与搜索侧栏按分段分组
+CREATE INDEX idx_artifact_era ON ARTIFACTS (Era_System, Era_Bucket, Artifact_PK);
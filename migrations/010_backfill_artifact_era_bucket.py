@@ -0,0 +1,13 @@
+"""
+数据库迁移脚本：为已有文物写入年代分段
+执行日期：2026-10-17
+描述：判定规则只在 era_buckets.py 中实现（SQL 脚本无法复用），因此以 Python 迁移执行；
+     只处理尚未写入分段的文物，重复执行是安全的。
+"""
+
+import era_buckets
+
+
+def migrate(conn):
+    updated = era_buckets.rebuild(conn, missing_only=True)
+    print(f"        - 写入年代分段: {updated} 件文物")
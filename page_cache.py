@@ -0,0 +1,121 @@
+"""
+页面兜底缓存
+保存首页、浏览页与详情页最近一次成功渲染的 HTML。数据库熔断、连接失败或查询出错时，
+这些页面改为返回缓存中的旧版本，而不是阻塞等待或返回错误页。
+
+- 只缓存未登录访问的 GET 200 响应，避免把个人信息（导航栏用户名）提供给其他访客
+- 流式响应无法在发送前取得完整内容，不进入缓存
+- 缓存按 LRU 淘汰，条目数由 STALE_CACHE_SIZE 控制
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import make_response, request, session
+
+from db_pool import get_db_connection
+
+
+class StalePageCache:
+    """线程安全的 LRU 页面缓存：路径 -> (HTML, 内容类型, 缓存时间)"""
+
+    def __init__(self, max_entries=500):
+        self.max_entries = max_entries
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'stored': 0, 'served': 0, 'misses': 0}
+
+    def get(self, key):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self._counters['misses'] += 1
+                return None
+            self._pages.move_to_end(key)
+            self._counters['served'] += 1
+            return page
+
+    def put(self, key, body, mimetype):
+        with self._lock:
+            self._pages[key] = (body, mimetype, time.time())
+            self._pages.move_to_end(key)
+            self._counters['stored'] += 1
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, entries=len(self._pages), max_entries=self.max_entries)
+
+
+_cache = StalePageCache()
+
+
+def configure(max_entries):
+    _cache.max_entries = max_entries
+
+
+def stats():
+    return _cache.stats()
+
+
+def lookup(key):
+    """取缓存页面：(HTML, 内容类型, 缓存时间)，没有时返回 None"""
+    return _cache.get(key)
+
+
+def store(key, body, mimetype):
+    _cache.put(key, body, mimetype)
+
+
+def cacheable(response, method, user_id):
+    """只缓存未登录访问的 GET 200 完整响应"""
+    return response.status_code == 200 and not response.is_streamed \
+        and method == 'GET' and not user_id
+
+
+def stale_headers(page):
+    """兜底页面的响应头（同步与异步模式共用）"""
+    return {
+        'Age': str(int(time.time() - page[2])),
+        'Cache-Control': 'no-store',
+        'X-Stale-Page': '1',
+    }
+
+
+def _stale_response(page):
+    body, mimetype, _ = page
+    response = make_response(body)
+    response.mimetype = mimetype
+    response.headers.update(stale_headers(page))
+    return response
+
+
+def stale_fallback(f):
+    """
+    页面兜底装饰器（放在 @read_replica 之下）
+    先取得本请求的数据库连接：取不到（熔断中或连接失败）时直接返回缓存页面；
+    路由本身返回 5xx 时同样改用缓存页面；正常渲染的页面写入缓存。
+    没有缓存时保持路由原有的处理方式。
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.full_path
+
+        if get_db_connection() is None:
+            page = _cache.get(key)
+            if page is not None:
+                return _stale_response(page)
+            return f(*args, **kwargs)
+
+        response = make_response(f(*args, **kwargs))
+        if response.status_code >= 500:
+            page = _cache.get(key)
+            if page is not None:
+                return _stale_response(page)
+        elif cacheable(response, request.method, session.get('user_id')):
+            _cache.put(key, response.get_data(), response.mimetype)
+        return response
+    return decorated_function
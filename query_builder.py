@@ -3,6 +3,9 @@ SQL查询构建器
 根据 db_config.py 中的配置自动生成SQL查询
 """
 
+import json
+import re
+
 from db_config import QUERIES, TABLES, FIELDS, JOINS
 
 def build_index_query():
@@ -59,7 +62,7 @@ def build_images_query():
     config = QUERIES['images']
     
     select_clause = ', '.join(config['select'])
-    from_clause = config['from']
+    from_clause = f"{config['from']} {config['alias']}"
     
     query = f"""
         SELECT {select_clause}
@@ -70,43 +73,474 @@ def build_images_query():
     
     return query.strip()
 
-def build_search_query(search_term):
+def build_dimensions_query():
+    """构建尺寸查询SQL"""
+    config = QUERIES['dimensions']
+    
+    select_clause = ', '.join(config['select'])
+    from_clause = f"{config['from']} {config['alias']}"
+    
+    query = f"""
+        SELECT {select_clause}
+        FROM {from_clause}
+        WHERE {config['where']}
+        ORDER BY {config['order_by']}
+    """
+    
+    return query.strip()
+
+# 搜索结果排序方式（年代未知的文物始终排在最后）
+SEARCH_SORTS = {
+    'relevance': f"relevance DESC, a.{FIELDS['artifact']['id']} DESC",
+    'newest': f"a.{FIELDS['artifact']['id']} DESC",
+    'era_asc': f"start_year IS NULL, start_year ASC, a.{FIELDS['artifact']['id']} DESC",
+    'era_desc': f"start_year IS NULL, start_year DESC, a.{FIELDS['artifact']['id']} DESC"
+}
+
+# 带筛选条件的结果总数最多在这么多条命中中精确统计，命中更多时按样本中的筛选比例估算
+SEARCH_COUNT_SAMPLE = 1000
+
+# 进程内倒排索引的命中最多取得分最高的这么多条交给数据库（侧栏计数、筛选与按年代排序）；
+# 命中总数与无筛选时的排序分页在内存中完成，数据库只补全当前页
+SEARCH_INDEX_SQL_HITS = SEARCH_COUNT_SAMPLE
+
+# 搜索侧栏每组筛选选项最多显示的数量，其余合并为"其他"
+SEARCH_FACET_LIMIT = 10
+
+# MySQL 全文索引（ngram 分词，见 migrations/004_add_fulltext_search_indexes.sql）
+# MATCH() 的列必须与索引列完全一致；全文索引不能跨表，因此按表分为三组，命中得分相加
+SEARCH_FULLTEXT_COLUMNS = {
+    'artifacts': [FIELDS['artifact'][key] for key in
+                  ('title_cn', 'title_en', 'date_cn', 'date_en', 'material', 'description_cn')],
+    'properties': [FIELDS['property'][key] for key in ('artist', 'culture', 'geography')],
+    'sources': [FIELDS['source']['museum_name_cn']],
+}
+
+# ngram 分词长度（MySQL 默认 ngram_token_size=2），更短的关键词改用前缀匹配
+NGRAM_TOKEN_SIZE = 2
+
+# SQLite 目录快照中的全文索引表（见 catalog_snapshot.py）
+SNAPSHOT_FTS_TABLE = 'ARTIFACTS_FTS'
+
+# MySQL 全文索引布尔模式中的运算符字符
+BOOLEAN_MODE_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+def boolean_mode_term(search_term):
+    """去掉布尔模式运算符后的关键词；为空时（如只输入引号或单个运算符）MySQL 全文查询没有可匹配的内容"""
+    return ' '.join(BOOLEAN_MODE_OPERATORS.sub(' ', search_term).split())
+
+def _fts_uses_match(search_term):
+    # trigram 分词至少需要 3 个字符，更短的关键词直接在全文索引内容中查找子串
+    return len(search_term) >= 3
+
+def _match(alias, group):
+    columns = ', '.join(f"{alias}.{column}" for column in SEARCH_FULLTEXT_COLUMNS[group])
+    return f"MATCH({columns}) AGAINST (%s IN BOOLEAN MODE)"
+
+def _search_hits(search_term, dialect, from_index=False):
+    """命中文物及其相关度得分：(Artifact_PK, relevance)
+    MySQL 分别查询三组全文索引后按文物汇总得分；SQLite 快照查询 FTS5 全文索引（rank 即 bm25 得分，越小越相关）
+    from_index=True 时命中结果来自进程内倒排索引（search_index.py），以一个 JSON 参数 [[编号, 得分], ...] 传入
+    """
+    artifact_id = FIELDS['artifact']['id']
+    if from_index:
+        if dialect == 'sqlite':
+            return f"""
+                SELECT json_extract(value, '$[0]') AS {artifact_id}, json_extract(value, '$[1]') AS relevance
+                FROM json_each(%s)"""
+        return f"""
+                SELECT hit.{artifact_id}, hit.relevance
+                FROM JSON_TABLE(%s, '$[*]' COLUMNS (
+                    {artifact_id} INT PATH '$[0]',
+                    relevance DOUBLE PATH '$[1]'
+                )) hit"""
+    if dialect == 'sqlite':
+        if _fts_uses_match(search_term):
+            return f"""
+                SELECT rowid AS {artifact_id}, -rank AS relevance
+                FROM {SNAPSHOT_FTS_TABLE} WHERE search_text MATCH %s"""
+        return f"""
+                SELECT rowid AS {artifact_id}, 0 AS relevance
+                FROM {SNAPSHOT_FTS_TABLE} WHERE instr(lower(search_text), %s) > 0"""
+
+    # 同一个 MATCH() 同时出现在 SELECT 与 WHERE 中时，MySQL 只计算一次
+    return f"""
+                SELECT hit.{artifact_id}, SUM(hit.score) AS relevance
+                FROM (
+                    SELECT a2.{artifact_id}, {_match('a2', 'artifacts')} AS score
+                    FROM {TABLES['artifacts']} a2
+                    WHERE {_match('a2', 'artifacts')}
+                    UNION ALL
+                    SELECT p2.{FIELDS['property']['artifact_id']}, {_match('p2', 'properties')}
+                    FROM {TABLES['properties']} p2
+                    WHERE {_match('p2', 'properties')}
+                    UNION ALL
+                    SELECT a3.{artifact_id}, {_match('s2', 'sources')}
+                    FROM {TABLES['sources']} s2
+                    JOIN {TABLES['artifacts']} a3 ON a3.{FIELDS['artifact']['source_id']} = s2.{FIELDS['source']['id']}
+                    WHERE {_match('s2', 'sources')}
+                ) hit
+                GROUP BY hit.{artifact_id}"""
+
+def era_range(value):
+    """年代范围筛选值 "起始~结束"（负数表示公元前，如 "-500~200"、"1800~"）-> (起始, 结束)，两端均包含、可为 None；
+    无法识别时返回 None（即年代分段筛选值 "体系_分段"）
+    """
+    match = re.fullmatch(r'\s*(-?\d+)?\s*~\s*(-?\d+)?\s*', value or '')
+    if match is None or match.groups() == (None, None):
+        return None
+    return tuple(int(year) if year is not None else None for year in match.groups())
+
+def year_overlap(from_year=None, to_year=None, alias='a'):
+    """年份区间 [from_year, to_year]（两端包含，负数表示公元前，缺一端为不限）与文物年代 [Start_Year, End_Year]
+    有交集的条件 -> (条件, 参数)；未解析出年份的文物不匹配，End_Year 为空时按 Start_Year 计
+    Start_Year 上的范围条件使用 idx_year_range (Start_Year, End_Year)，End_Year 在同一索引上过滤，不回表
+    """
+    start = f"{alias}.{FIELDS['artifact']['start_year']}"
+    end = f"COALESCE({alias}.{FIELDS['artifact']['end_year']}, {start})"
+    conditions = []
+    params = []
+    if to_year is not None:
+        conditions.append(f"{start} <= %s")
+        params.append(to_year)
+    else:
+        conditions.append(f"{start} IS NOT NULL")
+    if from_year is not None:
+        conditions.append(f"{end} >= %s")
+        params.append(from_year)
+    return ' AND '.join(conditions), params
+
+def _search_filters(filters):
+    """筛选条件 -> (WHERE 条件列表, 参数列表)
+    filters: {'culture': [...], 'material': [...], 'region': [...], 'era': [...],
+              'from_year': [年份], 'to_year': [年份]}；
+    同一类内为"或"，不同类之间为"与"；文化与地区只要文物的任一属性记录匹配即可
+    年代：era 中的年份范围与 from_year / to_year 均按与文物年代区间有交集筛选（见 year_overlap），
+    era 中的年代分段 "体系_分段" 按 Era_System / Era_Bucket 字段匹配（见 era_buckets.py）
+    """
+    conditions = []
+    params = []
+    if not filters:
+        return conditions, params
+    
+    artifact_id = FIELDS['artifact']['id']
+    for key, column in (('culture', FIELDS['property']['culture']), ('region', FIELDS['property']['geography'])):
+        values = filters.get(key)
+        if values:
+            conditions.append(f"""EXISTS (
+                SELECT 1 FROM {TABLES['properties']} pf
+                WHERE pf.{FIELDS['property']['artifact_id']} = a.{artifact_id}
+                  AND TRIM(pf.{column}) IN ({', '.join(['%s'] * len(values))})
+            )""")
+            params.extend(values)
+    
+    if filters.get('material'):
+        values = filters['material']
+        conditions.append(f"TRIM(a.{FIELDS['artifact']['material']}) IN ({', '.join(['%s'] * len(values))})")
+        params.extend(values)
+    
+    if filters.get('era'):
+        clauses = []
+        for value in filters['era']:
+            year_range = era_range(value)
+            if year_range is not None:
+                condition, overlap_params = year_overlap(*year_range)
+                clauses.append(f"({condition})")
+                params.extend(overlap_params)
+            elif '_' in value:
+                clauses.append(f"(a.{FIELDS['artifact']['era_system']} = %s AND a.{FIELDS['artifact']['era_bucket']} = %s)")
+                params.extend(value.split('_', 1))
+        # 没有可识别的年代筛选值时没有可匹配的条件
+        conditions.append(f"({' OR '.join(clauses) or '1 = 0'})")
+    
+    from_year = (filters.get('from_year') or [None])[0]
+    to_year = (filters.get('to_year') or [None])[0]
+    if from_year is not None or to_year is not None:
+        condition, overlap_params = year_overlap(from_year, to_year)
+        conditions.append(condition)
+        params.extend(overlap_params)
+    
+    return conditions, params
+
+def build_search_params(search_term, dialect='mysql', index_hits=None, filters=None):
+    """构建搜索查询参数（与 build_search_query / build_search_facets_query / build_search_count_query 对应）
+    index_hits 为进程内倒排索引给出的 [(编号, 得分)]（调用方截取后的命中或当前页）时，对应 from_index=True 的查询
+    filters 与构建查询时传入的筛选条件一致，筛选参数排在搜索参数之后
+    MySQL 关键词去掉布尔模式运算符后为空时（boolean_mode_term），调用方应直接返回空结果而不执行查询
+    """
+    _, filter_params = _search_filters(filters)
+    if index_hits is not None:
+        return (json.dumps(index_hits),) + tuple(filter_params)
+    if dialect == 'sqlite':
+        if _fts_uses_match(search_term):
+            # 整个关键词作为短语匹配，等价于子串匹配
+            return ('"' + search_term.replace('"', '""') + '"',) + tuple(filter_params)
+        return (search_term.lower(),) + tuple(filter_params)
+    # 布尔模式下整个关键词作为短语匹配（连续的 ngram），与原先的子串匹配一致；
+    # 短于 ngram 长度的关键词（如单个汉字）使用前缀通配
+    # 运算符字符会改变布尔模式的语义，单独出现时还会导致语法错误，先去掉再判断使用前缀还是短语匹配
+    term = boolean_mode_term(search_term)
+    against = f"{term}*" if len(term) < NGRAM_TOKEN_SIZE else f'"{term}"'
+    # 三组全文索引，每组的 MATCH() 在 SELECT 与 WHERE 中各出现一次
+    return (against,) * 6 + tuple(filter_params)
+
+def build_search_query(search_term, sort_by='relevance', dialect='mysql', from_index=False, filters=None,
+                       paginate=False):
     """构建搜索查询SQL
     搜索范围包括：标题、艺术家、文化、来源、年代、描述、材质
-    返回结果包含文化、材质和年代信息，用于筛选和排序
+    返回结果包含文化、材质、年代信息与相关度得分，用于筛选和排序
+    dialect='sqlite' 时生成目录快照使用的全文索引查询，参数见 build_search_params
+    from_index=True 时命中文物由进程内倒排索引给出，数据库只负责补全结果
+    filters 为文化 / 材质 / 地区 / 年代筛选，在 SQL 中过滤，只返回符合条件的结果
+    paginate=True 时只返回一页，参数末尾追加 (LIMIT, OFFSET)
     """
     if not search_term:
         return None
     
-    # 使用LIKE进行模糊匹配，支持中文搜索
-    search_pattern = f"%{search_term}%"
+    # 先由全文索引取得命中文物与得分，在只含 (编号, 得分) 的窄结果上筛选、排序并截取一页，
+    # 再为这一页连接图片与属性；连接与分组的开销只取决于页大小，与命中数无关
+    hits = _search_hits(search_term, dialect, from_index)
+    conditions, _ = _search_filters(filters)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order_by = SEARCH_SORTS.get(sort_by, SEARCH_SORTS['relevance'])
+    limit = f"ORDER BY {order_by}\n            LIMIT %s OFFSET %s" if paginate else ""
     
     query = f"""
-        SELECT DISTINCT 
+        SELECT 
             a.{FIELDS['artifact']['id']} AS artifact_id,
             a.{FIELDS['artifact']['title_cn']} AS title,
             a.{FIELDS['artifact']['date_cn']} AS date_text,
             ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path,
             ANY_VALUE(p.{FIELDS['property']['culture']}) AS culture_name,
             ANY_VALUE(a.{FIELDS['artifact']['material']}) AS medium,
-            ANY_VALUE(a.{FIELDS['artifact']['start_year']}) AS start_year
-        FROM {TABLES['artifacts']} a
+            ANY_VALUE(a.{FIELDS['artifact']['start_year']}) AS start_year,
+            ANY_VALUE(pg.relevance) AS relevance
+        FROM (
+            SELECT a.{FIELDS['artifact']['id']}, h.relevance
+            FROM ({hits}
+            ) h
+            JOIN {TABLES['artifacts']} a ON a.{FIELDS['artifact']['id']} = h.{FIELDS['artifact']['id']}
+            {where}
+            {limit}
+        ) pg
+        JOIN {TABLES['artifacts']} a ON a.{FIELDS['artifact']['id']} = pg.{FIELDS['artifact']['id']}
         LEFT JOIN {TABLES['image_versions']} iv ON a.{FIELDS['artifact']['id']} = iv.{FIELDS['image']['artifact_id']}
         LEFT JOIN {TABLES['properties']} p ON a.{FIELDS['artifact']['id']} = p.{FIELDS['property']['artifact_id']}
+        GROUP BY a.{FIELDS['artifact']['id']}
+        ORDER BY {order_by}
+    """
+    
+    return query.strip()
+
+def build_search_facets_query(search_term, dialect='mysql', from_index=False):
+    """构建搜索侧栏的筛选选项计数查询SQL（基于未筛选的命中文物），参数与无筛选的 build_search_query 相同
+    命中集合只计算一次（CTE），各组直接在命中编号上 GROUP BY，不连接图片、不逐条返回结果。返回行 (facet, value, artifact_count, total)：
+    - total：命中文物总数（value 为 NULL）
+    - material / culture / region / era：按数量取前 SEARCH_FACET_LIMIT 个取值，total 为该组全部取值的计数之和，用于计算"其他"
+      （文化与地区按文物去重计数，与筛选条件"任一属性记录匹配"一致；年代按 Era_System / Era_Bucket 分组，取值为 "体系_分段"）
+    """
+    if not search_term:
+        return None
+    
+    hits = _search_hits(search_term, dialect, from_index)
+    artifact_id = FIELDS['artifact']['id']
+    material = f"TRIM(a.{FIELDS['artifact']['material']})"
+    era_system = f"a.{FIELDS['artifact']['era_system']}"
+    era_bucket = f"a.{FIELDS['artifact']['era_bucket']}"
+    
+    def property_facet(name, column):
+        value = f"TRIM(p.{FIELDS['property'][column]})"
+        return f"""
+                SELECT '{name}' AS facet, {value} AS value, COUNT(DISTINCT p.{FIELDS['property']['artifact_id']}) AS artifact_count
+                FROM h JOIN {TABLES['properties']} p ON p.{FIELDS['property']['artifact_id']} = h.{artifact_id}
+                WHERE {value} <> ''
+                GROUP BY {value}"""
+    
+    query = f"""
+        WITH h AS ({hits}
+        )
+        SELECT facet, value, artifact_count, total
+        FROM (
+            SELECT 
+                facet, value, artifact_count,
+                SUM(artifact_count) OVER (PARTITION BY facet) AS total,
+                ROW_NUMBER() OVER (PARTITION BY facet ORDER BY artifact_count DESC, value) AS facet_rank
+            FROM (
+                SELECT 'material' AS facet, {material} AS value, COUNT(*) AS artifact_count
+                FROM h JOIN {TABLES['artifacts']} a ON a.{artifact_id} = h.{artifact_id}
+                WHERE {material} <> ''
+                GROUP BY {material}
+                UNION ALL{property_facet('culture', 'culture')}
+                UNION ALL{property_facet('region', 'geography')}
+                UNION ALL
+                SELECT 'era', CONCAT({era_system}, '_', {era_bucket}), COUNT(*)
+                FROM h JOIN {TABLES['artifacts']} a ON a.{artifact_id} = h.{artifact_id}
+                WHERE {era_bucket} IS NOT NULL
+                GROUP BY {era_system}, {era_bucket}
+                UNION ALL
+                SELECT 'total', NULL, COUNT(*) FROM h
+            ) f
+        ) r
+        WHERE facet_rank <= {SEARCH_FACET_LIMIT}
+    """
+    
+    return query.strip()
+
+def build_search_documents_query(single=False):
+    """构建进程内倒排索引的文档查询SQL（字段与搜索范围一致，各字段分列返回以便按字段加权）
+    single=True 时只取一件文物（参数为 Artifact_PK），用于导入后的增量更新
+    """
+    where = f"WHERE a.{FIELDS['artifact']['id']} = %s" if single else ""
+    query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title_cn,
+            a.{FIELDS['artifact']['title_en']} AS title_en,
+            a.{FIELDS['artifact']['date_cn']} AS date_cn,
+            a.{FIELDS['artifact']['date_en']} AS date_en,
+            a.{FIELDS['artifact']['material']} AS material,
+            a.{FIELDS['artifact']['description_cn']} AS description_cn,
+            GROUP_CONCAT(p.{FIELDS['property']['culture']} SEPARATOR ' ') AS culture,
+            GROUP_CONCAT(p.{FIELDS['property']['artist']} SEPARATOR ' ') AS artist,
+            GROUP_CONCAT(p.{FIELDS['property']['geography']} SEPARATOR ' ') AS geography,
+            ANY_VALUE(s.{FIELDS['source']['museum_name_cn']}) AS museum_name
+        FROM {TABLES['artifacts']} a
+        LEFT JOIN {TABLES['properties']} p ON a.{FIELDS['artifact']['id']} = p.{FIELDS['property']['artifact_id']}
         LEFT JOIN {TABLES['sources']} s ON a.{FIELDS['artifact']['source_id']} = s.{FIELDS['source']['id']}
-        WHERE 
-            a.{FIELDS['artifact']['title_cn']} LIKE %s
-            OR a.{FIELDS['artifact']['title_en']} LIKE %s
-            OR a.{FIELDS['artifact']['date_cn']} LIKE %s
-            OR a.{FIELDS['artifact']['date_en']} LIKE %s
-            OR a.{FIELDS['artifact']['material']} LIKE %s
-            OR a.{FIELDS['artifact']['description_cn']} LIKE %s
-            OR COALESCE(p.{FIELDS['property']['artist']}, '') LIKE %s
-            OR COALESCE(p.{FIELDS['property']['culture']}, '') LIKE %s
-            OR COALESCE(p.{FIELDS['property']['geography']}, '') LIKE %s
-            OR COALESCE(s.{FIELDS['source']['museum_name_cn']}, '') LIKE %s
+        {where}
         GROUP BY a.{FIELDS['artifact']['id']}
-        ORDER BY a.{FIELDS['artifact']['id']} DESC
+    """
+    
+    return query.strip()
+
+def build_search_count_query(search_term, dialect='mysql', from_index=False, filters=None):
+    """构建筛选后搜索结果总数的查询SQL，参数与同样筛选条件的 build_search_query 相同
+    只检查前 SEARCH_COUNT_SAMPLE 条命中：返回检查的命中数 sampled 与其中符合筛选的数量 artifact_count；
+    sampled 小于 SEARCH_COUNT_SAMPLE 时 artifact_count 即精确总数，否则由调用方按比例估算
+    """
+    if not search_term:
+        return None
+    
+    hits = _search_hits(search_term, dialect, from_index)
+    conditions, _ = _search_filters(filters)
+    # 筛选条件放在 LEFT JOIN 的连接条件中：不符合的命中仍计入 sampled，但 a 为 NULL
+    matched = f"\n            AND {' AND '.join(conditions)}" if conditions else ""
+    
+    query = f"""
+        SELECT 
+            COUNT(*) AS sampled,
+            COUNT(a.{FIELDS['artifact']['id']}) AS artifact_count
+        FROM ({hits}
+            LIMIT {SEARCH_COUNT_SAMPLE}
+        ) h
+        LEFT JOIN {TABLES['artifacts']} a ON a.{FIELDS['artifact']['id']} = h.{FIELDS['artifact']['id']}{matched}
+    """
+    
+    return query.strip()
+
+# 分类统计表：PROPERTIES 中的分类字段 -> 统计表
+CATEGORY_STATS_TABLES = {
+    'culture': TABLES['culture_stats'],
+    'geography': TABLES['geography_stats'],
+}
+
+def build_category_stats_query(category='culture', position=False):
+    """构建文化 / 地理浏览页的查询SQL：按 (Artifact_Count DESC, Name) 索引顺序读取统计表
+    position=True 时只取浏览页上第 N 个分类（参数为 N - 1），用于把旧的数字地址重定向到 Slug 地址
+    """
+    stats = FIELDS['category_stats']
+    query = f"""
+        SELECT 
+            {stats['id']} AS stats_id,
+            {stats['name']} AS name,
+            {stats['slug']} AS slug,
+            {stats['artifact_count']} AS artifact_count,
+            {stats['representative_image']} AS representative_image
+        FROM {CATEGORY_STATS_TABLES[category]}
+        WHERE {stats['artifact_count']} > 0
+        ORDER BY {stats['artifact_count']} DESC, {stats['name']}
+    """
+    if position:
+        query += "LIMIT 1 OFFSET %s"
+    
+    return query.strip()
+
+def build_category_stats_rebuild_query(category='culture'):
+    """构建从 PROPERTIES 全量重建统计表的查询SQL
+    按名称写入或覆盖统计行，已有分类保留原有编号；调用方先把全部数量清零，重建后仍为 0 的分类不再显示
+    """
+    stats = FIELDS['category_stats']
+    artifact_id = FIELDS['property']['artifact_id']
+    column = f"p.{FIELDS['property'][category]}"
+    query = f"""
+        INSERT INTO {CATEGORY_STATS_TABLES[category]} ({stats['name']}, {stats['artifact_count']}, {stats['representative_image']})
+        SELECT name, artifact_count, representative_image
+        FROM (
+            SELECT 
+                {column} AS name,
+                COUNT(DISTINCT p.{artifact_id}) AS artifact_count,
+                MIN(iv.{FIELDS['image']['local_path']}) AS representative_image
+            FROM {TABLES['properties']} p
+            LEFT JOIN {TABLES['image_versions']} iv ON p.{artifact_id} = iv.{FIELDS['image']['artifact_id']}
+            WHERE {column} IS NOT NULL AND {column} != ''
+            GROUP BY {column}
+        ) counted
+        ON DUPLICATE KEY UPDATE
+            {stats['artifact_count']} = counted.artifact_count,
+            {stats['representative_image']} = counted.representative_image
+    """
+    
+    return query.strip()
+
+def _category_stats_statements(category):
+    """统计表的预处理语句：按 Slug 定位分类（详情页），以及导入时的增量更新（见 category_stats.py）"""
+    stats = FIELDS['category_stats']
+    table = CATEGORY_STATS_TABLES[category]
+    return {
+        f'{category}_stats_by_slug': f"""
+            SELECT {stats['id']} AS stats_id, {stats['name']} AS name, {stats['slug']} AS slug,
+                   {stats['artifact_count']} AS artifact_count
+            FROM {table}
+            WHERE {stats['slug']} = %s
+        """.strip(),
+        # 新分类先以 NULL Slug 插入（只会与 Name 唯一键冲突），再由 category_stats.py 按 Stats_PK 分配 Slug
+        f'{category}_stats_record': f"""
+            INSERT INTO {table} ({stats['name']}, {stats['artifact_count']}, {stats['representative_image']})
+            VALUES (%s, 1, %s)
+            ON DUPLICATE KEY UPDATE
+                {stats['artifact_count']} = {stats['artifact_count']} + 1,
+                {stats['representative_image']} = COALESCE({stats['representative_image']}, VALUES({stats['representative_image']}))
+        """.strip(),
+        f'{category}_stats_set_slug': f"""
+            UPDATE {table} SET {stats['slug']} = %s WHERE {stats['id']} = %s
+        """.strip(),
+    }
+
+def build_suggest_terms_query():
+    """构建输入提示词表的查询SQL（见 suggest_index.py）
+    返回 (field, value, artifact_count)：标题（中英文）、材质、文化与艺术家的每个取值及其文物数量
+    """
+    def artifact_terms(field, column):
+        value = f"TRIM({FIELDS['artifact'][column]})"
+        return f"""
+        SELECT '{field}' AS field, {value} AS value, COUNT(*) AS artifact_count
+        FROM {TABLES['artifacts']}
+        WHERE {value} <> ''
+        GROUP BY {value}"""
+    
+    def property_terms(field, column):
+        value = f"TRIM({FIELDS['property'][column]})"
+        return f"""
+        SELECT '{field}', {value}, COUNT(DISTINCT {FIELDS['property']['artifact_id']})
+        FROM {TABLES['properties']}
+        WHERE {value} <> ''
+        GROUP BY {value}"""
+    
+    query = f"""{artifact_terms('title', 'title_cn')}
+        UNION ALL{artifact_terms('title', 'title_en')}
+        UNION ALL{artifact_terms('material', 'material')}
+        UNION ALL{property_terms('culture', 'culture')}
+        UNION ALL{property_terms('artist', 'artist')}
     """
     
     return query.strip()
@@ -149,6 +583,235 @@ def build_culture_artifacts_query(culture_name):
     
     return query.strip()
 
+def build_category_artifacts_query(category='culture', keyset=False, year_condition=''):
+    """构建文化 / 地理目录一页文物的查询SQL（按 Artifact_PK 降序的 keyset 分页）
+    先沿 (Culture / Geography, Artifact_PK) 索引取出一页文物编号（不带年份条件时只读索引），再连接标题与图片；
+    keyset=True 时从上一页最后一件文物之后开始，翻到多深都只读取一页的索引项。
+    year_condition 为 year_overlap() 生成的 " AND ..." 条件（别名 a）
+    参数 (名称[, 上一页最后的 Artifact_PK], *年份参数, LIMIT)
+    """
+    artifact_id = FIELDS['artifact']['id']
+    property_artifact = FIELDS['property']['artifact_id']
+    column = FIELDS['property'][category]
+    join_artifacts = f"\n            JOIN {TABLES['artifacts']} a ON a.{artifact_id} = p.{property_artifact}" if year_condition else ""
+    after = f" AND p.{property_artifact} < %s" if keyset else ""
+    query = f"""
+        SELECT 
+            a.{artifact_id} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path
+        FROM (
+            SELECT DISTINCT p.{property_artifact}
+            FROM {TABLES['properties']} p{join_artifacts}
+            WHERE p.{column} = %s{after}{year_condition}
+            ORDER BY p.{property_artifact} DESC
+            LIMIT %s
+        ) pg
+        JOIN {TABLES['artifacts']} a ON a.{artifact_id} = pg.{property_artifact}
+        LEFT JOIN {TABLES['image_versions']} iv ON a.{artifact_id} = iv.{FIELDS['image']['artifact_id']}
+        GROUP BY a.{artifact_id}
+        ORDER BY a.{artifact_id} DESC
+    """
+    
+    return query.strip()
+
+def build_era_artifacts_query(keyset=False, year_condition=''):
+    """构建年代目录一页文物的查询SQL（按 Artifact_PK 降序的 keyset 分页）
+    先沿 (Era_System, Era_Bucket, Artifact_PK) 索引取出一页文物编号，再连接标题与图片；
+    keyset=True 时从上一页最后一件文物之后开始，翻到多深都只读取一页的索引项。
+    year_condition 为 year_overlap() 生成的 " AND ..." 条件（别名 a）
+    参数 (年代体系, 年代分段[, 上一页最后的 Artifact_PK], *年份参数, LIMIT)
+    """
+    artifact_id = FIELDS['artifact']['id']
+    after = f" AND a.{artifact_id} < %s" if keyset else ""
+    query = f"""
+        SELECT 
+            a.{artifact_id} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path
+        FROM (
+            SELECT a.{artifact_id}
+            FROM {TABLES['artifacts']} a
+            WHERE a.{FIELDS['artifact']['era_system']} = %s AND a.{FIELDS['artifact']['era_bucket']} = %s{after}{year_condition}
+            ORDER BY a.{artifact_id} DESC
+            LIMIT %s
+        ) pg
+        JOIN {TABLES['artifacts']} a ON a.{artifact_id} = pg.{artifact_id}
+        LEFT JOIN {TABLES['image_versions']} iv ON a.{artifact_id} = iv.{FIELDS['image']['artifact_id']}
+        GROUP BY a.{artifact_id}
+        ORDER BY a.{artifact_id} DESC
+    """
+    
+    return query.strip()
+
+# 随机浏览排序键 Shuffle_Key 的取值范围（32 位无符号随机数，见 migrations/006_add_artifact_shuffle_key.sql）
+SHUFFLE_KEY_RANGE = 2 ** 32
+
+def build_explore_query(wrapped=False):
+    """构建随机浏览一页的查询SQL：按 (Shuffle_Key, Artifact_PK) 升序取游标位置之后的 LIMIT 行，沿 idx_artifact_shuffle 读取
+    参数 (Shuffle_Key, Shuffle_Key, Artifact_PK, LIMIT)；
+    wrapped=True 时为读到末尾后从头绕回的一段，只取种子起点之前的行，参数 (Shuffle_Key, Shuffle_Key, Artifact_PK, 起点, LIMIT)
+    """
+    artifact_id = FIELDS['artifact']['id']
+    until_start = "\n              AND a.Shuffle_Key < %s" if wrapped else ""
+    query = f"""
+        SELECT 
+            a.{artifact_id} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path,
+            ANY_VALUE(pg.Shuffle_Key) AS shuffle_key
+        FROM (
+            SELECT a.{artifact_id}, a.Shuffle_Key
+            FROM {TABLES['artifacts']} a
+            WHERE (a.Shuffle_Key > %s OR (a.Shuffle_Key = %s AND a.{artifact_id} > %s)){until_start}
+            ORDER BY a.Shuffle_Key, a.{artifact_id}
+            LIMIT %s
+        ) pg
+        JOIN {TABLES['artifacts']} a ON a.{artifact_id} = pg.{artifact_id}
+        LEFT JOIN {TABLES['image_versions']} iv ON a.{artifact_id} = iv.{FIELDS['image']['artifact_id']}
+        GROUP BY a.{artifact_id}
+        ORDER BY shuffle_key, a.{artifact_id}
+    """
+    
+    return query.strip()
+
+def build_homepage_pool_query(group_field=None):
+    """构建首页背景图候选池的查询SQL（由后台任务执行，见 homepage_images.py）
+    按分组（group_field 为 PROPERTIES 的字段名，如文化、地理区域；None 时每件文物一组）各取随机排列中靠前的几张图片，
+    再按组内名次交错截取，使候选池覆盖尽量多的分组。随机排列即随机浏览的 Shuffle_Key 顺序，从给定起点开始、末尾绕回开头，
+    每次刷新换一个起点就得到不同的样本
+    参数 (起点, 每组张数, 起点, 总张数)
+    """
+    artifact_id = FIELDS['artifact']['id']
+    local_path = FIELDS['image']['local_path']
+    if group_field is None:
+        group = f"a.{artifact_id}"
+        join_properties = ""
+        group_condition = ""
+    else:
+        group = f"p.{FIELDS['property'][group_field]}"
+        join_properties = f"\n            INNER JOIN {TABLES['properties']} p ON a.{artifact_id} = p.{FIELDS['property']['artifact_id']}"
+        group_condition = f"\n                AND {group} IS NOT NULL AND {group} != ''"
+    query = f"""
+        SELECT grp, local_path
+        FROM (
+            SELECT 
+                {group} AS grp,
+                iv.{local_path} AS local_path,
+                a.Shuffle_Key AS shuffle_key,
+                ROW_NUMBER() OVER (PARTITION BY {group}
+                                   ORDER BY a.Shuffle_Key < %s, a.Shuffle_Key, iv.{FIELDS['image']['id']}) AS rn
+            FROM {TABLES['image_versions']} iv
+            INNER JOIN {TABLES['artifacts']} a ON iv.{FIELDS['image']['artifact_id']} = a.{artifact_id}{join_properties}
+            WHERE iv.{local_path} IS NOT NULL AND iv.{local_path} != ''{group_condition}
+        ) pool
+        WHERE rn <= %s
+        ORDER BY rn, shuffle_key < %s, shuffle_key
+        LIMIT %s
+    """
+    
+    return query.strip()
+
+# 首页背景图候选池：随机、文化、地理三组，键与 homepage.html 的模板变量一致
+HOMEPAGE_IMAGE_POOLS = {
+    # 随机浏览的代表性图片（每件文物一组）
+    'random_images': None,
+    # 文化浏览的代表性图片（从不同文化中抽取）
+    'culture_images': 'culture',
+    # 地理浏览的代表性图片（从不同地理区域中抽取）
+    'geography_images': 'geography',
+}
+
+HOMEPAGE_IMAGE_QUERIES = {name: build_homepage_pool_query(field) for name, field in HOMEPAGE_IMAGE_POOLS.items()}
+
+# 服务端预处理语句注册表
+# 这些语句在每个连接上只 PREPARE 一次，之后以二进制协议复用（见 db_pool.PooledConnection）
+PREPARED_STATEMENTS = {
+    # 详情页
+    'artifact_detail': build_detail_query(),
+    'artifact_images': build_images_query(),
+    'artifact_dimensions': build_dimensions_query(),
+
+    # 添加到图集
+    'artifact_exists': f"""
+        SELECT {FIELDS['artifact']['id']} FROM {TABLES['artifacts']}
+        WHERE {FIELDS['artifact']['id']} = %s
+    """.strip(),
+    'collection_exists': """
+        SELECT collection_id FROM Collections
+        WHERE album_id = %s AND artifact_id = %s
+        LIMIT 1
+    """.strip(),
+    'collection_insert': """
+        INSERT INTO Collections (album_id, artifact_id)
+        VALUES (%s, %s)
+    """.strip(),
+
+    # 元数据导入
+    'search_document': build_search_documents_query(single=True),
+    'artifact_by_source': f"""
+        SELECT {FIELDS['artifact']['id']} FROM {TABLES['artifacts']}
+        WHERE {FIELDS['artifact']['source_id']} = %s AND {FIELDS['artifact']['original_id']} = %s
+    """.strip(),
+    'artifact_insert': f"""
+        INSERT INTO {TABLES['artifacts']} (
+            Source_ID, Original_ID, Title_CN, Title_EN,
+            Description_CN, Classification, Material,
+            Date_CN, Date_EN, Start_Year, End_Year, Era_System, Era_Bucket, Shuffle_Key
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, FLOOR(RAND() * {SHUFFLE_KEY_RANGE}))
+    """.strip(),
+    'artifact_update': f"""
+        UPDATE {TABLES['artifacts']} SET
+            Title_CN = %s,
+            Title_EN = %s,
+            Description_CN = %s,
+            Classification = %s,
+            Material = %s,
+            Date_CN = %s,
+            Date_EN = %s,
+            Start_Year = %s,
+            End_Year = %s,
+            Era_System = %s,
+            Era_Bucket = %s
+        WHERE Artifact_PK = %s
+    """.strip(),
+    'property_insert': f"""
+        INSERT INTO {TABLES['properties']} (
+            Artifact_PK, Geography, Culture, Artist,
+            Credit_Line, Page_Link
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+    """.strip(),
+    'image_insert': f"""
+        INSERT INTO {TABLES['image_versions']} (
+            Artifact_PK, Version_Type, Image_Link, Local_Path
+        ) VALUES (%s, 'Original', %s, %s)
+    """.strip(),
+    'dimension_insert': f"""
+        INSERT INTO {TABLES['dimensions']} (
+            Artifact_PK, Size_Type, Size_Value, Size_Unit
+        ) VALUES (%s, %s, %s, %s)
+    """.strip(),
+    **_category_stats_statements('culture'),
+    **_category_stats_statements('geography'),
+    'log_insert': f"""
+        INSERT INTO {TABLES['logs']} (
+            Artifact_PK, Table_Name, Operation_Type,
+            User_ID, Status, Description
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+    """.strip(),
+
+    # 目录数据版本（见 catalog_version.py）
+    'catalog_version': """
+        SELECT version FROM catalog_version WHERE id = 1
+    """.strip(),
+    'catalog_version_bump': """
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1
+    """.strip(),
+}
+
 # 使用示例（可选，如果使用配置化方案）
 if __name__ == '__main__':
     print("首页查询：")
@@ -0,0 +1,42 @@
+"""
+后台刷新任务
+把耗时的派生数据重建（输入提示索引等）放到后台线程执行，不阻塞触发它的请求。
+运行中再次触发时不会并发执行，只在本次结束后补跑一次，保证最后一次触发之后的数据一定会被处理。
+"""
+
+import threading
+
+
+class BackgroundRefresher:
+    """在后台线程中执行 task；task 抛出的异常只打印，不影响下一次触发"""
+
+    def __init__(self, task, name):
+        self.task = task
+        self.name = name
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def trigger(self):
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._running = True
+        threading.Thread(target=self._loop, name=self.name, daemon=True).start()
+
+    def _loop(self):
+        while True:
+            try:
+                self.task()
+            except Exception as e:
+                print(f"Error running {self.name}: {e}")
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
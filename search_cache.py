@@ -0,0 +1,117 @@
+"""
+搜索结果缓存
+热门搜索（朝代名、材质等）反复出现，每次都要重新执行全文检索、聚合计数与结果页查询。
+这里按"规范化的关键词 + 筛选条件 + 排序 + 页码"缓存一页搜索结果（结果行、总数与筛选选项）。
+
+- 按 LRU 淘汰，条目数由 SEARCH_CACHE_SIZE 控制；条目超过 SEARCH_CACHE_TTL 秒后过期
+- 每个条目属于一个目录数据版本（见 catalog_version.py）：读到更新的版本时清空整个缓存，
+  导入或更新文物后各 worker 在下一次搜索时自动失效；从延迟较大的副本读到旧版本时不读也不写缓存
+- 只缓存查询结果，不缓存渲染后的页面，与登录状态无关
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_query(search_term):
+    """关键词规范化：合并空白、统一大小写（全文检索本身不区分大小写）"""
+    return ' '.join(search_term.split()).casefold()
+
+
+def make_key(search_term, filters, sort_by, page, page_size, index_generation=None):
+    """缓存键：筛选值去重排序，与 URL 中参数的顺序无关
+    使用进程内倒排索引时带上索引文件版本，其他 worker 更新索引后本 worker 重新加载前后的结果互不混用
+    """
+    return (
+        normalize_query(search_term),
+        tuple(sorted((name, tuple(sorted(set(values)))) for name, values in filters.items() if values)),
+        sort_by,
+        page,
+        page_size,
+        index_generation,
+    )
+
+
+class SearchResultCache:
+    """线程安全的 LRU + TTL 缓存：键 -> (结果, 写入时间)，整体属于一个数据版本"""
+
+    def __init__(self, max_entries=1000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'expired': 0, 'invalidations': 0}
+
+    def _check_version(self, version):
+        """版本更新时清空缓存；返回 version 是否为当前版本（调用方已持有锁）"""
+        if self._version is None or version > self._version:
+            if self._entries:
+                self._counters['invalidations'] += 1
+            self._entries.clear()
+            self._version = version
+        return version == self._version
+
+    def get(self, version, key):
+        with self._lock:
+            if not self._check_version(version):
+                self._counters['misses'] += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def put(self, version, key, value):
+        with self._lock:
+            if not self._check_version(version):
+                return
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), max_entries=self.max_entries,
+                        ttl=self.ttl, version=self._version)
+
+
+_cache = SearchResultCache()
+
+
+def configure(max_entries, ttl):
+    """max_entries 为 0 时关闭缓存"""
+    _cache.max_entries = max_entries
+    _cache.ttl = ttl
+
+
+def enabled():
+    return _cache.max_entries > 0
+
+
+def stats():
+    return _cache.stats()
+
+
+def lookup(version, key):
+    """取缓存结果；version 为 None（版本表不存在）时不使用缓存"""
+    if version is None or not enabled():
+        return None
+    return _cache.get(version, key)
+
+
+def store(version, key, value):
+    if version is None or not enabled():
+        return
+    _cache.put(version, key, value)
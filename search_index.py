@@ -0,0 +1,534 @@
+"""
+进程内倒排索引搜索
+索引内容与 query_builder.build_search_query 的搜索字段一致（标题、年代、材质、描述、艺术家、文化、
+地区、博物馆名称）。启用后 /search 先在内存中取得命中文物与相关度，再由数据库补全结果页，
+不再依赖 MySQL 全文检索。
+
+- 中文按单字与相邻两字切分，英文与数字按单词切分（不区分大小写，查询词按前缀匹配）
+- 倒排列表保存 (文物, 字段) 条目编号的差值与词频，较长的列表用 zlib 压缩，解码由 array / accumulate 完成
+- 增量更新写入未压缩的增量段，旧条目标记为已删除，增量段积累到一定数量后合并回压缩列表
+- 索引保存为本地文件（先写临时文件再原子替换），worker 启动时直接加载，其他 worker 写入新文件后自动重新加载
+- 打分采用按字段加权的 BM25（BM25F），查询词之间为"与"关系；字段权重见 db_config.SEARCH_FIELD_WEIGHTS
+"""
+
+import math
+import operator
+import os
+import pickle
+import re
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, compress, cycle, repeat
+
+from db_config import SEARCH_FIELD_WEIGHTS
+from query_builder import build_search_documents_query
+
+FORMAT_VERSION = 2
+
+CJK_RUN = re.compile(r'[㐀-䶿一-鿿豈-﫿]+')
+WORD = re.compile(r'[a-z0-9]+')
+
+# 倒排列表条目数达到该值才压缩，更短的列表压缩后反而更大
+COMPRESS_MIN_ENTRIES = 8
+TF_MAX = 65535
+
+# 增量段中的文物数达到该值时合并回压缩列表
+COMPACT_THRESHOLD = 1000
+
+# BM25 参数（各字段使用相同的长度归一化参数 b）
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 两次检查索引文件是否被其他 worker 更新的最小间隔（秒）
+RELOAD_CHECK_INTERVAL = 1.0
+
+# 索引字段 -> build_search_documents_query 的列；顺序即字段序号，修改后需提升 FORMAT_VERSION 并重建索引
+INDEX_FIELDS = (
+    ('title', ('title_cn', 'title_en')),
+    ('culture', ('culture',)),
+    ('artist', ('artist',)),
+    ('material', ('material',)),
+    ('date', ('date_cn', 'date_en')),
+    ('geography', ('geography',)),
+    ('description', ('description_cn',)),
+    ('museum', ('museum_name',)),
+)
+FIELD_COUNT = len(INDEX_FIELDS)
+FIELD_WEIGHTS = tuple(float(SEARCH_FIELD_WEIGHTS.get(name, 1.0)) for name, _ in INDEX_FIELDS)
+
+
+def tokenize(text):
+    """建索引用的词元：中文单字与相邻两字，英文与数字单词"""
+    text = text.lower()
+    tokens = []
+    for run in CJK_RUN.findall(text):
+        tokens.extend(run)
+        tokens.extend(map(operator.add, run, run[1:]))
+    tokens.extend(WORD.findall(text))
+    return tokens
+
+
+def query_terms(text):
+    """
+    查询用的词元：[(词元, 是否前缀匹配)]
+    中文连续两字以上只取相邻两字（已覆盖单字），英文单词按前缀匹配
+    """
+    text = text.lower()
+    terms = []
+    for run in CJK_RUN.findall(text):
+        if len(run) == 1:
+            terms.append((run, False))
+        else:
+            terms.extend((run[i:i + 2], False) for i in range(len(run) - 1))
+    terms.extend((word, True) for word in WORD.findall(text))
+    # 去重并保持顺序
+    return list(dict.fromkeys(terms))
+
+
+def document_fields(row):
+    """把 build_search_documents_query 的一行拆成按 INDEX_FIELDS 排列的各字段文本"""
+    return tuple(' '.join(str(row[column]) for column in columns if row.get(column))
+                 for _, columns in INDEX_FIELDS)
+
+
+def bm25_idf(total_docs, df):
+    return math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+
+# ========== 倒排列表编码 ==========
+# 条目编号 slot = 文物编号 * FIELD_COUNT + 字段序号，同一文物的各字段条目在列表中相邻
+
+def encode_postings(slots, tfs):
+    """slots 升序；返回首字节为标记（0 原样 / 1 zlib）的字节串"""
+    gaps = array('I', slots[:1])
+    gaps.extend(map(operator.sub, slots[1:], slots))
+    if max(tfs) > TF_MAX:
+        tfs = list(map(min, tfs, repeat(TF_MAX)))
+    data = gaps.tobytes() + array('H', tfs).tobytes()
+    if len(slots) >= COMPRESS_MIN_ENTRIES:
+        return b'\x01' + zlib.compress(data)
+    return b'\x00' + data
+
+
+def decode_postings(blob):
+    """返回 (slots, tfs)"""
+    data = zlib.decompress(blob[1:]) if blob[0] == 1 else blob[1:]
+    count = len(data) // 6
+    gaps = array('I')
+    gaps.frombytes(data[:count * 4])
+    tfs = array('H')
+    tfs.frombytes(data[count * 4:])
+    return list(accumulate(gaps)), tfs
+
+
+def field_weighted_tf(slots, tfs, norms):
+    """
+    倒排列表 -> (文物编号列表, 加权词频列表)
+    加权词频为各字段词频乘以该文物该字段的系数（字段权重 / 长度归一化）之和。
+    全部在 map / accumulate 中完成：先求加权词频的前缀和，再用每件文物最后一个条目的位置相减得到各文物的合计
+    """
+    cumulative = [0.0]
+    cumulative.extend(accumulate(map(operator.mul, tfs, map(norms.__getitem__, slots))))
+    # 文物编号 -> 该文物最后一个条目之后的位置（键保持首次出现的顺序，值被后面的条目覆盖）
+    ends = dict(zip(map(operator.floordiv, slots, repeat(FIELD_COUNT)), range(1, len(slots) + 1)))
+    doc_ids = list(ends)
+    ends = list(ends.values())
+    weighted = list(map(operator.sub, map(cumulative.__getitem__, ends),
+                        map(cumulative.__getitem__, [0] + ends[:-1])))
+    return doc_ids, weighted
+
+
+class SearchIndex:
+    """
+    倒排索引
+    查询用到的五部分（压缩列表、增量段、已删除编号、IDF 表、字段系数表）作为一个元组整体替换，查询时不加锁；
+    写操作加锁，压缩列表与增量段复制后再替换，不修改查询可能正在读取的对象
+
+    IDF 表按词元编号保存压缩列表中各词元的 IDF；字段系数表按条目编号保存 字段权重 / (1 - b + b * 字段长度 / 平均长度)。
+    两者在构建、合并与加载时按当前文档数与平均长度整体重算，增量更新只写入被更新文物的字段系数
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # (词元 -> 压缩列表, 词元 -> {条目编号: 词频}, 压缩列表中已失效的文物编号, IDF 表, 字段系数表)
+        self._segments = ({}, {}, frozenset(), array('d'), array('d'))
+        self._doc_terms = {}        # 压缩列表中的文物 -> 词元编号数组（合并时据此删除旧条目）
+        self._delta_terms = {}      # 增量段中的文物 -> 词元
+        self._terms = []            # 词元编号 -> 词元
+        self._term_ids = {}
+        self._doc_freq = array('I')  # 词元编号 -> 压缩列表中包含该词元的文物数
+        self._field_len = array('I')  # 条目编号 -> 该字段的词元数
+        self._field_total = [0] * FIELD_COUNT
+        self._doc_count = 0
+        self._vocabulary = None     # 排序后的词表，前缀匹配时按需生成
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._last_check = 0.0
+        self.ready = False
+        self.last_build = None
+
+    # ---------- 统计表 ----------
+
+    def _averages(self):
+        total_docs = self._doc_count or 1
+        return [total / total_docs or 1 for total in self._field_total]
+
+    def _tables(self):
+        """按当前文档数与各字段平均长度重算 (IDF 表, 字段系数表)（调用方已持有锁）"""
+        total_docs = self._doc_count
+        idf = array('d', (bm25_idf(total_docs, df) for df in self._doc_freq))
+        scales = [BM25_B / average for average in self._averages()]
+        norms = array('d', map(operator.truediv, cycle(FIELD_WEIGHTS),
+                               map(operator.add, repeat(1 - BM25_B),
+                                   map(operator.mul, self._field_len, cycle(scales)))))
+        return idf, norms
+
+    # ---------- 构建与增量更新 ----------
+
+    def build(self, documents):
+        """由 (文物编号, 各字段文本) 全量构建；完成后整体替换当前索引"""
+        lists = {}
+        doc_freq = Counter()
+        doc_term_keys = {}
+        lengths = {}
+        for doc_id, fields in sorted(documents):
+            base = doc_id * FIELD_COUNT
+            terms = {}
+            field_lengths = []
+            for field, text in enumerate(fields):
+                counts = Counter(tokenize(text)) if text else Counter()
+                for term, tf in counts.items():
+                    entry = lists.get(term)
+                    if entry is None:
+                        lists[term] = entry = ([], [])
+                    entry[0].append(base + field)
+                    entry[1].append(tf)
+                terms.update(dict.fromkeys(counts))
+                field_lengths.append(sum(counts.values()))
+            doc_freq.update(terms.keys())
+            doc_term_keys[doc_id] = terms
+            lengths[doc_id] = field_lengths
+
+        postings = {term: encode_postings(slots, tfs) for term, (slots, tfs) in lists.items()}
+        terms = list(postings)
+        term_ids = {term: i for i, term in enumerate(terms)}
+        doc_terms = {doc_id: array('I', map(term_ids.__getitem__, keys)).tobytes()
+                     for doc_id, keys in doc_term_keys.items()}
+        field_len = array('I', bytes(4 * FIELD_COUNT * (max(lengths, default=-1) + 1)))
+        for doc_id, field_lengths in lengths.items():
+            field_len[doc_id * FIELD_COUNT:(doc_id + 1) * FIELD_COUNT] = array('I', field_lengths)
+
+        with self._lock:
+            self._doc_terms = doc_terms
+            self._delta_terms = {}
+            self._terms = terms
+            self._term_ids = term_ids
+            self._doc_freq = array('I', map(doc_freq.__getitem__, terms))
+            self._field_len = field_len
+            self._field_total = [sum(field_len[field::FIELD_COUNT]) for field in range(FIELD_COUNT)]
+            self._doc_count = len(doc_terms)
+            self._segments = (postings, {}, frozenset(), *self._tables())
+            self._vocabulary = None
+            self.ready = True
+
+    def update(self, doc_id, fields):
+        """新增或更新一件文物：写入增量段，压缩列表中的旧条目标记为已删除"""
+        base = doc_id * FIELD_COUNT
+        field_counts = [Counter(tokenize(text)) if text else Counter() for text in fields]
+        entries_by_term = {}
+        for field, counts in enumerate(field_counts):
+            for term, tf in counts.items():
+                entries_by_term.setdefault(term, {})[base + field] = tf
+
+        with self._lock:
+            postings, delta, deleted, idf, norms = self._segments
+            is_new = doc_id not in self._doc_terms and doc_id not in self._delta_terms
+            delta = dict(delta)
+            for term in self._delta_terms.pop(doc_id, ()):
+                entries = {slot: tf for slot, tf in delta[term].items() if slot // FIELD_COUNT != doc_id}
+                if entries:
+                    delta[term] = entries
+                else:
+                    del delta[term]
+            for term, entries in entries_by_term.items():
+                if term not in postings and term not in delta:
+                    self._vocabulary = None
+                delta[term] = {**delta.get(term, {}), **entries}
+            if doc_id in self._doc_terms:
+                deleted = deleted | {doc_id}
+
+            self._delta_terms[doc_id] = tuple(entries_by_term)
+            self._doc_count += is_new
+            missing = base + FIELD_COUNT - len(self._field_len)
+            if missing > 0:
+                self._field_len.extend(repeat(0, missing))
+                norms.extend(repeat(0.0, missing))
+            for field, counts in enumerate(field_counts):
+                length = sum(counts.values())
+                self._field_total[field] += length - self._field_len[base + field]
+                self._field_len[base + field] = length
+            for field, average in enumerate(self._averages()):
+                norms[base + field] = FIELD_WEIGHTS[field] / (
+                    1 - BM25_B + BM25_B * self._field_len[base + field] / average)
+            self._segments = (postings, delta, deleted, idf, norms)
+
+            if len(self._delta_terms) >= COMPACT_THRESHOLD:
+                self._compact()
+
+    def compact(self):
+        """把增量段合并回压缩列表"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        postings, delta, deleted, _, _ = self._segments
+        if not delta and not deleted:
+            return
+
+        # 受影响的词元：增量段中的词元，以及已删除文物在压缩列表中的旧词元
+        affected = set(delta)
+        for doc_id in deleted:
+            old_ids = array('I')
+            old_ids.frombytes(self._doc_terms.pop(doc_id))
+            affected.update(self._terms[i] for i in old_ids)
+
+        for doc_id, terms in self._delta_terms.items():
+            for term in terms:
+                if term not in self._term_ids:
+                    self._term_ids[term] = len(self._terms)
+                    self._terms.append(term)
+                    self._doc_freq.append(0)
+            self._doc_terms[doc_id] = array('I', map(self._term_ids.__getitem__, terms)).tobytes()
+
+        postings = dict(postings)
+        for term in affected:
+            entries = {}
+            if term in postings:
+                slots, tfs = decode_postings(postings[term])
+                entries = {slot: tf for slot, tf in zip(slots, tfs) if slot // FIELD_COUNT not in deleted}
+            entries.update(delta.get(term, {}))
+            if entries:
+                ordered = sorted(entries)
+                postings[term] = encode_postings(ordered, [entries[slot] for slot in ordered])
+            else:
+                postings.pop(term, None)
+            self._doc_freq[self._term_ids[term]] = len(set(map(operator.floordiv, entries, repeat(FIELD_COUNT))))
+
+        self._delta_terms = {}
+        self._segments = (postings, {}, frozenset(), *self._tables())
+        self._vocabulary = None
+
+    def index_artifacts(self, conn, artifact_ids):
+        """从数据库读取指定文物的最新内容并增量更新（在写入事务提交之后调用）"""
+        for artifact_id in artifact_ids:
+            rows = conn.query_prepared('search_document', (artifact_id,))
+            if rows:
+                self.update(artifact_id, document_fields(rows[0]))
+
+    def rebuild(self, conn):
+        """从数据库全量重建并保存"""
+        started = time.monotonic()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(build_search_documents_query())
+            self.build((row['artifact_id'], document_fields(row)) for row in cursor)
+        finally:
+            cursor.close()
+        self.save()
+        self.last_build = {
+            'documents': self._doc_count,
+            'terms': len(self._segments[0]),
+            'seconds': round(time.monotonic() - started, 2),
+        }
+        return self.last_build
+
+    # ---------- 查询 ----------
+
+    def search(self, text):
+        """返回 [(文物编号, 得分)]，按得分降序；查询中没有可用词元时返回空列表"""
+        terms = query_terms(text)
+        if not terms:
+            return []
+        postings, delta, deleted, idf_table, norms = self._segments
+        total_docs = self._doc_count
+
+        # 每个查询词元对应一组词元（前缀匹配时为多个）；每个词元：(文档频率, IDF, [(编号列表, 加权词频列表, 已失效编号)])
+        groups = []
+        for term, prefix in terms:
+            group = []
+            for t in (self._expand(term) if prefix else [term]):
+                lists = []
+                df = 0
+                stale = frozenset()
+                if t in postings:
+                    doc_ids, tfs = field_weighted_tf(*decode_postings(postings[t]), norms)
+                    stale = deleted.intersection(doc_ids) if deleted else frozenset()
+                    lists.append((doc_ids, tfs, stale))
+                    df += len(doc_ids) - len(stale)
+                if t in delta:
+                    entries = delta[t]
+                    slots = sorted(entries)
+                    doc_ids, tfs = field_weighted_tf(slots, list(map(entries.__getitem__, slots)), norms)
+                    lists.append((doc_ids, tfs, frozenset()))
+                    df += len(doc_ids)
+                if not df:
+                    continue
+                # 压缩列表没有变化的词元直接查 IDF 表
+                if t in delta or stale:
+                    idf = bm25_idf(total_docs, df)
+                else:
+                    idf = idf_table[self._term_ids[t]]
+                group.append((df, idf, lists))
+            if not group:
+                return []
+            groups.append(group)
+
+        # 从命中最少的一组开始求交集
+        groups.sort(key=lambda group: sum(df for df, _, _ in group))
+        candidates = None
+        for group in groups:
+            ids = set()
+            for _, _, lists in group:
+                for doc_ids, _, stale in lists:
+                    # 只去掉本列表中已删除的条目：前缀展开的另一个词元可能在增量段中命中同一件文物
+                    ids.update(set(doc_ids) - stale if stale else doc_ids)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        # BM25F：每个词元得分 idf * (k1 + 1) * tf / (k1 + tf)，tf 为加权词频（已含长度归一化）
+        scores = dict.fromkeys(candidates, 0.0)
+        for group in groups:
+            for _, idf, lists in group:
+                for doc_ids, tfs, stale in lists:
+                    live = candidates - stale if stale else candidates
+                    keep = list(map(live.__contains__, doc_ids))
+                    doc_ids = list(compress(doc_ids, keep))
+                    tfs = list(compress(tfs, keep))
+                    gains = map(operator.truediv, map(operator.mul, tfs, repeat(idf * (BM25_K1 + 1))),
+                                map(operator.add, tfs, repeat(BM25_K1)))
+                    # 同一列表中文物编号不重复，可以整体写回
+                    scores.update(zip(doc_ids, map(operator.add, map(scores.__getitem__, doc_ids), gains)))
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+    def _expand(self, prefix):
+        """词表中以 prefix 开头的全部词元"""
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            with self._lock:
+                postings, delta = self._segments[:2]
+                vocabulary = self._vocabulary = sorted(set(postings) | set(delta))
+        matched = []
+        for term in vocabulary[bisect_left(vocabulary, prefix):]:
+            if not term.startswith(prefix):
+                break
+            matched.append(term)
+        return matched
+
+    # ---------- 持久化 ----------
+
+    def save(self):
+        """写入临时文件后原子替换"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            postings, delta, deleted, _, _ = self._segments
+            state = {
+                'format': FORMAT_VERSION,
+                'postings': postings,
+                'delta': delta,
+                'deleted': deleted,
+                'doc_terms': self._doc_terms,
+                'delta_terms': self._delta_terms,
+                'terms': self._terms,
+                'doc_freq': self._doc_freq,
+                'field_len': self._field_len,
+                'doc_count': self._doc_count,
+            }
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._loaded_mtime = os.path.getmtime(self.path)
+
+    def load(self):
+        """加载索引文件；文件不存在或格式不符时返回 False"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            if os.path.exists(self.path):
+                print(f"Error loading search index: {e}")
+            return False
+        if state.get('format') != FORMAT_VERSION:
+            print(f"Search index format {state.get('format')} is outdated, rebuild required")
+            return False
+
+        with self._lock:
+            self._doc_terms = state['doc_terms']
+            self._delta_terms = state['delta_terms']
+            self._terms = state['terms']
+            self._term_ids = {term: i for i, term in enumerate(self._terms)}
+            self._doc_freq = state['doc_freq']
+            self._field_len = state['field_len']
+            self._field_total = [sum(self._field_len[field::FIELD_COUNT]) for field in range(FIELD_COUNT)]
+            self._doc_count = state['doc_count']
+            self._segments = (state['postings'], state['delta'], state['deleted'], *self._tables())
+            self._vocabulary = None
+            self._loaded_mtime = mtime
+            self.ready = True
+        return True
+
+    def reload_if_changed(self):
+        """索引文件被其他 worker 更新后重新加载（最多每秒检查一次）"""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    @property
+    def generation(self):
+        """当前内容对应的索引文件版本（修改时间），保存或重新加载后改变"""
+        return self._loaded_mtime
+
+    def stats(self):
+        postings = self._segments[0]
+        return {
+            'path': self.path,
+            'ready': self.ready,
+            'documents': self._doc_count,
+            'terms': len(postings),
+            'postings_kb': round(sum(len(blob) for blob in postings.values()) / 1024, 1),
+            'pending_updates': len(self._delta_terms),
+            'last_build': self.last_build,
+        }
+
+
+_index = None
+
+
+def use_index(index):
+    """启用内存索引搜索（启动时加载索引文件；文件不存在时搜索仍走数据库，直到执行 build-search-index）"""
+    global _index
+    _index = index
+    if index is not None:
+        index.load()
+
+
+def get_index():
+    """可用于查询与增量更新的索引；未启用或尚未构建时返回 None"""
+    if _index is None:
+        return None
+    _index.reload_if_changed()
+    return _index if _index.ready else None
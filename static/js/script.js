@@ -72,5 +72,111 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
             }
         });
+
+        // 输入提示：按键停顿后请求 /api/suggest，结果填入 datalist
+        const suggestions = document.createElement('datalist');
+        suggestions.id = 'search-suggestions';
+        searchForm.appendChild(suggestions);
+        searchInput.setAttribute('list', suggestions.id);
+        searchInput.setAttribute('autocomplete', 'off');
+
+        let suggestTimer = null;
+        let lastPrefix = '';
+        searchInput.addEventListener('input', function() {
+            const prefix = this.value.trim();
+            clearTimeout(suggestTimer);
+            if (!prefix || prefix === lastPrefix) return;
+            suggestTimer = setTimeout(function() {
+                lastPrefix = prefix;
+                fetch('/api/suggest?q=' + encodeURIComponent(prefix))
+                    .then(response => response.json())
+                    .then(data => {
+                        if (data.q.trim() !== searchInput.value.trim()) return;
+                        suggestions.innerHTML = '';
+                        data.suggestions.forEach(item => {
+                            const option = document.createElement('option');
+                            option.value = item.text;
+                            option.label = `${item.count} 件`;
+                            suggestions.appendChild(option);
+                        });
+                    })
+                    .catch(() => {});
+            }, 120);
+        });
     }
-});
\ No newline at end of file
+});
+// 目录页无限滚动："加载更多"进入视口时请求 data-api，把下一页卡片追加到网格末尾
+document.addEventListener('DOMContentLoaded', function() {
+    const loadMore = document.querySelector('.load-more[data-api]');
+    const grid = document.querySelector('.catalog-grid');
+    if (!loadMore || !grid || !('IntersectionObserver' in window)) return;
+
+    function buildCard(item) {
+        const card = document.createElement('a');
+        card.className = 'card';
+        card.href = `/artifact/${item.id}`;
+
+        const wrapper = document.createElement('div');
+        wrapper.className = 'card-image-wrapper';
+        if (item.thumbnail) {
+            const img = document.createElement('img');
+            img.className = 'card-image';
+            img.src = item.thumbnail;
+            img.alt = item.title || '';
+            img.loading = 'lazy';
+            wrapper.appendChild(img);
+        } else {
+            const placeholder = document.createElement('div');
+            placeholder.className = 'card-image';
+            placeholder.style.cssText = 'display:flex;align-items:center;justify-content:center;color:#999;';
+            placeholder.textContent = '暂无图片';
+            wrapper.appendChild(placeholder);
+        }
+
+        const info = document.createElement('div');
+        info.className = 'card-info';
+        const title = document.createElement('div');
+        title.className = 'card-title';
+        title.textContent = item.title || '未命名文物';
+        const date = document.createElement('div');
+        date.className = 'card-date';
+        date.textContent = item.date || '年代未知';
+        info.appendChild(title);
+        info.appendChild(date);
+
+        card.appendChild(wrapper);
+        card.appendChild(info);
+        return card;
+    }
+
+    let loading = false;
+    const observer = new IntersectionObserver(function(entries) {
+        if (loading || !entries.some(entry => entry.isIntersecting)) return;
+        loading = true;
+        fetch(loadMore.dataset.api)
+            .then(response => {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then(data => {
+                data.results.forEach(item => grid.appendChild(buildCard(item)));
+                if (data.next_url) {
+                    // 页面地址与接口地址只差路径前缀，翻页参数相同
+                    loadMore.dataset.api = data.next_url;
+                    loadMore.href = loadMore.href.split('?')[0] + data.next_url.slice(data.next_url.indexOf('?'));
+                    // 重新观察：追加后链接仍在视口内时继续加载
+                    observer.unobserve(loadMore);
+                    observer.observe(loadMore);
+                } else {
+                    observer.disconnect();
+                    loadMore.parentNode.remove();
+                }
+                loading = false;
+            })
+            .catch(() => {
+                // 接口出错时停止自动加载，保留链接按页翻看
+                observer.disconnect();
+            });
+    }, { rootMargin: '400px' });
+    observer.observe(loadMore);
+});
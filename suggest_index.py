@@ -0,0 +1,210 @@
+"""
+搜索框输入提示（/api/suggest）
+词表为标题（中英文）、文化、艺术家与材质的全部取值及其文物数量，按规范化后的文本排序保存在内存中，
+前缀查询用 bisect 定位区间，按文物数量取前几项。请求处理只读内存，不访问数据库。
+
+- 覆盖条目较多的前缀（如单个汉字、单个字母）在构建时预先算好排名，其余前缀的区间很小，直接扫描
+- 词表保存为本地文件（先写临时文件再原子替换），worker 启动时加载，其他 worker 写入新文件后自动重新加载
+- 元数据导入后在后台线程中从主库重建（见 refresher.py）；也可执行 flask --app app build-suggest-index
+"""
+
+import heapq
+import os
+import pickle
+import threading
+import time
+from bisect import bisect_left
+
+import catalog_version
+import db_pool
+from query_builder import build_suggest_terms_query
+from refresher import BackgroundRefresher
+
+FORMAT_VERSION = 1
+
+# 区间条目数超过该值的前缀在构建时预先计算排名
+HOT_PREFIX_MIN = 256
+
+# 预先计算的排名长度（不小于接口允许的最大条数，留出同名去重的余量）
+MAX_SUGGESTIONS = 20
+RANKED_PER_PREFIX = MAX_SUGGESTIONS * 2
+
+# 区间上界：拼在前缀后面，大于任何以该前缀开头的文本
+PREFIX_END = chr(0x10ffff)
+
+# 两次检查词表文件是否被其他 worker 更新的最小间隔（秒）
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def normalize(text):
+    """合并空白、统一大小写；查询与词表使用相同的规范化"""
+    return ' '.join((text or '').split()).casefold()
+
+
+def _rank(entry):
+    # 文物数量多的在前，数量相同时短的在前
+    text, _, count = entry
+    return (-count, len(text), text)
+
+
+class SuggestIndex:
+    """
+    前缀提示词表
+    keys 为规范化文本（升序），entries 为对应的 (原文, 字段, 文物数量)；
+    hot 为热门前缀 -> 排好序的条目下标
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._state = ([], [], {})
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._last_check = 0.0
+        self.last_build = None
+        self._refresher = BackgroundRefresher(self.rebuild_from_primary, 'suggest-index-rebuild')
+
+    # ---------- 构建 ----------
+
+    def build(self, rows):
+        """rows: [(field, value, artifact_count)]"""
+        merged = {}
+        for field, value, count in rows:
+            text = ' '.join(str(value).split())
+            key = normalize(text)
+            if not key:
+                continue
+            # 同一文本出现在多个字段时（如材质与标题都是"青铜"）保留数量最多的一条
+            current = merged.get(key)
+            if current is None or count > current[2]:
+                merged[key] = (text, field, int(count))
+
+        keys = sorted(merged)
+        entries = [merged[key] for key in keys]
+        hot = self._hot_prefixes(keys, entries)
+        with self._lock:
+            self._state = (keys, entries, hot)
+
+    @staticmethod
+    def _hot_prefixes(keys, entries):
+        """找出区间条目数超过 HOT_PREFIX_MIN 的全部前缀，逐层向下展开，只在这些区间内查找下一层"""
+        hot = {}
+        frontier = [('', 0, len(keys))]
+        while frontier:
+            next_frontier = []
+            for prefix, lo, hi in frontier:
+                if prefix:
+                    ranked = heapq.nsmallest(RANKED_PER_PREFIX, range(lo, hi), key=lambda i: _rank(entries[i]))
+                    hot[prefix] = ranked
+                depth = len(prefix)
+                i = lo
+                while i < hi:
+                    if len(keys[i]) == depth:
+                        i += 1
+                        continue
+                    child = keys[i][:depth + 1]
+                    j = bisect_left(keys, child + PREFIX_END, i, hi)
+                    if j - i > HOT_PREFIX_MIN:
+                        next_frontier.append((child, i, j))
+                    i = j
+            frontier = next_frontier
+        return hot
+
+    def rebuild(self, conn):
+        """从数据库读取词表并重建、保存"""
+        started = time.monotonic()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(build_suggest_terms_query())
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        self.build(rows)
+        self.save()
+        keys, _, hot = self._state
+        self.last_build = {
+            'terms': len(keys),
+            'hot_prefixes': len(hot),
+            'catalog_version': catalog_version.current(conn),
+            'seconds': round(time.monotonic() - started, 2),
+        }
+        return self.last_build
+
+    def rebuild_from_primary(self):
+        conn = db_pool.get_router().connect_primary()
+        try:
+            return self.rebuild(conn)
+        finally:
+            conn.close()
+
+    def refresh_async(self):
+        """在后台线程中从主库重建，不阻塞导入请求"""
+        self._refresher.trigger()
+
+    # ---------- 查询 ----------
+
+    def suggest(self, text, limit=8):
+        """返回以 text 开头的提示 [(原文, 字段, 文物数量)]，按文物数量降序"""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        keys, entries, hot = self._state
+        ranked = hot.get(prefix)
+        if ranked is None:
+            lo = bisect_left(keys, prefix)
+            hi = bisect_left(keys, prefix + PREFIX_END, lo)
+            ranked = sorted(range(lo, hi), key=lambda i: _rank(entries[i]))
+        return [entries[i] for i in ranked[:limit]]
+
+    # ---------- 持久化 ----------
+
+    def save(self):
+        """写入临时文件后原子替换"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        keys, entries, hot = self._state
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'format': FORMAT_VERSION, 'keys': keys, 'entries': entries, 'hot': hot},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._loaded_mtime = os.path.getmtime(self.path)
+
+    def load(self):
+        """加载词表文件；文件不存在或格式不符时返回 False"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            if os.path.exists(self.path):
+                print(f"Error loading suggest index: {e}")
+            return False
+        if state.get('format') != FORMAT_VERSION:
+            print(f"Suggest index format {state.get('format')} is outdated, rebuild required")
+            return False
+        with self._lock:
+            self._state = (state['keys'], state['entries'], state['hot'])
+            self._loaded_mtime = mtime
+        return True
+
+    def reload_if_changed(self):
+        """词表文件被其他 worker 更新后重新加载（最多每秒检查一次）"""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def stats(self):
+        keys, _, hot = self._state
+        return {
+            'path': self.path,
+            'terms': len(keys),
+            'hot_prefixes': len(hot),
+            'refreshing': self._refresher.running,
+            'last_build': self.last_build,
+        }
@@ -0,0 +1,88 @@
+"""
+测试共用的假 MySQL 连接：替换 mysql.connector.connect，不需要数据库服务
+"""
+
+import mysql.connector
+import pytest
+from mysql.connector import Error
+
+
+class FakeCursor:
+    def __init__(self, conn, prepared=False):
+        self.conn = conn
+        self.prepared = prepared
+        self.executed = []
+        self.rowcount = 0
+        self.lastrowid = None
+        self.closed = False
+
+    def execute(self, sql, params=()):
+        if self.conn.fail_queries:
+            raise Error(msg='query failed')
+        self.executed.append((sql, params))
+        self.rowcount = 1
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRawConnection:
+    """记录调用的假连接；fail_ping / fail_rollback / fail_queries 模拟连接失效"""
+
+    def __init__(self, **config):
+        self.config = config
+        self.closed = False
+        self.rollbacks = 0
+        self.commits = 0
+        self.cursors = []
+        self.fail_ping = False
+        self.fail_rollback = False
+        self.fail_queries = False
+
+    def cursor(self, prepared=False, dictionary=False):
+        cursor = FakeCursor(self, prepared)
+        self.cursors.append(cursor)
+        return cursor
+
+    def ping(self, reconnect=False):
+        if self.fail_ping:
+            raise Error(msg='ping failed')
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise Error(msg='rollback failed')
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeMySQL:
+    """mysql.connector.connect 的替身；down=True 时连接失败"""
+
+    def __init__(self):
+        self.connections = []
+        self.down = False
+
+    def connect(self, **config):
+        if self.down:
+            raise Error(msg="Can't connect to MySQL server")
+        conn = FakeRawConnection(**config)
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.fixture
+def fake_mysql(monkeypatch):
+    fake = FakeMySQL()
+    monkeypatch.setattr(mysql.connector, 'connect', fake.connect)
+    return fake
@@ -0,0 +1,81 @@
+"""
+category_stats 的 Slug 生成与分配（统计表在 SQLite 内存库上）
+运行：python -m pytest -q tests
+"""
+
+import sqlite3
+
+import pytest
+
+import category_stats
+from category_stats import SLUG_MAX_LENGTH, slugify, unique_slug
+from query_builder import PREPARED_STATEMENTS
+
+
+class StatsConnection:
+    """只实现 category_stats 用到的连接接口"""
+
+    def __init__(self):
+        self.db = sqlite3.connect(':memory:')
+        for table in ('CULTURE_STATS', 'GEOGRAPHY_STATS'):
+            self.db.execute(f"CREATE TABLE {table} (Stats_PK INTEGER PRIMARY KEY, Name TEXT UNIQUE, "
+                            f"Slug TEXT UNIQUE, Artifact_Count INT DEFAULT 0, Representative_Image TEXT)")
+
+    def execute_prepared(self, name, params=()):
+        return self.db.execute(PREPARED_STATEMENTS[name].replace('%s', '?'), params)
+
+    def query_prepared(self, name, params=()):
+        return self.execute_prepared(name, params).fetchall()
+
+    def cursor(self):
+        return self.db.cursor()
+
+    def add(self, name, slug=None):
+        return self.db.execute("INSERT INTO CULTURE_STATS (Name, Slug) VALUES (?, ?)", (name, slug)).lastrowid
+
+    def slugs(self):
+        return dict(self.db.execute("SELECT Name, Slug FROM CULTURE_STATS"))
+
+
+@pytest.fixture
+def conn():
+    conn = StatsConnection()
+    yield conn
+    conn.db.close()
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Ming Dynasty', 'ming-dynasty'),
+    ('  Qing, (1644–1911) ', 'qing-1644-1911'),
+    ('Han_Dynasty', 'han-dynasty'),
+    ('商文化', '商文化'),
+    ('唐 / 五代', '唐-五代'),
+    # 全为数字时加上分类前缀，与旧的数字地址区分
+    ('1900', 'culture-1900'),
+    ('!!!', 'culture'),
+])
+def test_slugify(name, expected):
+    assert slugify('culture', name) == expected
+
+
+def test_slugify_leaves_room_for_suffix():
+    slug = slugify('geography', 'a' * 300)
+    assert len(slug) + len('-2147483647') <= SLUG_MAX_LENGTH
+
+
+def test_unique_slug_appends_stats_pk_on_clash(conn):
+    conn.add('Ming', 'ming')
+    stats_id = conn.add('MING')
+    # 与 migrations/008 相同的后缀规则
+    assert unique_slug(conn, 'culture', 'MING', stats_id) == f"ming-{stats_id}"
+    assert unique_slug(conn, 'culture', 'Qing', stats_id) == 'qing'
+
+
+def test_assign_missing_slugs(conn):
+    conn.add('Ming', 'ming')
+    new_ids = [conn.add('ming!'), conn.add('Song')]
+
+    assert category_stats.assign_missing_slugs(conn, 'culture') == 2
+    assert conn.slugs() == {'Ming': 'ming', 'ming!': f"ming-{new_ids[0]}", 'Song': 'song'}
+    # 已分配的 Slug 不再改变
+    assert category_stats.assign_missing_slugs(conn, 'culture') == 0
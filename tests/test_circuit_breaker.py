@@ -0,0 +1,108 @@
+"""
+db_pool.CircuitBreaker 的状态转换，以及连接池、请求连接与熔断器的配合
+运行：python -m pytest -q tests
+"""
+
+import pytest
+from flask import Flask
+
+import db_pool
+from db_pool import CircuitBreaker, CircuitOpenError, ConnectionPool, DatabaseRouter, PoolTimeoutError
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.stats()['opened'] == 1
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0)
+    for _ in range(5):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.stats()['opened'] == 2
+    # reset_timeout=0：重新 open 后立即可以再探测一次
+    assert breaker.allow()
+
+
+def test_release_probe_lets_next_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_pool_opens_breaker_when_database_is_down(fake_mysql):
+    pool = ConnectionPool({'host': 'db'}, read_timeout=0, breaker_threshold=2, breaker_reset=60)
+    fake_mysql.down = True
+    for _ in range(2):
+        with pytest.raises(db_pool.Error):
+            pool.connect()
+
+    with pytest.raises(CircuitOpenError):
+        pool.connect()
+    # 熔断期间不再尝试连接
+    assert pool.stats()['breaker']['rejected'] == 1
+
+
+def test_pool_timeout_is_not_a_database_failure(fake_mysql):
+    pool = ConnectionPool({'host': 'db'}, pool_size=1, max_overflow=0, timeout=0, read_timeout=0,
+                          breaker_threshold=1, breaker_reset=0)
+    pool.connect()
+    # 让熔断器进入 half_open，等待连接池超时的请求占用探测名额
+    pool.breaker.record_failure()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert pool.breaker.stats()['consecutive_failures'] == 1
+    # 超时后归还探测名额，下一个请求仍可探测
+    assert pool.breaker.allow()
+
+
+def test_failed_connect_is_remembered_for_the_request(fake_mysql):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    pool = ConnectionPool({'host': 'db'}, read_timeout=0, breaker_threshold=10)
+    db_pool.init_app(app, DatabaseRouter(pool))
+    db_pool.use_snapshot(None)
+    fake_mysql.down = True
+
+    with app.test_request_context('/'):
+        assert db_pool.get_db_connection() is None
+        # 同一请求内不再重试（如 stale_fallback 与路由先后取连接）
+        assert db_pool.get_db_connection() is None
+    assert pool.stats()['breaker']['consecutive_failures'] == 1
@@ -0,0 +1,110 @@
+"""
+db_pool.ConnectionPool 的取用 / 归还，以及 get_db_connection() 按请求复用连接
+运行：python -m pytest -q tests
+"""
+
+import pytest
+from flask import Flask, g, session
+
+import db_pool
+from db_pool import ConnectionPool, DatabaseRouter, PoolTimeoutError
+
+
+def make_pool(**options):
+    options.setdefault('read_timeout', 0)
+    return ConnectionPool({'host': 'db'}, **options)
+
+
+@pytest.fixture
+def app(fake_mysql):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    db_pool.init_app(app, DatabaseRouter(make_pool(pool_size=2, max_overflow=0, timeout=0)))
+    db_pool.use_snapshot(None)
+    return app
+
+
+def test_released_connection_is_reused(fake_mysql):
+    pool = make_pool(pool_size=1)
+    conn = pool.connect()
+    conn.close()
+
+    assert pool.connect() is conn
+    assert len(fake_mysql.connections) == 1
+    # 归还时回滚残留事务
+    assert fake_mysql.connections[0].rollbacks == 1
+
+
+def test_overflow_connections_are_closed_on_release(fake_mysql):
+    pool = make_pool(pool_size=1, max_overflow=1)
+    first, second = pool.connect(), pool.connect()
+    first.close()
+    second.close()
+
+    stats = pool.stats()
+    assert (stats['total'], stats['idle'], stats['checked_out']) == (1, 1, 0)
+    assert stats['peak_checked_out'] == 2
+    assert fake_mysql.connections[1].closed
+
+
+def test_exhausted_pool_times_out(fake_mysql):
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=0)
+    pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_failed_ping_replaces_connection(fake_mysql):
+    pool = make_pool(pool_size=1)
+    conn = pool.connect()
+    conn.close()
+    fake_mysql.connections[0].fail_ping = True
+
+    replacement = pool.connect()
+    assert replacement is not conn
+    assert fake_mysql.connections[0].closed
+    assert pool.stats()['ping_failures'] == 1
+    assert pool.stats()['total'] == 1
+
+
+def test_connection_that_fails_rollback_is_discarded(fake_mysql):
+    pool = make_pool(pool_size=1)
+    conn = pool.connect()
+    fake_mysql.connections[0].fail_rollback = True
+    conn.close()
+
+    assert pool.stats()['idle'] == 0
+    assert pool.stats()['discarded'] == 1
+    assert fake_mysql.connections[0].closed
+
+
+def test_request_reuses_one_connection_and_teardown_releases_it(app, fake_mysql):
+    pool = db_pool.get_router().primary
+    with app.test_request_context('/'):
+        conn = db_pool.get_db_connection()
+        conn.close()
+        assert db_pool.get_db_connection() is conn
+        assert pool.stats()['checked_out'] == 1
+        app.do_teardown_request()
+
+    assert pool.stats()['checked_out'] == 0
+    assert pool.stats()['idle'] == 1
+    assert len(fake_mysql.connections) == 1
+
+
+def test_commit_on_primary_marks_request_and_session(app, fake_mysql):
+    with app.test_request_context('/'):
+        db_pool.get_db_connection().commit()
+        assert g._db_wrote
+        assert session['_db_last_write'] > 0
+        app.do_teardown_request()
+
+
+def test_connection_outside_request_is_returned_on_close(app, fake_mysql):
+    pool = db_pool.get_router().primary
+    conn = db_pool.get_db_connection()
+    assert pool.stats()['checked_out'] == 1
+    conn.close()
+    assert pool.stats()['checked_out'] == 0
@@ -0,0 +1,71 @@
+"""
+PooledConnection.execute_prepared：每个连接上的语句只 PREPARE 一次，出错后重新 PREPARE
+运行：python -m pytest -q tests
+"""
+
+import pytest
+from mysql.connector import Error
+
+import db_pool
+from db_pool import ConnectionPool
+from query_builder import PREPARED_STATEMENTS
+
+db_pool.register_statements({'test_lookup': "SELECT 1 FROM ARTIFACTS WHERE Artifact_PK = %s"})
+
+
+def prepared_cursors(raw):
+    return [cursor for cursor in raw.cursors if cursor.prepared]
+
+
+@pytest.fixture
+def pool(fake_mysql):
+    return ConnectionPool({'host': 'db'}, pool_size=2, max_overflow=0, read_timeout=0)
+
+
+def test_statement_is_prepared_once_per_connection(pool, fake_mysql):
+    conn = pool.connect()
+    first = conn.execute_prepared('test_lookup', (1,))
+    second = conn.execute_prepared('test_lookup', (2,))
+
+    assert first is second
+    assert len(prepared_cursors(fake_mysql.connections[0])) == 1
+    # 每次执行都传入注册表中的同一个字符串对象，驱动据此跳过重新 PREPARE
+    sqls = [sql for sql, _ in first.executed]
+    assert all(sql is db_pool.statement('test_lookup') for sql in sqls)
+    assert [params for _, params in first.executed] == [(1,), (2,)]
+
+
+def test_prepared_cursor_survives_return_to_pool(pool, fake_mysql):
+    conn = pool.connect()
+    cursor = conn.execute_prepared('test_lookup', (1,))
+    conn.close()
+
+    assert pool.connect() is conn
+    assert conn.execute_prepared('test_lookup', (2,)) is cursor
+
+
+def test_each_connection_prepares_its_own_statement(pool, fake_mysql):
+    first, second = pool.connect(), pool.connect()
+    assert first.execute_prepared('test_lookup', (1,)) is not second.execute_prepared('test_lookup', (1,))
+
+
+def test_failed_statement_is_prepared_again(pool, fake_mysql):
+    conn = pool.connect()
+    raw = fake_mysql.connections[0]
+    broken = conn.execute_prepared('test_lookup', (1,))
+
+    raw.fail_queries = True
+    with pytest.raises(Error):
+        conn.execute_prepared('test_lookup', (2,))
+    assert broken.closed
+
+    raw.fail_queries = False
+    assert conn.execute_prepared('test_lookup', (3,)) is not broken
+    assert len(prepared_cursors(raw)) == 2
+
+
+def test_registry_statements_use_placeholders_only():
+    # 预处理语句不能拼接参数值，所有可变部分都以 %s 传入
+    for name, sql in PREPARED_STATEMENTS.items():
+        assert "'%s'" not in sql, name
+        assert '{' not in sql, name
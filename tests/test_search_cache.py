@@ -0,0 +1,84 @@
+"""
+search_cache：缓存键规范化、按目录数据版本失效、LRU 与过期
+运行：python -m pytest -q tests
+"""
+
+from mysql.connector import Error
+
+import catalog_version
+import search_cache
+from search_cache import SearchResultCache, make_key
+
+
+def test_key_ignores_whitespace_case_and_filter_order():
+    first = make_key('  Ming   Vase ', {'culture': ['明', '清'], 'material': []}, 'relevance', 1, 20)
+    second = make_key('ming vase', {'culture': ['清', '明', '明']}, 'relevance', 1, 20)
+    assert first == second
+    assert first != make_key('ming vase', {'culture': ['明']}, 'relevance', 1, 20)
+    assert first != make_key('ming vase', {'culture': ['明', '清']}, 'relevance', 2, 20)
+
+
+def test_newer_version_clears_cache():
+    cache = SearchResultCache()
+    cache.put(1, 'ming', ['page'])
+    assert cache.get(1, 'ming') == ['page']
+
+    assert cache.get(2, 'ming') is None
+    # 旧版本的条目已全部丢弃，回到旧版本也读不到
+    cache.put(2, 'qing', ['page 2'])
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_stale_version_neither_reads_nor_writes():
+    # 从延迟较大的副本读到旧版本
+    cache = SearchResultCache()
+    cache.put(5, 'ming', ['new'])
+
+    assert cache.get(4, 'ming') is None
+    cache.put(4, 'ming', ['old'])
+    assert cache.get(5, 'ming') == ['new']
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchResultCache(max_entries=2)
+    cache.put(1, 'a', 'A')
+    cache.put(1, 'b', 'B')
+    cache.get(1, 'a')
+    cache.put(1, 'c', 'C')
+
+    assert cache.get(1, 'b') is None
+    assert cache.get(1, 'a') == 'A'
+
+
+def test_expired_entry_is_dropped():
+    cache = SearchResultCache(ttl=-1)
+    cache.put(1, 'a', 'A')
+    assert cache.get(1, 'a') is None
+    assert cache.stats()['expired'] == 1
+
+
+def test_unknown_version_or_disabled_cache_is_bypassed(monkeypatch):
+    monkeypatch.setattr(search_cache, '_cache', SearchResultCache(max_entries=10))
+    search_cache.store(None, 'a', 'A')
+    assert search_cache.lookup(None, 'a') is None
+
+    search_cache.configure(0, 300)
+    search_cache.store(7, 'a', 'A')
+    assert search_cache.lookup(7, 'a') is None
+
+
+class VersionConnection:
+    def __init__(self, version=None):
+        self.version = version
+
+    def query_prepared(self, name, params=()):
+        if self.version is None:
+            raise Error(msg="Table 'catalog_version' doesn't exist")
+        return [{'version': self.version}]
+
+
+def test_catalog_version_is_read_from_the_same_connection():
+    assert catalog_version.current(VersionConnection(3)) == 3
+    # 版本表不存在时不使用缓存
+    assert catalog_version.current(VersionConnection()) is None
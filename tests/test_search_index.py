@@ -0,0 +1,40 @@
+"""
+search_index.SearchIndex 的前缀查询与增量更新
+运行：python -m pytest -q tests
+"""
+
+from search_index import FIELD_COUNT, SearchIndex
+
+
+def fields(title):
+    """只有标题的文物字段"""
+    return (title,) + ('',) * (FIELD_COUNT - 1)
+
+
+def make_index(tmp_path, documents):
+    index = SearchIndex(str(tmp_path / 'search_index.bin'))
+    index.build([(doc_id, fields(title)) for doc_id, title in documents])
+    return index
+
+
+def result_ids(index, text):
+    return [doc_id for doc_id, _ in index.search(text)]
+
+
+def test_prefix_search_finds_documents_in_delta_segment(tmp_path):
+    index = make_index(tmp_path, [(5, 'brown vase'), (6, 'bronze bell'), (7, 'brown jar')])
+    index.update(5, fields('bronze vase'))
+
+    # "bro" 展开为 bronze 与 brown：brown 压缩列表中文物 5 的旧条目已删除，不能抵消 bronze 增量段中的命中
+    assert sorted(result_ids(index, 'bro')) == [5, 6, 7]
+    assert sorted(result_ids(index, 'bronze')) == [5, 6]
+    assert result_ids(index, 'brown') == [7]
+
+
+def test_prefix_search_after_compact(tmp_path):
+    index = make_index(tmp_path, [(5, 'brown vase'), (6, 'bronze bell'), (7, 'brown jar')])
+    index.update(5, fields('bronze vase'))
+    index.compact()
+
+    assert sorted(result_ids(index, 'bro')) == [5, 6, 7]
+    assert result_ids(index, 'brown') == [7]
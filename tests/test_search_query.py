@@ -0,0 +1,153 @@
+"""
+query_builder 中的搜索语句参数：全文检索布尔模式关键词，以及筛选条件与年份区间（在 SQLite 内存库上执行）
+运行：python -m pytest -q tests
+"""
+
+import sqlite3
+
+import pytest
+
+from query_builder import _search_filters, boolean_mode_term, build_search_params, build_search_query, era_range, year_overlap
+
+# (编号, 材质, 起始年, 结束年, 年代体系, 年代分段)
+ARTIFACTS = [
+    (1, '青铜', -1300, -1046, '东方纪年', '商'),
+    (2, ' 瓷 ', 1403, 1424, '东方纪年', '明'),
+    (3, '青铜', -800, None, '西方纪年', '其他西'),
+    (4, '木', None, None, None, None),
+]
+# (编号, 文化, 地区)；文物 3 有两条属性记录
+PROPERTIES = [
+    (1, '商文化', '河南'),
+    (2, '明', ' 江西 '),
+    (3, '周', '陕西'),
+    (3, '商文化', None),
+]
+
+
+@pytest.fixture
+def catalog():
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE ARTIFACTS (Artifact_PK INTEGER PRIMARY KEY, Material TEXT, "
+               "Start_Year INT, End_Year INT, Era_System TEXT, Era_Bucket TEXT)")
+    db.execute("CREATE TABLE PROPERTIES (Artifact_PK INT, Culture TEXT, Geography TEXT)")
+    db.executemany("INSERT INTO ARTIFACTS VALUES (?, ?, ?, ?, ?, ?)", ARTIFACTS)
+    db.executemany("INSERT INTO PROPERTIES VALUES (?, ?, ?)", PROPERTIES)
+    yield db
+    db.close()
+
+
+def matching(catalog, filters):
+    """按筛选条件查询文物编号"""
+    conditions, params = _search_filters(filters)
+    where = ' AND '.join(conditions) or '1 = 1'
+    sql = f"SELECT a.Artifact_PK FROM ARTIFACTS a WHERE {where} ORDER BY a.Artifact_PK"
+    return [row[0] for row in catalog.execute(sql.replace('%s', '?'), params)]
+
+
+@pytest.mark.parametrize('search_term, expected', [
+    ('bronze', 'bronze'),
+    ('+bronze -vase', 'bronze vase'),
+    ('"ming" <vase> ~(jar)*', 'ming vase jar'),
+    ('user@example', 'user example'),
+    ('  青铜   鼎 ', '青铜 鼎'),
+])
+def test_boolean_mode_operators_are_removed(search_term, expected):
+    assert boolean_mode_term(search_term) == expected
+
+
+@pytest.mark.parametrize('search_term', ['"', '-', '*', '+-<>()~*"@', '   '])
+def test_operator_only_terms_are_empty(search_term):
+    # 调用方据此直接返回空结果，不把只有运算符的关键词发给 MySQL
+    assert boolean_mode_term(search_term) == ''
+
+
+def test_mysql_params_match_phrase():
+    params = build_search_params('ming "vase"')
+    assert params == ('"ming vase"',) * 6
+
+
+def test_short_mysql_term_uses_prefix_wildcard():
+    assert build_search_params('鼎')[0] == '鼎*'
+    assert build_search_params('+鼎')[0] == '鼎*'
+
+
+def test_params_match_placeholders():
+    sql = build_search_query('bronze')
+    assert sql.count('%s') == len(build_search_params('bronze'))
+
+
+def test_sqlite_params_quote_phrase():
+    assert build_search_params('ming "vase"', dialect='sqlite') == ('"ming ""vase"""',)
+    # 短于 trigram 的关键词按子串查找
+    assert build_search_params('Ab', dialect='sqlite') == ('ab',)
+
+
+def test_no_filters(catalog):
+    assert _search_filters({}) == ([], [])
+    assert matching(catalog, {'culture': []}) == [1, 2, 3, 4]
+
+
+def test_values_within_a_filter_are_alternatives(catalog):
+    assert matching(catalog, {'material': ['瓷', '木']}) == [2, 4]
+
+
+def test_filters_of_different_kinds_are_combined(catalog):
+    assert matching(catalog, {'material': ['青铜'], 'region': ['陕西']}) == [3]
+
+
+def test_culture_matches_any_property_row(catalog):
+    assert matching(catalog, {'culture': ['商文化']}) == [1, 3]
+    assert matching(catalog, {'region': ['江西']}) == [2]
+
+
+def test_era_bucket_filter(catalog):
+    assert matching(catalog, {'era': ['东方纪年_明']}) == [2]
+    assert matching(catalog, {'era': ['东方纪年_明', '西方纪年_其他西']}) == [2, 3]
+
+
+def test_unrecognised_era_matches_nothing(catalog):
+    assert matching(catalog, {'era': ['明朝']}) == []
+
+
+def test_filter_params_follow_search_params():
+    filters = {'material': ['青铜']}
+    sql = build_search_query('bronze', filters=filters)
+    params = build_search_params('bronze', filters=filters)
+    assert params[-1] == '青铜'
+    assert sql.count('%s') == len(params)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('-500~200', (-500, 200)),
+    ('1800~', (1800, None)),
+    ('~ -1000', (None, -1000)),
+    ('~', None),
+    ('东方纪年_明', None),
+])
+def test_era_range(value, expected):
+    assert era_range(value) == expected
+
+
+@pytest.mark.parametrize('from_year, to_year, expected', [
+    # 区间有交集即匹配，两端包含
+    (-1100, -1046, [1]),
+    (-1046, -1046, [1]),
+    (1424, 1500, [2]),
+    # 结束年为空时按起始年计
+    (-800, -800, [3]),
+    (-799, None, [2]),
+    # 只限一端；未解析出年份的文物（4）不匹配
+    (None, -800, [1, 3]),
+    (None, None, [1, 2, 3]),
+])
+def test_year_overlap(catalog, from_year, to_year, expected):
+    condition, params = year_overlap(from_year, to_year)
+    sql = f"SELECT a.Artifact_PK FROM ARTIFACTS a WHERE {condition} ORDER BY a.Artifact_PK"
+    assert [row[0] for row in catalog.execute(sql.replace('%s', '?'), params)] == expected
+
+
+def test_year_filters_combine_with_era_ranges(catalog):
+    assert matching(catalog, {'from_year': [1400]}) == [2]
+    assert matching(catalog, {'era': ['~-1200', '1400~1403']}) == [1, 2]
+    assert matching(catalog, {'era': ['~-1200', '1400~1403'], 'to_year': [0]}) == [1]
@@ -0,0 +1,72 @@
+"""
+suggest_index.SuggestIndex 的前缀查询、热门前缀预排名与词表文件
+运行：python -m pytest -q tests
+"""
+
+import suggest_index
+from suggest_index import SuggestIndex
+
+TERMS = [
+    ('title', 'Bronze Bell', 3),
+    ('material', 'bronze', 40),
+    ('title', 'BRONZE', 2),
+    ('culture', 'Brown  Ware', 12),
+    ('artist', 'Bruegel', 1),
+    ('title', '青铜鼎', 5),
+    ('material', '青铜', 30),
+    ('title', '   ', 9),
+]
+
+
+def make_index(tmp_path, rows=TERMS):
+    index = SuggestIndex(str(tmp_path / 'suggest_index.pkl'))
+    index.build(rows)
+    return index
+
+
+def texts(index, prefix, limit=8):
+    return [text for text, _, _ in index.suggest(prefix, limit)]
+
+
+def test_prefix_ranked_by_artifact_count(tmp_path):
+    index = make_index(tmp_path)
+    assert texts(index, 'br') == ['bronze', 'Brown Ware', 'Bronze Bell', 'Bruegel']
+    assert texts(index, '青') == ['青铜', '青铜鼎']
+    assert texts(index, 'br', limit=2) == ['bronze', 'Brown Ware']
+
+
+def test_query_is_normalized(tmp_path):
+    index = make_index(tmp_path)
+    assert texts(index, '  BROWN   w') == ['Brown Ware']
+    assert index.suggest('') == []
+    assert index.suggest('xyz') == []
+
+
+def test_same_text_in_several_fields_keeps_largest_count(tmp_path):
+    index = make_index(tmp_path)
+    assert index.suggest('bronze', 1) == [('bronze', 'material', 40)]
+
+
+def test_hot_prefixes_match_scanned_ranking(tmp_path, monkeypatch):
+    rows = [('title', f"b{i:03d}", i % 17) for i in range(60)] + [('title', f"c{i}", i) for i in range(5)]
+    prefixes = ('b', 'b0', 'b05', 'c')
+    plain = make_index(tmp_path, rows)
+    scanned = [plain.suggest(prefix) for prefix in prefixes]
+
+    monkeypatch.setattr(suggest_index, 'HOT_PREFIX_MIN', 8)
+    index = make_index(tmp_path, rows)
+    _, _, hot = index._state
+    assert 'b' in hot and 'b0' in hot and 'c' not in hot
+    assert [index.suggest(prefix) for prefix in prefixes] == scanned
+
+
+def test_saved_index_loads_in_another_worker(tmp_path):
+    make_index(tmp_path).save()
+
+    other = SuggestIndex(str(tmp_path / 'suggest_index.pkl'))
+    assert other.load()
+    assert texts(other, 'br', 1) == ['bronze']
+
+
+def test_missing_file_does_not_load(tmp_path):
+    assert not SuggestIndex(str(tmp_path / 'missing.pkl')).load()